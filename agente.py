@@ -0,0 +1,290 @@
+import queue
+import threading
+import time
+import numpy as np
+from config import LARGURA, BUSCA, ADIANTAMENTO_IA, LARGURA_FEIXE, PRAZO_JOGADA
+
+
+class Prazo:
+    """Instante limite de uma decisão (`segundos` a partir de agora); lembra se a busca
+    parou por causa dele, deixando jogadas sem testar"""
+
+    def __init__(self, segundos):
+        self.limite = time.perf_counter() + segundos
+        self.atingido = False
+
+    def esgotado(self):
+        if time.perf_counter() >= self.limite:
+            self.atingido = True
+        return self.atingido
+
+
+def escolher_jogada(jogo, pesos, prazo=None):
+    """Testa as orientações distintas da peça atual em todas as colunas e retorna a melhor (x, rotações).
+
+    Com `prazo` (um Prazo), as jogadas são testadas
+    das que caem mais fundo para as mais altas e a busca para no prazo,
+    retornando a melhor encontrada até ali. Empates ficam com a jogada que
+    viria primeiro na ordem normal, então sem estourar o prazo a escolha é
+    a mesma.
+    """
+    w1, w2, w3, w4 = pesos
+    melhor_score = -99999
+    melhor_acao = None
+
+    candidatas = [(x, orientacao) for orientacao in jogo.orientacoes_distintas()
+                  for x in range(LARGURA - orientacao.largura + 1)]
+    if prazo is None:
+        ordem = range(len(candidatas))
+    else:
+        # Pelo perfil de alturas: quanto mais funda a queda, mais promissora a jogada
+        quedas = [jogo.linha_de_queda(x, orientacao) + orientacao.altura for x, orientacao in candidatas]
+        ordem = sorted(range(len(candidatas)), key=lambda i: -quedas[i])
+    melhor_indice = len(candidatas)
+
+    for i in ordem:
+        if prazo is not None and melhor_acao and prazo.esgotado():
+            break
+        x, orientacao = candidatas[i]
+        if not jogo.colide_orientacao(x, 0, orientacao):
+            linhas, altura, buracos, uniforme = jogo.simula_jogada(x, orientacao.rotacoes)
+            score = w1 * linhas - w2 * buracos - w3 * altura + w4 * uniforme
+            if score > melhor_score or (score == melhor_score and i < melhor_indice and melhor_acao):
+                melhor_score = score
+                melhor_acao = (x, orientacao.rotacoes)
+                melhor_indice = i
+
+    return melhor_acao
+
+
+def vetor_pesos(pesos):
+    """Converte (w1, w2, w3, w4) no vetor que multiplica (linhas, altura, buracos, uniformidade)"""
+    w1, w2, w3, w4 = pesos
+    return np.array([w1, -w3, -w2, w4])
+
+
+def escolher_jogada_lote(jogo, pesos, prazo=None):
+    """Mesma escolha de escolher_jogada, avaliando todas as jogadas de uma vez com NumPy.
+
+    É uma única avaliação em lote: o `prazo` não a interrompe (nem é marcado como atingido).
+    """
+    caracteristicas, jogadas = jogo.avaliar_jogadas()
+    if not jogadas:
+        return None
+    scores = caracteristicas @ vetor_pesos(pesos)
+    melhor = int(np.argmax(scores))
+    return jogadas[melhor] if scores[melhor] > -99999 else None
+
+
+def escolher_jogada_antecipada(jogo, pesos, largura=LARGURA_FEIXE, prazo=None):
+    """Busca de dois níveis usando a próxima peça (jogo.proxima_peca), com feixe.
+
+    As jogadas da peça atual são pontuadas como em escolher_jogada_lote; só
+    as `largura` melhores são expandidas com cada jogada da próxima peça. O
+    valor de uma jogada é w1 * linhas que ela completa mais a melhor
+    pontuação da próxima peça no tabuleiro resultante, então o custo extra é
+    limitado a `largura` avaliações em lote. As avaliações dos tabuleiros
+    resultantes passam pelo cache de transposição e são reaproveitadas na
+    jogada seguinte, que começa exatamente de um deles.
+
+    As jogadas do feixe são expandidas da melhor para a pior de um nível;
+    com `prazo` (um Prazo), a expansão para no prazo
+    e vale a melhor entre as já expandidas.
+    """
+    caracteristicas, jogadas = jogo.avaliar_jogadas()
+    if not jogadas:
+        return None
+    vetor = vetor_pesos(pesos)
+    scores = caracteristicas @ vetor
+    if scores.max() <= -99999:
+        return None
+    if jogo.proxima_peca is None or largura <= 0:
+        return jogadas[int(np.argmax(scores))]
+
+    # Cada jogada do feixe é colocada no próprio jogo, com a próxima peça como
+    # atual, e desfeita depois (sem copiar o jogo)
+    atual = jogo.peca_atual
+    melhor, melhor_valor = None, -np.inf
+    for i in np.argsort(-scores, kind="stable")[:largura].tolist():
+        if prazo is not None and melhor is not None and prazo.esgotado():
+            break
+        jogo.coloca(*jogadas[i])
+        jogo.peca_atual = jogo.proxima_peca
+        try:
+            if jogo.colide_na_entrada(jogo.peca_atual):
+                continue
+            caracteristicas_depois, jogadas_depois = jogo.avaliar_jogadas()
+        finally:
+            jogo.peca_atual = atual
+            jogo.desfaz()
+        if not jogadas_depois:
+            continue
+        valor = vetor[0] * caracteristicas[i][0] + (caracteristicas_depois @ vetor).max()
+        if valor > melhor_valor:
+            melhor, melhor_valor = i, valor
+
+    # Todas as jogadas do feixe perdem o jogo na próxima peça: fica a melhor de um nível
+    if melhor is None:
+        melhor = int(np.argmax(scores))
+    return jogadas[melhor]
+
+
+def aplicar_jogada(jogo, acao):
+    """Rotaciona e posiciona a peça atual conforme a jogada (x, rotações)"""
+    x, rot = acao
+    jogo.peca_atual = jogo.orientacao(rot).peca
+    jogo.x = x
+
+
+# Estratégias de busca disponíveis (config.BUSCA escolhe a padrão)
+BUSCAS = {
+    "simples": escolher_jogada,
+    "lote": escolher_jogada_lote,
+    "antecipada": escolher_jogada_antecipada,
+}
+
+# Buscas que param no prazo de BuscaComPrazo ("lote" é uma única avaliação e o ignora)
+BUSCAS_COM_PRAZO = ("simples", "antecipada")
+
+
+def busca_configurada(nome=None):
+    """Retorna a função de busca pelo nome (padrão: config.BUSCA)"""
+    nome = nome or BUSCA
+    if nome not in BUSCAS:
+        raise ValueError(f"Busca desconhecida: {nome}")
+    return BUSCAS[nome]
+
+
+class BuscaComPrazo:
+    """Busca com tempo limitado por decisão, contando quantas vezes o prazo foi atingido.
+
+    Chama a busca com um Prazo de `prazo` segundos; as buscas de
+    BUSCAS_COM_PRAZO param nele e retornam a melhor jogada encontrada até
+    ali. Só contam como estouro as decisões em que a busca parou antes de
+    terminar. Só para jogar na tela: com prazo, a jogada depende da
+    velocidade da máquina, então o treinamento não usa.
+    """
+
+    def __init__(self, escolher_jogada, prazo=PRAZO_JOGADA):
+        self.escolher_jogada = escolher_jogada
+        self.prazo = prazo
+        self.decisoes = 0
+        self.estouros = 0
+        self.tempo = 0.0
+
+    def __call__(self, jogo, pesos):
+        inicio = time.perf_counter()
+        prazo = Prazo(self.prazo)
+        acao = self.escolher_jogada(jogo, pesos, prazo=prazo)
+        self.decisoes += 1
+        self.estouros += prazo.atingido
+        self.tempo += time.perf_counter() - inicio
+        return acao
+
+    def taxa_estouros(self):
+        return self.estouros / self.decisoes if self.decisoes else 0.0
+
+    def resumo(self):
+        media = 1000 * self.tempo / self.decisoes if self.decisoes else 0.0
+        return (f"{self.decisoes} decisões, prazo de {1000 * self.prazo:.0f} ms atingido em "
+                f"{self.estouros} ({self.taxa_estouros():.0%}), média de {media:.1f} ms")
+
+
+# Marca na fila do agente de que a busca falhou (o erro fica em AgenteAssincrono.erro)
+_FALHOU = object()
+
+
+class AgenteAssincrono:
+    """Joga uma cópia do jogo numa thread, deixando as jogadas numa fila à frente da tela.
+
+    A cópia usa a mesma semente do jogo exibido; a cada passo de gravidade a
+    thread põe na fila a jogada escolhida (ou None) e avança a cópia. Quem
+    exibe só aplica as jogadas da fila, na velocidade que quiser, e chega
+    exatamente aos mesmos estados. A fila limita o adiantamento a
+    `adiantamento` passos. Com `prazo` (segundos), cada decisão é limitada
+    por BuscaComPrazo e as contagens ficam em self.escolher_jogada. Se a
+    busca falhar, o erro fica em self.erro e é levantado por proxima() e
+    avancar() assim que acabarem as jogadas já prontas.
+    """
+
+    def __init__(self, pesos, semente, motor=None, busca=None, adiantamento=ADIANTAMENTO_IA, prazo=None):
+        self.pesos = pesos
+        self.semente = semente
+        self.motor = motor
+        self.escolher_jogada = busca_configurada(busca)
+        if prazo is not None:
+            self.escolher_jogada = BuscaComPrazo(self.escolher_jogada, prazo)
+        self.fila = queue.Queue(maxsize=adiantamento)
+        self.erro = None
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._jogar, daemon=True)
+
+    def iniciar(self):
+        self._thread.start()
+        return self
+
+    def _jogar(self):
+        from tetris import criar_jogo
+
+        try:
+            jogo = criar_jogo(self.motor, self.semente)
+            while not jogo.game_over and not self._parar.is_set():
+                acao = self.escolher_jogada(jogo, self.pesos)
+                if not self._colocar(acao):
+                    return
+                if acao:
+                    aplicar_jogada(jogo, acao)
+                jogo.passo()
+        except Exception as e:
+            # Sem isto a thread morreria calada e a tela ficaria esperando jogadas
+            self.erro = e
+            self._colocar(_FALHOU)
+
+    def _colocar(self, acao):
+        """Espera espaço na fila; retorna False se o agente foi parado antes disso"""
+        while not self._parar.is_set():
+            try:
+                self.fila.put(acao, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def proxima(self, espera=None):
+        """Próxima jogada da fila (None = só cair); levanta queue.Empty se não houver
+        nenhuma pronta em `espera` segundos (None: não espera). Se a busca falhou e
+        não há mais jogadas prontas, levanta RuntimeError com o erro original."""
+        if espera is None:
+            acao = self.fila.get_nowait()
+        else:
+            acao = self.fila.get(timeout=max(espera, 0))
+        if acao is _FALHOU:
+            self.fila.put_nowait(_FALHOU)  # as próximas chamadas também falham
+            raise RuntimeError(f"A busca da IA falhou: {self.erro!r}") from self.erro
+        return acao
+
+    def avancar(self, jogo, espera=None):
+        """Aplica a próxima jogada da fila e um passo de gravidade em `jogo`; False se não havia jogada pronta"""
+        try:
+            acao = self.proxima(espera)
+        except queue.Empty:
+            return False
+        if acao:
+            aplicar_jogada(jogo, acao)
+        jogo.passo()
+        return True
+
+    def adiantadas(self):
+        """Quantas jogadas já estão prontas na fila"""
+        return self.fila.qsize()
+
+    def parar(self):
+        self._parar.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.parar()
+        return False
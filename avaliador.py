@@ -0,0 +1,67 @@
+import math
+from multiprocessing import Pool, cpu_count
+
+from config import N_PROCESSES
+from pecas import ORIENTACOES
+from tetris import arrays_orientacao
+
+
+def processos_disponiveis(processos=None):
+    """Número de processos a usar: N_PROCESSES limitado às CPUs da máquina"""
+    return max(1, min(processos or N_PROCESSES, cpu_count()))
+
+
+def _inicializar_worker():
+    """Prepara as tabelas pré-calculadas uma única vez em cada processo"""
+    import tetris_bitboard  # noqa: F401 - tabelas de máscaras do motor bitboard
+    for orientacoes in ORIENTACOES.values():
+        for orientacao in orientacoes:
+            arrays_orientacao(orientacao)
+
+
+class AvaliadorParalelo:
+    """Pool de processos que fica vivo durante todo o treinamento.
+
+    Criar um Pool a cada geração obriga cada processo a reimportar os
+    módulos e remontar as tabelas. Aqui o pool é criado uma vez, cada
+    processo é preparado pelo inicializador e as tarefas são enviadas em
+    blocos (chunks) proporcionais ao número de tarefas.
+    """
+
+    # Blocos por processo: mais blocos equilibram melhor a carga, menos reduzem a comunicação
+    BLOCOS_POR_PROCESSO = 4
+
+    def __init__(self, processos=None):
+        self.processos = processos_disponiveis(processos)
+        self.pool = Pool(processes=self.processos, initializer=_inicializar_worker)
+
+    def tamanho_bloco(self, n_tarefas):
+        """Tamanho dos blocos de tarefas enviados a cada processo"""
+        return max(1, math.ceil(n_tarefas / (self.processos * self.BLOCOS_POR_PROCESSO)))
+
+    def map(self, funcao, tarefas):
+        tarefas = list(tarefas)
+        return self.pool.map(funcao, tarefas, chunksize=self.tamanho_bloco(len(tarefas)))
+
+    def imap(self, funcao, tarefas):
+        """Como map, mas entrega os resultados em ordem conforme ficam prontos"""
+        tarefas = list(tarefas)
+        return self.pool.imap(funcao, tarefas, chunksize=self.tamanho_bloco(len(tarefas)))
+
+    def starmap(self, funcao, tarefas):
+        tarefas = list(tarefas)
+        return self.pool.starmap(funcao, tarefas, chunksize=self.tamanho_bloco(len(tarefas)))
+
+    def fechar(self):
+        """Encerra os processos do pool"""
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is not None:
+            self.pool.terminate()
+        self.fechar()
+        return False
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Avaliação sem interface: joga N partidas com sementes fixas para um vetor
+de pesos, em todos os núcleos, e mostra (ou grava em JSON) as distribuições.
+
+Exemplos:
+    python avaliar_pesos.py --pesos 3.0 4.0 1.0 -0.5 --jogos 100
+    python avaliar_pesos.py --melhor --jogos 200 --json resultado.json
+    python avaliar_pesos.py --geracao 9 --json - --minimo 1000
+"""
+
+import argparse
+import json
+import sys
+import time
+from functools import partial
+import numpy as np
+
+from config import MOTOR, BUSCA, MODO_FITNESS, MAX_PECAS, MAX_PASSOS, GERADOR_PECAS
+from agente import BUSCAS
+from avaliador import AvaliadorParalelo, processos_disponiveis
+from cache_fitness import versao_avaliacao
+from genetic_algorithm import jogar_partida
+from historico import abrir_historico
+
+
+def resultado_partida(semente, pesos, motor=None, busca=None, modo=None):
+    """(pontos, linhas, peças) de uma partida; usado com multiprocessing"""
+    jogo = jogar_partida(np.array(pesos), motor=motor, busca=busca, modo=modo, semente=semente)
+    return jogo.pontos, jogo.linhas_removidas, jogo.pecas_colocadas
+
+
+def distribuicao(valores):
+    """Resumo de uma distribuição: média, desvio e percentis"""
+    valores = np.asarray(valores, dtype=float)
+    p25, mediana, p75 = np.percentile(valores, [25, 50, 75])
+    return {
+        "media": float(valores.mean()),
+        "desvio": float(valores.std()),
+        "min": float(valores.min()),
+        "p25": float(p25),
+        "mediana": float(mediana),
+        "p75": float(p75),
+        "max": float(valores.max()),
+    }
+
+
+def avaliar_pesos(pesos, n_jogos=20, semente=0, processos=None, motor=None, busca=None, modo=None):
+    """Joga `n_jogos` partidas (sementes semente, semente+1, ...) e retorna o relatório"""
+    pesos = [float(w) for w in pesos]
+    sementes = list(range(semente, semente + n_jogos))
+    jogar = partial(resultado_partida, pesos=pesos, motor=motor, busca=busca, modo=modo)
+    processos = processos_disponiveis(processos)
+
+    inicio = time.perf_counter()
+    if processos > 1:
+        with AvaliadorParalelo(processos) as avaliador:
+            resultados = avaliador.map(jogar, sementes)
+    else:
+        resultados = [jogar(s) for s in sementes]
+    duracao = time.perf_counter() - inicio
+
+    pontos, linhas, pecas = (list(coluna) for coluna in zip(*resultados))
+    return {
+        "pesos": pesos,
+        "jogos": n_jogos,
+        "sementes": [semente, semente + n_jogos - 1],
+        "processos": processos,
+        "configuracao": {
+            "motor": motor or MOTOR,
+            "busca": busca or BUSCA,
+            "modo": modo or MODO_FITNESS,
+            "max_pecas": MAX_PECAS,
+            "max_passos": MAX_PASSOS,
+            "gerador": GERADOR_PECAS,
+            "versao_avaliacao": versao_avaliacao(),
+        },
+        "pontos": distribuicao(pontos),
+        "linhas": distribuicao(linhas),
+        "pecas": distribuicao(pecas),
+        "duracao": duracao,
+        "jogos_por_segundo": n_jogos / duracao,
+        "pecas_por_segundo": sum(pecas) / duracao,
+        "partidas": [{"semente": s, "pontos": p, "linhas": l, "pecas": n}
+                     for s, p, l, n in zip(sementes, pontos, linhas, pecas)],
+    }
+
+
+def pesos_do_historico(geracao=None):
+    """Pesos do melhor da geração indicada ou, sem geração, do melhor de todo o histórico"""
+    # Só consulta: não migra o arquivo antigo nem cria o histórico
+    melhores = abrir_historico(somente_leitura=True).melhores()
+    if geracao is not None:
+        melhores = [item for item in melhores if item["geracao"] == geracao]
+    if not melhores:
+        return None
+    return max(melhores, key=lambda item: item["score"])["pesos"]
+
+
+def imprimir_relatorio(relatorio):
+    print(f"\n📊 {relatorio['jogos']} partidas com pesos {relatorio['pesos']}")
+    print(f"   Sementes {relatorio['sementes'][0]}..{relatorio['sementes'][1]}, "
+          f"{relatorio['processos']} processo(s), modo {relatorio['configuracao']['modo']}")
+    for nome in ("pontos", "linhas", "pecas"):
+        d = relatorio[nome]
+        print(f"   {nome:7s} média {d['media']:10.1f} ± {d['desvio']:9.1f} | "
+              f"min {d['min']:8.0f}  mediana {d['mediana']:8.0f}  max {d['max']:8.0f}")
+    print(f"   ⚡ {relatorio['jogos_por_segundo']:.2f} partidas/seg, "
+          f"{relatorio['pecas_por_segundo']:.0f} peças/seg ({relatorio['duracao']:.1f} s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Avalia um vetor de pesos sem interface gráfica")
+    origem = parser.add_mutually_exclusive_group(required=True)
+    origem.add_argument("--pesos", type=float, nargs=4, metavar=("W1", "W2", "W3", "W4"),
+                        help="pesos a avaliar")
+    origem.add_argument("--geracao", type=int, help="melhor indivíduo desta geração do histórico")
+    origem.add_argument("--melhor", action="store_true", help="melhor indivíduo de todo o histórico")
+    parser.add_argument("--jogos", type=int, default=20, help="número de partidas (padrão: 20)")
+    parser.add_argument("--semente", type=int, default=0, help="semente da primeira partida (padrão: 0)")
+    parser.add_argument("--processos", type=int, default=None, help="processos (padrão: N_PROCESSES)")
+    parser.add_argument("--motor", choices=["lista", "bitboard"], default=None)
+    parser.add_argument("--busca", choices=sorted(BUSCAS), default=None)
+    parser.add_argument("--modo", choices=["queda", "passo"], default=None)
+    parser.add_argument("--json", metavar="ARQUIVO", help="grava o relatório em JSON ('-' para a saída padrão)")
+    parser.add_argument("--minimo", type=float, default=None,
+                        help="termina com código 1 se a média de pontos ficar abaixo deste valor")
+    args = parser.parse_args(argv)
+
+    pesos = args.pesos
+    if pesos is None:
+        pesos = pesos_do_historico(args.geracao)
+        if pesos is None:
+            parser.error("nenhum indivíduo encontrado no histórico")
+
+    relatorio = avaliar_pesos(pesos, args.jogos, args.semente, args.processos,
+                              args.motor, args.busca, args.modo)
+
+    if args.json == "-":
+        json.dump(relatorio, sys.stdout, indent=2)
+        print()
+    else:
+        imprimir_relatorio(relatorio)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(relatorio, f, indent=2)
+            print(f"💾 Relatório gravado em {args.json}")
+
+    if args.minimo is not None and relatorio["pontos"]["media"] < args.minimo:
+        print(f"❌ Média {relatorio['pontos']['media']:.1f} abaixo do mínimo {args.minimo}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
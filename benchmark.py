@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks dos caminhos críticos do motor e da busca, em tabuleiros fixos.
+
+    python benchmark.py                  # mede e compara com benchmark_baseline.json
+    python benchmark.py --rapido         # versão curta (menos partidas)
+    python benchmark.py --filtro colide  # só os benchmarks com "colide" no nome
+    python benchmark.py --salvar         # grava os resultados como nova referência
+
+A referência depende da máquina: regrave-a (--salvar) na máquina usada para
+comparar antes de medir uma mudança no motor.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sys
+import time
+from multiprocessing import cpu_count
+import numpy as np
+
+from config import LARGURA, ALTURA, POP_SIZE, JOGOS_POR_INDIVIDUO, CACHE_TRANSPOSICAO_PASSO
+import transposicao
+from tetris import criar_jogo
+from agente import BUSCAS
+from genetic_algorithm import fitness, jogar_partida, avaliar_populacao_sequencial
+
+BASELINE_FILE = "benchmark_baseline.json"
+MOTORES = ("lista", "bitboard")
+
+# Faixas de altura máxima do tabuleiro de cada corpus
+CORPORA = {
+    "vazio": (0, 2),
+    "meio": (6, 10),
+    "quase_cheio": (15, ALTURA - 2),
+}
+
+# Pesos fixos usados nas partidas completas
+PESOS_REFERENCIA = [3.0, 4.0, 1.0, -0.5]
+
+
+# ---------- Corpus de tabuleiros ----------
+def gerar_corpus(nome, n=40, semente=0):
+    """Tabuleiros (linhas, peça) com altura máxima na faixa do corpus.
+
+    Partidas com jogadas aleatórias (sementes fixas) enchem o tabuleiro de
+    forma irregular, com buracos; cada tabuleiro que cai na faixa é guardado.
+    """
+    minimo, maximo = CORPORA[nome]
+    rng = random.Random(f"{nome}-{semente}")
+    corpus = []
+    partida = 0
+    while len(corpus) < n:
+        jogo = criar_jogo("lista", semente=semente * 1000 + partida)
+        partida += 1
+        while not jogo.game_over and len(corpus) < n:
+            altura = max(jogo.alturas)
+            if altura > maximo:
+                break
+            if altura >= minimo and rng.random() < 0.5:
+                corpus.append((jogo.clonar_tabuleiro(), jogo.peca_atual))
+            orientacao = rng.choice(jogo.orientacoes_distintas())
+            jogo.jogar_peca(rng.randint(0, LARGURA - orientacao.largura), orientacao.rotacoes)
+    return corpus
+
+
+def tabuleiros_com_linhas(corpus):
+    """Cópias do corpus com de 1 a 4 linhas completas no fundo (para remove_linhas)"""
+    resultado = []
+    for i, (tabuleiro, peca) in enumerate(corpus):
+        tabuleiro = [linha[:] for linha in tabuleiro]
+        for y in range(ALTURA - 1 - i % 4, ALTURA):
+            tabuleiro[y] = [1] * LARGURA
+        resultado.append((tabuleiro, peca))
+    return resultado
+
+
+def jogos_do_corpus(corpus, motor):
+    """Um jogo do motor para cada tabuleiro do corpus, com a peça correspondente"""
+    jogos = []
+    for tabuleiro, peca in corpus:
+        jogo = criar_jogo(motor, semente=0)
+        jogo.carregar_tabuleiro(tabuleiro)
+        jogo.peca_atual = peca
+        jogos.append(jogo)
+    return jogos
+
+
+def _tabuleiro_da_heuristica(jogo):
+    """Representação que a heuristica do motor recebe (máscaras no bitboard)"""
+    return jogo.linhas[:] if hasattr(jogo, "linhas") else jogo.clonar_tabuleiro()
+
+
+# ---------- Medição ----------
+def medir(funcao, repeticoes=3, tempo_minimo=0.2):
+    """Melhor taxa (operações/s) entre `repeticoes` medições.
+
+    `funcao()` executa um lote e retorna quantas operações fez; cada medição
+    repete o lote até passar de `tempo_minimo` segundos.
+    """
+    melhor = 0.0
+    for _ in range(repeticoes):
+        operacoes = 0
+        inicio = time.perf_counter()
+        while True:
+            operacoes += funcao()
+            duracao = time.perf_counter() - inicio
+            if duracao >= tempo_minimo:
+                break
+        melhor = max(melhor, operacoes / duracao)
+    return melhor
+
+
+def _bench_colide(jogos):
+    def lote():
+        n = 0
+        for jogo in jogos:
+            for orientacao in jogo.orientacoes_distintas():
+                for x in range(LARGURA - orientacao.largura + 1):
+                    jogo.colide(x, 0, orientacao.peca)
+                    n += 1
+        return n
+    return lote
+
+
+def _bench_simula(jogos):
+    def lote():
+        n = 0
+        for jogo in jogos:
+            for orientacao in jogo.orientacoes_distintas():
+                for x in range(LARGURA - orientacao.largura + 1):
+                    jogo.simula_jogada(x, orientacao.rotacoes)
+                    n += 1
+        return n
+    return lote
+
+
+def _bench_heuristica(jogos):
+    tabs = [(jogo, _tabuleiro_da_heuristica(jogo)) for jogo in jogos]
+
+    def lote():
+        for jogo, tab in tabs:
+            jogo.heuristica(tab)
+        return len(tabs)
+    return lote
+
+
+def _bench_remove_linhas(jogos, corpus):
+    def lote():
+        for jogo, (tabuleiro, _) in zip(jogos, corpus):
+            jogo.carregar_tabuleiro(tabuleiro)
+            jogo.remove_linhas()
+        return len(jogos)
+    return lote
+
+
+def _bench_busca(jogos, escolher_jogada):
+    def lote():
+        for jogo in jogos:
+            escolher_jogada(jogo, PESOS_REFERENCIA)
+        return len(jogos)
+    return lote
+
+
+def _bench_partidas(motor, n_partidas):
+    def lote():
+        for semente in range(n_partidas):
+            fitness(PESOS_REFERENCIA, motor=motor, semente=semente)
+        return n_partidas
+    return lote
+
+
+def _bench_passo(n_partidas):
+    def lote():
+        for semente in range(n_partidas):
+            fitness(PESOS_REFERENCIA, modo="passo", semente=semente)
+        return n_partidas
+    return lote
+
+
+def _bench_transposicao(n_partidas):
+    """Partidas no modo "passo" com o cache de transposição, vazio no início de cada lote"""
+    def lote():
+        transposicao.ativar(CACHE_TRANSPOSICAO_PASSO)
+        for semente in range(n_partidas):
+            fitness(PESOS_REFERENCIA, modo="passo", semente=semente)
+        transposicao.ativar(0)
+        return n_partidas
+    return lote
+
+
+def _bench_pecas(n_partidas, busca=None):
+    """Peças por segundo em partidas completas (compara buscas que chegam a partidas de tamanhos diferentes)"""
+    def lote():
+        return sum(jogar_partida(PESOS_REFERENCIA, busca=busca, semente=s).pecas_colocadas
+                   for s in range(n_partidas))
+    return lote
+
+
+def executar_benchmarks(rapido=False, filtro=None):
+    """Executa os benchmarks e retorna {nome: {"taxa", "unidade"}}"""
+    n_tabuleiros = 10 if rapido else 40
+    n_partidas = 2 if rapido else 6
+    tamanho_geracao = 6 if rapido else POP_SIZE
+    corpora = {nome: gerar_corpus(nome, n_tabuleiros) for nome in CORPORA}
+    corpus_linhas = tabuleiros_com_linhas(corpora["meio"])
+
+    benchmarks = []
+    for motor in MOTORES:
+        for nome, corpus in corpora.items():
+            jogos = jogos_do_corpus(corpus, motor)
+            benchmarks += [
+                (f"colide/{motor}/{nome}", "ops/s", _bench_colide(jogos), 3),
+                (f"simula_jogada/{motor}/{nome}", "jogadas/s", _bench_simula(jogos), 3),
+                (f"heuristica/{motor}/{nome}", "ops/s", _bench_heuristica(jogos), 3),
+            ]
+        benchmarks.append((f"remove_linhas/{motor}", "ops/s",
+                           _bench_remove_linhas(jogos_do_corpus(corpus_linhas, motor), corpus_linhas), 3))
+    for busca, escolher_jogada in BUSCAS.items():
+        for nome, corpus in corpora.items():
+            benchmarks.append((f"busca/{busca}/{nome}", "decisões/s",
+                               _bench_busca(jogos_do_corpus(corpus, "lista"), escolher_jogada), 3))
+    for motor in MOTORES:
+        benchmarks.append((f"fitness/{motor}", "partidas/s", _bench_partidas(motor, n_partidas), 1))
+    benchmarks.append(("fitness/pecas", "peças/s", _bench_pecas(n_partidas), 1))
+    benchmarks.append(("fitness/pecas_antecipada", "peças/s", _bench_pecas(n_partidas, "antecipada"), 1))
+    benchmarks.append(("fitness/passo", "partidas/s", _bench_passo(n_partidas), 1))
+    benchmarks.append(("fitness/passo_transposicao", "partidas/s", _bench_transposicao(n_partidas), 1))
+
+    def geracao():
+        rng = np.random.default_rng(0)
+        populacao = [rng.uniform(-5, 5, 4) for _ in range(tamanho_geracao)]
+        # Silencia as mensagens e barras de progresso da avaliação
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            avaliar_populacao_sequencial(populacao, 0, list(range(JOGOS_POR_INDIVIDUO)))
+        return tamanho_geracao
+    benchmarks.append(("geracao/sequencial", "indivíduos/s", geracao, 1))
+
+    # Sem o cache de transposição: repetir os mesmos tabuleiros mediria só o cache
+    # (ele tem benchmark próprio)
+    transposicao.ativar(0)
+    resultados = {}
+    for nome, unidade, funcao, repeticoes in benchmarks:
+        if filtro and filtro not in nome:
+            continue
+        taxa = medir(funcao, repeticoes, tempo_minimo=0.0 if repeticoes == 1 else 0.2)
+        resultados[nome] = {"taxa": taxa, "unidade": unidade}
+        print(f"  {nome:32s} {taxa:14.1f} {unidade}", flush=True)
+    transposicao.ativar()
+    return resultados
+
+
+# ---------- Referência ----------
+def info_maquina():
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "cpus": cpu_count(),
+    }
+
+
+def salvar_baseline(resultados, caminho=BASELINE_FILE):
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump({"maquina": info_maquina(), "resultados": resultados}, f, indent=2, sort_keys=True,
+                  ensure_ascii=False)
+        f.write("\n")
+
+
+def carregar_baseline(caminho=BASELINE_FILE):
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def comparar(resultados, baseline, tolerancia=0.25):
+    """Imprime a razão atual/referência de cada benchmark; retorna os nomes que ficaram
+    mais lentos que a referência além da tolerância"""
+    referencia = baseline["resultados"]
+    regressoes = []
+    print(f"\n📏 Comparação com a referência ({baseline['maquina'].get('processador')}, "
+          f"Python {baseline['maquina'].get('python')}):")
+    for nome, atual in resultados.items():
+        if nome not in referencia:
+            print(f"  {nome:32s} {'(novo)':>14s}")
+            continue
+        razao = atual["taxa"] / referencia[nome]["taxa"]
+        marca = ""
+        if razao < 1 - tolerancia:
+            marca = "  ⚠️  mais lento"
+            regressoes.append(nome)
+        elif razao > 1 + tolerancia:
+            marca = "  🚀 mais rápido"
+        print(f"  {nome:32s} {razao:13.2f}x{marca}")
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do motor e da busca do Tetris IA")
+    parser.add_argument("--rapido", action="store_true", help="menos tabuleiros e partidas")
+    parser.add_argument("--filtro", help="só benchmarks cujo nome contém este texto")
+    parser.add_argument("--salvar", action="store_true", help=f"grava os resultados em {BASELINE_FILE}")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="arquivo de referência")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="queda relativa aceita antes de acusar regressão (padrão: 0.25)")
+    parser.add_argument("--falhar", action="store_true", help="termina com código 1 se houver regressão")
+    args = parser.parse_args(argv)
+
+    print(f"⏱️  Benchmarks ({'rápido' if args.rapido else 'completo'}):")
+    resultados = executar_benchmarks(args.rapido, args.filtro)
+
+    if args.salvar:
+        salvar_baseline(resultados, args.baseline)
+        print(f"\n💾 Referência gravada em {args.baseline}")
+        return 0
+
+    baseline = carregar_baseline(args.baseline)
+    if baseline is None:
+        print(f"\nSem referência em {args.baseline} (use --salvar para criar)")
+        return 0
+    regressoes = comparar(resultados, baseline, args.tolerancia)
+    if regressoes:
+        print(f"\n⚠️  {len(regressoes)} benchmark(s) abaixo da referência: {', '.join(regressoes)}")
+    return 1 if regressoes and args.falhar else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
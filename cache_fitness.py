@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+from config import (
+    LARGURA, ALTURA, PECAS, MODO_FITNESS, MAX_PECAS, MAX_PASSOS, GERADOR_PECAS,
+    BUSCA, LARGURA_FEIXE, CACHE_FITNESS_TAMANHO, CACHE_FITNESS_ARQUIVO
+)
+
+# Aumente quando mudar alguma regra do jogo (pontuação, remoção de linhas, ...):
+# invalida as pontuações guardadas com a versão anterior
+VERSAO_REGRAS = 1
+
+
+def versao_avaliacao():
+    """Identifica a configuração que define o resultado de uma partida.
+
+    Motor e busca não entram: todos dão as mesmas jogadas (ver teste_completo.py).
+    A exceção é a busca "antecipada", que olha a próxima peça e joga diferente.
+    """
+    configuracao = {
+        "regras": VERSAO_REGRAS,
+        "tabuleiro": [LARGURA, ALTURA],
+        "pecas": PECAS,
+        "gerador": GERADOR_PECAS,
+        "modo": MODO_FITNESS,
+        "max_pecas": MAX_PECAS,
+        "max_passos": MAX_PASSOS,
+    }
+    if BUSCA == "antecipada":
+        configuracao["busca"] = [BUSCA, LARGURA_FEIXE]
+    return hashlib.sha1(json.dumps(configuracao, sort_keys=True).encode()).hexdigest()[:12]
+
+
+class CacheFitness:
+    """Pontuações já calculadas, por (pesos, sementes, versão da avaliação).
+
+    Com as sementes fixas durante o treinamento, um indivíduo repetido (cópia
+    de um pai ou duplicado na mesma geração) sempre teria a mesma pontuação;
+    o cache evita jogar as mesmas partidas de novo. Quando passa de
+    `capacidade` entradas, descarta as usadas há mais tempo (LRU). Com
+    `arquivo`, as entradas são carregadas na criação e gravadas em salvar().
+    """
+
+    def __init__(self, capacidade=CACHE_FITNESS_TAMANHO, arquivo=CACHE_FITNESS_ARQUIVO):
+        self.capacidade = capacidade
+        self.arquivo = arquivo
+        self.versao = versao_avaliacao()
+        self.entradas = OrderedDict()
+        self.acertos = 0
+        self.duplicados = 0
+        self.avaliados = 0
+        if arquivo and os.path.exists(arquivo):
+            self.carregar()
+
+    def chave(self, individuo, sementes):
+        return (tuple(float(w) for w in individuo), tuple(sementes), self.versao)
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def __contains__(self, chave):
+        return chave in self.entradas
+
+    def obter(self, chave):
+        """Pontuação guardada (ou None), marcando a entrada como usada recentemente"""
+        if chave not in self.entradas:
+            return None
+        self.entradas.move_to_end(chave)
+        return self.entradas[chave]
+
+    def guardar(self, chave, pontuacao):
+        self.entradas[chave] = pontuacao
+        self.entradas.move_to_end(chave)
+        while len(self.entradas) > self.capacidade:
+            self.entradas.popitem(last=False)
+
+    def avaliar(self, itens, calcular):
+        """Pontuação de cada item (individuo, sementes), na ordem recebida.
+
+        Só os itens fora do cache são passados a `calcular`, cada um uma única
+        vez mesmo que apareça repetido; `calcular` recebe a lista desses itens
+        e retorna suas pontuações na mesma ordem.
+        """
+        chaves = [self.chave(individuo, sementes) for individuo, sementes in itens]
+        pontuacoes = [self.obter(chave) for chave in chaves]
+
+        faltando = {}
+        for item, chave, pontuacao in zip(itens, chaves, pontuacoes):
+            if pontuacao is not None:
+                self.acertos += 1
+            elif chave in faltando:
+                self.duplicados += 1
+            else:
+                faltando[chave] = item
+
+        if faltando:
+            calculadas = dict(zip(faltando, calcular(list(faltando.values()))))
+            for chave, pontuacao in calculadas.items():
+                self.guardar(chave, pontuacao)
+            self.avaliados += len(calculadas)
+            pontuacoes = [calculadas[c] if p is None else p for c, p in zip(chaves, pontuacoes)]
+
+        return pontuacoes
+
+    def salvar(self):
+        """Grava as entradas no arquivo (substituição atômica)"""
+        if not self.arquivo:
+            return
+        dados = [
+            {"pesos": list(pesos), "sementes": list(sementes), "versao": versao, "score": score}
+            for (pesos, sementes, versao), score in self.entradas.items()
+        ]
+        temporario = self.arquivo + ".tmp"
+        with open(temporario, "w") as f:
+            json.dump(dados, f)
+        os.replace(temporario, self.arquivo)
+
+    def carregar(self):
+        """Carrega as entradas do arquivo, na ordem em que foram gravadas"""
+        try:
+            with open(self.arquivo, "r") as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return
+        for item in dados:
+            chave = (tuple(item["pesos"]), tuple(item["sementes"]), item["versao"])
+            self.guardar(chave, item["score"])
+
+    def resumo(self):
+        return (f"{self.acertos} reaproveitados, {self.duplicados} duplicados, "
+                f"{self.avaliados} avaliados, {len(self)} no cache")
@@ -0,0 +1,130 @@
+import numpy as np
+from config import LARGURA, ALTURA
+
+# Ordem das características retornadas pelo extrator.
+# As 4 primeiras são as usadas pelos pesos da IA (mesma tupla de Tetris.heuristica).
+NOMES_BASICOS = ("linhas", "altura", "buracos", "uniformidade")
+NOMES_EXTRAS = (
+    "altura_agregada",       # soma das alturas das colunas
+    "pocos",                 # soma da profundidade dos poços (vizinhos mais altos dos dois lados)
+    "transicoes_linha",      # trocas ocupado/vazio ao longo das linhas (paredes contam como ocupadas)
+    "transicoes_coluna",     # trocas ocupado/vazio ao longo das colunas (chão conta como ocupado)
+    "profundidade_buracos",  # para cada buraco, quantas células ocupadas há acima dele
+)
+NOMES_CARACTERISTICAS = NOMES_BASICOS + NOMES_EXTRAS
+
+
+def penalidade(extras=False):
+    """Métricas devolvidas para jogadas fora do tabuleiro (penalidade alta)"""
+    return (-999,) + (99,) * (len(NOMES_CARACTERISTICAS if extras else NOMES_BASICOS) - 1)
+
+
+def profundidade_pocos(alturas):
+    """Soma, para cada coluna, quanto ela está abaixo do menor vizinho (paredes têm altura máxima)"""
+    total = 0
+    for x, h in enumerate(alturas):
+        esquerda = alturas[x - 1] if x > 0 else ALTURA
+        direita = alturas[x + 1] if x < LARGURA - 1 else ALTURA
+        total += max(0, min(esquerda, direita) - h)
+    return total
+
+
+def extrair_caracteristicas(tab, extras=False):
+    """Extrai as características do tabuleiro percorrendo cada coluna uma única vez.
+
+    Retorna (linhas, altura, buracos, uniformidade), com os mesmos valores de
+    Tetris.heuristica, ou as 9 características de NOMES_CARACTERISTICAS se
+    `extras` for verdadeiro.
+    """
+    ocupadas_por_linha = [0] * ALTURA
+    contagem = [0] * LARGURA
+    alturas = [0] * LARGURA
+    buracos = 0
+    profundidade = 0
+    transicoes_linha = 0
+    transicoes_coluna = 0
+
+    for x in range(LARGURA):
+        acima = 0          # células ocupadas já vistas nesta coluna
+        anterior = False   # acima do tabuleiro conta como vazio
+        for y in range(ALTURA):
+            ocupada = tab[y][x] != 0
+            if ocupada:
+                if not acima:
+                    alturas[x] = ALTURA - y
+                acima += 1
+                ocupadas_por_linha[y] += 1
+            elif acima:
+                buracos += 1
+                profundidade += acima
+
+            if extras:
+                if ocupada != anterior:
+                    transicoes_coluna += 1
+                # Parede esquerda conta como ocupada
+                vizinha = tab[y][x - 1] != 0 if x > 0 else True
+                if ocupada != vizinha:
+                    transicoes_linha += 1
+                # Parede direita
+                if x == LARGURA - 1 and not ocupada:
+                    transicoes_linha += 1
+            anterior = ocupada
+
+        if extras and not anterior:
+            transicoes_coluna += 1  # chão conta como ocupado
+        contagem[x] = acima
+
+    linhas = sum(1 for n in ocupadas_por_linha if n == LARGURA)
+    altura = max((y for y, n in enumerate(ocupadas_por_linha) if n), default=0)
+    uniformidade = sum(abs(a - b) for a, b in zip(contagem, contagem[1:]))
+
+    if not extras:
+        return linhas, altura, buracos, uniformidade
+
+    return (linhas, altura, buracos, uniformidade,
+            sum(alturas), profundidade_pocos(alturas),
+            transicoes_linha, transicoes_coluna, profundidade)
+
+
+def extrair_caracteristicas_lote(tabs, extras=False):
+    """Versão vetorizada: recebe um lote de tabuleiros (n x ALTURA x LARGURA) e retorna
+    uma matriz (n x características) com os mesmos valores de extrair_caracteristicas"""
+    ocupadas = np.asarray(tabs, dtype=bool).view(np.int8)
+    n = ocupadas.shape[0]
+
+    por_linha = ocupadas.sum(axis=2, dtype=np.int16)
+    linhas = (por_linha == LARGURA).sum(axis=1)
+    linha_com_celula = por_linha > 0
+    ultima = ALTURA - 1 - np.argmax(linha_com_celula[:, ::-1], axis=1)
+    altura = np.where(linha_com_celula.any(axis=1), ultima, 0)
+
+    # Quantas células ocupadas há na coluna até cada linha (inclusive);
+    # toda célula com acumulado > 0 é ocupada ou buraco
+    acumulado = np.cumsum(ocupadas, axis=1, dtype=np.int16)
+    contagem = acumulado[:, -1, :]
+    buracos = np.count_nonzero(acumulado.reshape(n, -1), axis=1) - contagem.sum(axis=1)
+
+    uniformidade = np.abs(np.diff(contagem, axis=1)).sum(axis=1)
+
+    if not extras:
+        return np.stack([linhas, altura, buracos, uniformidade], axis=1)
+
+    tem_celula = contagem > 0
+    alturas = np.where(tem_celula, ALTURA - np.argmax(ocupadas, axis=1), 0)
+    com_paredes = np.pad(alturas, ((0, 0), (1, 1)), constant_values=ALTURA)
+    pocos = np.maximum(0, np.minimum(com_paredes[:, :-2], com_paredes[:, 2:]) - alturas).sum(axis=1)
+
+    linhas_paredes = np.ones((n, ALTURA, LARGURA + 2), dtype=bool)
+    linhas_paredes[:, :, 1:-1] = ocupadas
+    transicoes_linha = (linhas_paredes[:, :, 1:] != linhas_paredes[:, :, :-1]).sum(axis=(1, 2))
+
+    colunas_chao = np.zeros((n, ALTURA + 2, LARGURA), dtype=bool)
+    colunas_chao[:, 1:-1, :] = ocupadas
+    colunas_chao[:, -1, :] = True
+    transicoes_coluna = (colunas_chao[:, 1:, :] != colunas_chao[:, :-1, :]).sum(axis=(1, 2))
+
+    profundidade = (acumulado * (1 - ocupadas)).sum(axis=(1, 2))
+
+    return np.stack([linhas, altura, buracos, uniformidade,
+                     alturas.sum(axis=1), pocos,
+                     transicoes_linha, transicoes_coluna, profundidade], axis=1)
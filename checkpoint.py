@@ -0,0 +1,84 @@
+import json
+import os
+import random
+import numpy as np
+
+from config import (
+    POP_SIZE, MUTATION_RATE, ELITE, JOGOS_POR_INDIVIDUO, AVALIACAO_CORRIDA, JOGOS_MAX_CORRIDA
+)
+from cache_fitness import versao_avaliacao
+
+
+def configuracao_treino():
+    """Configuração que precisa ser a mesma para a retomada continuar a execução igual"""
+    return {
+        "pop_size": POP_SIZE,
+        "mutation_rate": MUTATION_RATE,
+        "elite": ELITE,
+        "jogos_por_individuo": JOGOS_POR_INDIVIDUO,
+        "avaliacao_corrida": AVALIACAO_CORRIDA,
+        "jogos_max_corrida": JOGOS_MAX_CORRIDA,
+        "versao_avaliacao": versao_avaliacao(),
+    }
+
+
+def salvar_checkpoint(caminho, geracao, populacao, pontuacoes, sementes, melhor_score):
+    """Grava o estado completo do treinamento em um .npz (substituição atômica).
+
+    `geracao` é a próxima geração a avaliar e `populacao` a população dela;
+    `pontuacoes` são as da geração anterior. Os estados dos geradores
+    aleatórios (random e np.random) são os do momento da gravação.
+    """
+    versao, estado_random, gauss = random.getstate()
+    nome_np, chaves_np, posicao_np, tem_gauss_np, gauss_np = np.random.get_state()
+
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as f:
+        np.savez(
+            f,
+            geracao=geracao,
+            populacao=np.array(populacao, dtype=float),
+            pontuacoes=np.array(pontuacoes, dtype=float),
+            sementes=np.array(sementes, dtype=np.int64),
+            melhor_score=melhor_score,
+            random_estado=np.array(estado_random, dtype=np.uint64),
+            random_extra=json.dumps([versao, gauss]),
+            np_random_chaves=chaves_np,
+            np_random_extra=json.dumps([nome_np, int(posicao_np), int(tem_gauss_np), float(gauss_np)]),
+            configuracao=json.dumps(configuracao_treino(), sort_keys=True),
+        )
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporario, caminho)
+
+
+def carregar_checkpoint(caminho):
+    """Lê um checkpoint e restaura os geradores aleatórios.
+
+    Retorna um dict com geracao, populacao (lista de arrays), pontuacoes,
+    sementes, melhor_score e configuracao, ou None se o arquivo não existir.
+    """
+    if not os.path.exists(caminho):
+        return None
+
+    with np.load(caminho) as dados:
+        versao, gauss = json.loads(str(dados["random_extra"]))
+        random.setstate((versao, tuple(int(v) for v in dados["random_estado"]), gauss))
+        nome_np, posicao_np, tem_gauss_np, gauss_np = json.loads(str(dados["np_random_extra"]))
+        np.random.set_state((nome_np, dados["np_random_chaves"], posicao_np, tem_gauss_np, gauss_np))
+
+        return {
+            "geracao": int(dados["geracao"]),
+            "populacao": [np.array(individuo) for individuo in dados["populacao"]],
+            "pontuacoes": dados["pontuacoes"].tolist(),
+            "sementes": [int(s) for s in dados["sementes"]],
+            "melhor_score": dados["melhor_score"].item(),
+            "configuracao": json.loads(str(dados["configuracao"])),
+        }
+
+
+def diferencas_configuracao(configuracao):
+    """Itens da configuração atual que mudaram desde o checkpoint"""
+    atual = configuracao_treino()
+    return {chave: (configuracao.get(chave), valor)
+            for chave, valor in atual.items() if configuracao.get(chave) != valor}
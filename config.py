@@ -6,14 +6,47 @@
 POP_SIZE = 30
 N_GENERATIONS = 20
 MUTATION_RATE = 0.2
-SAVE_FILE = "melhores_pesos.json"
+SAVE_FILE = "melhores_pesos.json"  # Formato antigo (melhor de cada geração); importado para o HISTORICO_FILE
+HISTORICO_FILE = "historico.jsonl"  # Histórico de todos os indivíduos avaliados (com índice em historico.jsonl.idx)
 N_PROCESSES = 7  # Número de processos para paralelização
+AVALIACAO_EM_LOTE = False  # Joga a população inteira em passo único (jogos_em_lote.py)
+MAX_PECAS = 500  # Limite de peças por partida nas avaliações peça a peça
+MODO_FITNESS = "queda"  # "queda": uma jogada por peça (hard drop); "passo": replaneja a cada queda de linha
+MAX_PASSOS = 500  # Limite de passos de gravidade por partida no modo "passo"
+JOGOS_POR_INDIVIDUO = 3  # Partidas por indivíduo; todos jogam com as mesmas sementes
+AVALIACAO_CORRIDA = False  # Corrida: começa com JOGOS_POR_INDIVIDUO partidas e descarta a metade pior a cada rodada
+JOGOS_MAX_CORRIDA = 12  # Máximo de partidas por indivíduo na corrida
+GERADOR_PECAS = "uniforme"  # Sorteio das peças: "uniforme" ou "saco" (7-bag)
+ELITE = 0  # Quantos dos melhores indivíduos passam direto para a próxima geração
+CACHE_FITNESS_TAMANHO = 10000  # Máximo de pontuações guardadas no cache de fitness (LRU)
+CACHE_FITNESS_ARQUIVO = None  # Arquivo para manter o cache entre execuções (ex.: "cache_fitness.json")
+SERVIDOR_AVALIACAO = None  # ("host", porta) para distribuir a avaliação entre máquinas (fila_distribuida.py)
+CHAVE_SERVIDOR = None  # Chave de autenticação entre o treinamento e os trabalhadores (None: variável TETRIS_IA_CHAVE ou uma chave aleatória, mostrada ao iniciar a fila)
+PRAZO_TRABALHADOR = 30  # Segundos sem sinal até as tarefas de um trabalhador voltarem para a fila
+CHECKPOINT_FILE = "checkpoint.npz"  # Estado completo do treinamento para retomar após interrupção (None desativa)
+CHECKPOINT_INTERVALO = 1  # Gerações entre checkpoints
+INSTRUMENTACAO = False  # Contadores e tempos do motor e da busca por geração (instrumentacao.py)
+INSTRUMENTACAO_ARQUIVO = "instrumentacao.jsonl"  # Registro por geração dos contadores (None: só exibe)
+PERFIL_GERACAO = None  # Geração a perfilar com cProfile em todos os processos (None: nenhuma; perfil.py)
+PERFIL_ARQUIVO = "perfil_geracao_{geracao}.prof"  # Arquivo pstats do perfil agregado
+PERFIL_TOP = 25  # Funções mostradas no resumo do perfil
+RASTROS_DIR = None  # Diretório onde o fitness grava as partidas jogadas (rastros.py; None: não grava)
+CACHE_TRANSPOSICAO = 0  # Tabuleiros com características guardadas por processo (transposicao.py; 0 desativa)
+CACHE_TRANSPOSICAO_PASSO = 20000  # Capacidade ligada na primeira partida no modo "passo", onde quase tudo é acerto (0: não liga)
 
 # Configurações do Tetris
 LARGURA, ALTURA = 10, 20
 TAMANHO_BLOCO = 30
 VELOCIDADE_IA = 20  # FPS para visualização da IA
 VELOCIDADE_HUMANO = 10  # FPS para jogo humano
+ADIANTAMENTO_IA = 500  # Jogadas que a IA pode calcular à frente da tela no replay
+PASSOS_AVANCO_RAPIDO = 8  # Passos por quadro no avanço rápido do replay (tecla F)
+FPS_TURBO = 10  # Quadros desenhados por segundo no modo turbo do replay (tecla T)
+PRAZO_JOGADA = 0.02  # Segundos por decisão da IA no replay; a busca para e joga a melhor até ali (None: sem limite). Só vale para "simples" e "antecipada"
+BUSCA_REPLAY = "antecipada"  # Busca da IA no replay ("lote" é uma única avaliação e não para no prazo)
+MOTOR = "lista"  # Motor do jogo: "lista" (tabuleiro em listas) ou "bitboard"
+BUSCA = "lote"  # Busca de jogadas da IA: "simples" (uma a uma), "lote" (vetorizada com NumPy) ou "antecipada" (com a próxima peça)
+LARGURA_FEIXE = 5  # Jogadas da peça atual expandidas com a próxima peça na busca "antecipada"
 
 # Peças do Tetris (representadas por números)
 PECAS = [
@@ -0,0 +1,78 @@
+import math
+from collections import namedtuple
+import numpy as np
+
+# Resultado de um indivíduo na corrida:
+#   media      - pontuação média nas partidas jogadas
+#   intervalo  - meia largura do intervalo de confiança de 95% da média (inf com 1 partida)
+#   episodios  - quantas partidas o indivíduo jogou
+#   rodada     - última rodada em que o indivíduo ainda estava na corrida
+ResultadoCorrida = namedtuple("ResultadoCorrida", ["media", "intervalo", "episodios", "rodada"])
+
+
+def intervalo_confianca(pontos, z=1.96):
+    """Meia largura do intervalo de confiança da média (aproximação normal)"""
+    if len(pontos) < 2:
+        return math.inf
+    return z * float(np.std(pontos, ddof=1)) / math.sqrt(len(pontos))
+
+
+def avaliar_corrida(populacao, sementes, jogar, jogos_iniciais=2, fator=2):
+    """Avalia a população por corrida (successive halving).
+
+    Todos começam jogando `jogos_iniciais` partidas; a cada rodada a metade
+    pior (pela média nas mesmas sementes) sai da corrida e os restantes
+    jogam `fator` vezes mais partidas, até esgotar `sementes` ou sobrar um
+    indivíduo. `jogar` recebe uma lista de pares (individuo, semente) e
+    retorna a pontuação de cada partida, na mesma ordem.
+
+    Retorna uma lista de ResultadoCorrida, na ordem da população.
+    """
+    pontos = [[] for _ in populacao]
+    rodada_final = [0] * len(populacao)
+    vivos = list(range(len(populacao)))
+    jogadas = 0
+    alvo = min(jogos_iniciais, len(sementes))
+    rodada = 0
+
+    while True:
+        novas = sementes[jogadas:alvo]
+        pares = [(i, semente) for i in vivos for semente in novas]
+        for (i, _), pontuacao in zip(pares, jogar([(populacao[i], semente) for i, semente in pares])):
+            pontos[i].append(pontuacao)
+        for i in vivos:
+            rodada_final[i] = rodada
+        jogadas = alvo
+
+        if len(vivos) <= 1 or jogadas >= len(sementes):
+            break
+
+        # A metade pior sai; os sobreviventes jogam mais partidas
+        vivos.sort(key=lambda i: np.mean(pontos[i]), reverse=True)
+        vivos = vivos[:math.ceil(len(vivos) / 2)]
+        alvo = min(jogadas * fator, len(sementes))
+        rodada += 1
+
+    return [
+        ResultadoCorrida(float(np.mean(p)), intervalo_confianca(p), len(p), r)
+        for p, r in zip(pontos, rodada_final)
+    ]
+
+
+def pontuacoes_corrida(resultados):
+    """Pontuação de seleção de cada indivíduo, coerente com a ordem da corrida.
+
+    Quem saiu numa rodada perdeu, nas mesmas sementes, para todos que
+    continuaram; por isso sua pontuação é limitada à menor média dos que
+    seguiram além dessa rodada.
+    """
+    pontuacoes = [r.media for r in resultados]
+    ultima_rodada = max(r.rodada for r in resultados)
+    teto = math.inf
+    for rodada in range(ultima_rodada, -1, -1):
+        indices = [i for i, r in enumerate(resultados) if r.rodada == rodada]
+        for i in indices:
+            pontuacoes[i] = min(pontuacoes[i], teto)
+        if indices:
+            teto = min(teto, min(pontuacoes[i] for i in indices))
+    return pontuacoes
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Avaliação distribuída: uma fila de tarefas servida pelo treinamento e
+trabalhadores em qualquer máquina que tenha uma cópia do projeto.
+
+No treinamento, defina SERVIDOR_AVALIACAO em config.py; em cada máquina:
+
+    python fila_distribuida.py HOST:PORTA --chave CHAVE --processos 8
+
+A fila troca pickles com os trabalhadores: quem tem a chave pode executar
+código dos dois lados. Sem chave configurada (CHAVE_SERVIDOR ou a variável
+de ambiente TETRIS_IA_CHAVE), o treinamento gera uma aleatória e a mostra.
+"""
+
+import argparse
+import ipaddress
+import os
+import secrets
+import socket
+import threading
+import time
+from collections import deque
+from multiprocessing import Process, cpu_count
+from multiprocessing.managers import BaseManager
+
+from config import CHAVE_SERVIDOR, PRAZO_TRABALHADOR
+from avaliador import _inicializar_worker
+
+
+class FilaTarefas:
+    """Fila de tarefas com empréstimo: cada tarefa entregue a um trabalhador
+    volta para a fila se ele ficar mais de `prazo` segundos sem dar sinal.
+
+    Fica no processo do treinamento; os trabalhadores a usam por proxy
+    (multiprocessing.managers), então todos os métodos são seguros entre threads.
+    """
+
+    def __init__(self, prazo=PRAZO_TRABALHADOR):
+        self.prazo = prazo
+        self.condicao = threading.Condition()
+        self.pendentes = deque()
+        self.tarefas = {}        # id -> tarefa ainda sem resultado
+        self.emprestadas = {}    # id -> trabalhador que está com a tarefa
+        self.resultados = {}     # id -> (ok, valor, trabalhador)
+        self.vistos = {}         # trabalhador -> último sinal (time.monotonic)
+        self.proximo_id = 0
+        self.encerrada = False
+
+    def publicar(self, tarefas):
+        """Coloca as tarefas na fila e retorna seus ids, na mesma ordem"""
+        with self.condicao:
+            ids = list(range(self.proximo_id, self.proximo_id + len(tarefas)))
+            self.proximo_id += len(tarefas)
+            for id_tarefa, tarefa in zip(ids, tarefas):
+                self.tarefas[id_tarefa] = tarefa
+                self.pendentes.append(id_tarefa)
+            self.condicao.notify_all()
+        return ids
+
+    def sinal(self, trabalhador):
+        """Avisa que o trabalhador continua vivo"""
+        with self.condicao:
+            self.vistos[trabalhador] = time.monotonic()
+
+    def _recolocar_expiradas(self):
+        """Devolve à fila as tarefas de trabalhadores que pararam de dar sinal"""
+        limite = time.monotonic() - self.prazo
+        for id_tarefa, trabalhador in list(self.emprestadas.items()):
+            if self.vistos.get(trabalhador, 0) < limite:
+                del self.emprestadas[id_tarefa]
+                self.pendentes.appendleft(id_tarefa)
+                self.condicao.notify_all()
+
+    def pegar(self, trabalhador, espera=1.0):
+        """Empresta a próxima tarefa: (id, tarefa), ou None se não houver nenhuma em `espera` segundos"""
+        fim = time.monotonic() + espera
+        with self.condicao:
+            self.vistos[trabalhador] = time.monotonic()
+            while not self.encerrada:
+                self._recolocar_expiradas()
+                while self.pendentes:
+                    id_tarefa = self.pendentes.popleft()
+                    if id_tarefa in self.tarefas:  # pode ter sido concluída por outro trabalhador
+                        self.emprestadas[id_tarefa] = trabalhador
+                        return id_tarefa, self.tarefas[id_tarefa]
+                restante = fim - time.monotonic()
+                if restante <= 0:
+                    break
+                self.condicao.wait(min(restante, self.prazo))
+        return None
+
+    def entregar(self, trabalhador, id_tarefa, ok, valor):
+        """Recebe o resultado de uma tarefa; resultados repetidos são ignorados"""
+        with self.condicao:
+            self.vistos[trabalhador] = time.monotonic()
+            if id_tarefa in self.tarefas:
+                del self.tarefas[id_tarefa]
+                self.emprestadas.pop(id_tarefa, None)
+                self.resultados[id_tarefa] = (ok, valor, trabalhador)
+                self.condicao.notify_all()
+
+    def coletar(self, id_tarefa):
+        """Espera e retorna (ok, valor, trabalhador) de uma tarefa publicada"""
+        with self.condicao:
+            while id_tarefa not in self.resultados:
+                self._recolocar_expiradas()
+                self.condicao.wait(min(1.0, self.prazo))
+            return self.resultados.pop(id_tarefa)
+
+    def intervalo_sinal(self):
+        """De quanto em quanto tempo os trabalhadores devem dar sinal"""
+        return self.prazo / 3
+
+    def trabalhadores_ativos(self):
+        """Trabalhadores que deram sinal dentro do prazo"""
+        with self.condicao:
+            limite = time.monotonic() - self.prazo
+            return sorted(t for t, visto in self.vistos.items() if visto >= limite)
+
+    def encerrar(self):
+        with self.condicao:
+            self.encerrada = True
+            self.condicao.notify_all()
+
+    def esta_encerrada(self):
+        return self.encerrada
+
+
+class _GerenciadorFila(BaseManager):
+    pass
+
+
+VARIAVEL_CHAVE = "TETRIS_IA_CHAVE"
+# Chave que já esteve em config.py (pública): só vale para endereços locais
+CHAVE_PUBLICA = b"tetris-ia"
+
+
+def chave_configurada(chave=None):
+    """Chave dada, senão CHAVE_SERVIDOR, senão a variável de ambiente TETRIS_IA_CHAVE (ou None)"""
+    chave = chave or CHAVE_SERVIDOR or os.environ.get(VARIAVEL_CHAVE)
+    if isinstance(chave, str):
+        chave = chave.encode()
+    return chave or None
+
+
+def endereco_local(host):
+    """Se o host é só de loopback ("" e "0.0.0.0" escutam em todas as interfaces)"""
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback if host else False
+    except (OSError, ValueError):
+        return False
+
+
+def endereco_de(texto):
+    """Converte "host:porta" em (host, porta)"""
+    host, _, porta = texto.rpartition(":")
+    return host or "localhost", int(porta)
+
+
+class ServidorAvaliacao:
+    """Avaliador (mesma interface de AvaliadorParalelo) que distribui as tarefas
+    pela fila para trabalhadores conectados de qualquer máquina.
+
+    As funções e argumentos das tarefas são enviados com pickle: os
+    trabalhadores precisam da mesma versão do projeto. Sem chave configurada,
+    uma aleatória é gerada (self.chave, com self.chave_gerada verdadeiro) e
+    precisa ser passada aos trabalhadores. A chave pública antiga só é aceita
+    em endereços locais.
+    """
+
+    BLOCOS_POR_PROCESSO = 4
+
+    def __init__(self, endereco=("127.0.0.1", 0), chave=None, prazo=PRAZO_TRABALHADOR):
+        chave = chave_configurada(chave)
+        self.chave_gerada = chave is None
+        self.chave = chave or secrets.token_hex(16).encode()
+        if self.chave == CHAVE_PUBLICA and not endereco_local(endereco[0]):
+            raise ValueError(f"A chave {CHAVE_PUBLICA!r} é pública: defina outra (CHAVE_SERVIDOR ou "
+                             f"{VARIAVEL_CHAVE}) para escutar em {endereco[0] or 'todas as interfaces'}")
+        self.fila = FilaTarefas(prazo)
+        _GerenciadorFila.register("fila", callable=lambda: self.fila)
+        self.gerenciador = _GerenciadorFila(address=tuple(endereco), authkey=self.chave)
+        self.servidor = self.gerenciador.get_server()
+        self.endereco = self.servidor.address
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+
+    @property
+    def processos(self):
+        """Trabalhadores conectados no momento (pelo menos 1)"""
+        return max(1, len(self.fila.trabalhadores_ativos()))
+
+    def tamanho_bloco(self, n_tarefas):
+        return max(1, -(-n_tarefas // (self.processos * self.BLOCOS_POR_PROCESSO)))
+
+    def _publicar(self, funcao, tarefas, estrela):
+        """Divide as tarefas em blocos e coloca todos na fila de uma vez"""
+        tarefas = list(tarefas)
+        tamanho = self.tamanho_bloco(len(tarefas))
+        blocos = [(funcao, tarefas[i:i + tamanho], estrela) for i in range(0, len(tarefas), tamanho)]
+        return self.fila.publicar(blocos)
+
+    def _coletar(self, ids):
+        for id_tarefa in ids:
+            ok, valores, trabalhador = self.fila.coletar(id_tarefa)
+            if not ok:
+                raise RuntimeError(f"Erro no trabalhador {trabalhador}: {valores}")
+            yield from valores
+
+    def imap(self, funcao, tarefas):
+        """Resultados em ordem, conforme os blocos ficam prontos"""
+        return self._coletar(self._publicar(funcao, tarefas, estrela=False))
+
+    def map(self, funcao, tarefas):
+        return list(self.imap(funcao, tarefas))
+
+    def starmap(self, funcao, tarefas):
+        return list(self._coletar(self._publicar(funcao, tarefas, estrela=True)))
+
+    def fechar(self):
+        """Avisa os trabalhadores que o treinamento acabou e para o servidor"""
+        self.fila.encerrar()
+        time.sleep(min(1.0, self.fila.prazo))  # dá tempo dos trabalhadores verem o aviso
+        self.servidor.stop_event.set()
+        self.servidor.listener.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+        return False
+
+
+def _manter_sinal(fila, trabalhador, intervalo, parar):
+    """Thread do trabalhador: dá sinal de vida enquanto executa tarefas longas"""
+    while not parar.wait(intervalo):
+        try:
+            fila.sinal(trabalhador)
+        except (OSError, EOFError):
+            return
+
+
+def trabalhar(endereco, chave=None, nome=None):
+    """Laço de um trabalhador: pega tarefas da fila, executa e devolve os resultados.
+
+    Termina quando o treinamento encerra a fila ou a conexão cai.
+    """
+    chave = chave_configurada(chave)
+    if chave is None:
+        raise ValueError(f"Sem chave da fila: use --chave ou a variável de ambiente {VARIAVEL_CHAVE}")
+    trabalhador = nome or f"{socket.gethostname()}:{os.getpid()}"
+    _inicializar_worker()
+    _GerenciadorFila.register("fila")
+    gerenciador = _GerenciadorFila(address=tuple(endereco), authkey=chave)
+    gerenciador.connect()
+    fila = gerenciador.fila()
+
+    parar = threading.Event()
+    threading.Thread(target=_manter_sinal, args=(fila, trabalhador, fila.intervalo_sinal(), parar),
+                     daemon=True).start()
+
+    concluidas = 0
+    try:
+        while not fila.esta_encerrada():
+            emprestada = fila.pegar(trabalhador)
+            if emprestada is None:
+                continue
+            id_tarefa, (funcao, itens, estrela) = emprestada
+            try:
+                valores = [funcao(*item) if estrela else funcao(item) for item in itens]
+                fila.entregar(trabalhador, id_tarefa, True, valores)
+            except Exception as e:
+                fila.entregar(trabalhador, id_tarefa, False, repr(e))
+            concluidas += 1
+    except (OSError, EOFError):
+        pass  # servidor encerrado
+    finally:
+        parar.set()
+    return concluidas
+
+
+def iniciar_trabalhadores(endereco, n_processos, chave=None):
+    """Inicia `n_processos` trabalhadores nesta máquina (cada um é um "nó" independente)"""
+    chave = chave_configurada(chave)
+    if chave is None:
+        raise ValueError(f"Sem chave da fila: use --chave ou a variável de ambiente {VARIAVEL_CHAVE}")
+    processos = [Process(target=trabalhar, args=(endereco, chave), daemon=True) for _ in range(n_processos)]
+    for processo in processos:
+        processo.start()
+    return processos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trabalhador da avaliação distribuída do Tetris IA")
+    parser.add_argument("servidor", help="endereço da fila no formato HOST:PORTA")
+    parser.add_argument("--processos", type=int, default=cpu_count(),
+                        help="trabalhadores a iniciar nesta máquina (padrão: número de CPUs)")
+    parser.add_argument("--chave", help=f"chave mostrada pelo treinamento (padrão: CHAVE_SERVIDOR ou {VARIAVEL_CHAVE})")
+    args = parser.parse_args()
+
+    endereco = endereco_de(args.servidor)
+    if chave_configurada(args.chave) is None:
+        parser.error(f"informe a chave da fila com --chave ou a variável de ambiente {VARIAVEL_CHAVE}")
+    print(f"🌐 Iniciando {args.processos} trabalhador(es) para {endereco[0]}:{endereco[1]}")
+    for processo in iniciar_trabalhadores(endereco, args.processos, args.chave):
+        processo.join()
+    print("✅ Fila encerrada")
+
+
+if __name__ == "__main__":
+    main()
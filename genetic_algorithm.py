@@ -1,63 +1,166 @@
 import random
 import numpy as np
-import json
 import os
-from multiprocessing import Pool, cpu_count
+import time
+from contextlib import nullcontext
+from multiprocessing import cpu_count
 from functools import partial
 from tqdm import tqdm
 
-from config import POP_SIZE, N_GENERATIONS, MUTATION_RATE, SAVE_FILE, N_PROCESSES, LARGURA
-from tetris import Tetris
+from config import (
+    POP_SIZE, N_GENERATIONS, MUTATION_RATE, N_PROCESSES, AVALIACAO_EM_LOTE,
+    MODO_FITNESS, MAX_PECAS, MAX_PASSOS, JOGOS_POR_INDIVIDUO,
+    AVALIACAO_CORRIDA, JOGOS_MAX_CORRIDA, ELITE, SERVIDOR_AVALIACAO,
+    CHECKPOINT_FILE, CHECKPOINT_INTERVALO, PERFIL_GERACAO
+)
+from tetris import criar_jogo
+from agente import busca_configurada, aplicar_jogada
+from jogos_em_lote import jogar_em_lote
+from corrida import avaliar_corrida, pontuacoes_corrida
+from avaliador import AvaliadorParalelo, processos_disponiveis
+from cache_fitness import CacheFitness
+from fila_distribuida import ServidorAvaliacao
+from checkpoint import salvar_checkpoint, carregar_checkpoint, diferencas_configuracao
+from historico import abrir_historico
+import instrumentacao
+import perfil
+import rastros
+import transposicao
+
+
+def fitness(individuo, pbar=None, motor=None, busca=None, modo=None, semente=None):
+    """Calcula o fitness de um indivíduo jogando uma partida de Tetris (ver jogar_partida)"""
+    return jogar_partida(individuo, pbar, motor, busca, modo, semente).pontos
+
+
+def jogar_partida(individuo, pbar=None, motor=None, busca=None, modo=None, semente=None):
+    """Joga uma partida de Tetris com os pesos do indivíduo e retorna o jogo terminado.
+
+    No modo "queda" (padrão) a IA escolhe uma jogada por peça e a peça cai
+    direto, com limite de MAX_PECAS peças. No modo "passo" a busca é refeita
+    a cada passo de gravidade, com limite de MAX_PASSOS passos. A `semente`
+    define a sequência de peças da partida.
+    """
+    jogo = criar_jogo(motor, semente)
+    escolher_jogada = busca_configurada(busca)
+    modo = modo or MODO_FITNESS
+
+    # Desativada, a instrumentação custa só esta verificação por partida
+    if instrumentacao.ATIVA:
+        inicio = time.perf_counter()
+        jogo = instrumentacao.instrumentar(jogo)
+        escolher_jogada = instrumentacao.cronometrar_busca(escolher_jogada)
+    if rastros.ATIVO:
+        jogadas = rastros.anotar_jogadas(jogo)
+
+    if modo == "queda":
+        pecas = 0
+        while not jogo.game_over and pecas < MAX_PECAS:
+            # Sem jogada boa, a peça cai onde está
+            x, rot = escolher_jogada(jogo, individuo) or (jogo.x, 0)
+            jogo.jogar_peca(x, rot)
+            pecas += 1
+
+            # Atualiza barra de progresso se fornecida
+            if pbar:
+                pbar.update(1)
+
+    elif modo == "passo":
+        transposicao.preparar_modo_passo()
+        _jogar_passo_a_passo(jogo, individuo, escolher_jogada, pbar)
+
+    else:
+        raise ValueError(f"Modo de fitness desconhecido: {modo}")
+
+    if instrumentacao.ATIVA:
+        instrumentacao.fim_de_partida(jogo, time.perf_counter() - inicio)
+    if rastros.ATIVO:
+        rastros.gravar_partida(jogo, jogadas, individuo, semente)
+    return jogo
 
 
-def fitness(individuo, pbar=None):
-    """Calcula o fitness de um indivíduo jogando Tetris"""
-    jogo = Tetris()
+def _jogar_passo_a_passo(jogo, individuo, escolher_jogada, pbar=None):
+    """Modo "passo": a busca é refeita a cada passo de gravidade"""
     total_score = 0
 
     while not jogo.game_over:
-        melhor_score = -99999
-        melhor_acao = None
-        
-        # Testa todas as possíveis jogadas
-        for rot in range(4):
-            for x in range(LARGURA):
-                if not jogo.colide(x, 0, jogo.peca_atual):
-                    linhas, altura, buracos, uniforme = jogo.simula_jogada(x, rot)
-                    w1, w2, w3, w4 = individuo
-                    score = w1 * linhas - w2 * buracos - w3 * altura + w4 * uniforme
-                    if score > melhor_score:
-                        melhor_score = score
-                        melhor_acao = (x, rot)
-
-        # Aplica a melhor jogada
+        # Escolhe e aplica a melhor jogada
+        melhor_acao = escolher_jogada(jogo, individuo)
         if melhor_acao:
-            x, rot = melhor_acao
-            for _ in range(rot):
-                jogo.peca_atual = [list(row) for row in zip(*jogo.peca_atual[::-1])]
-            jogo.x = x
+            aplicar_jogada(jogo, melhor_acao)
 
         jogo.passo()
         total_score += 1
 
         # Limite para evitar rodadas infinitas
-        if total_score > 500:
+        if total_score > MAX_PASSOS:
             break
 
         # Atualiza barra de progresso se fornecida
         if pbar:
             pbar.update(1)
 
-    return jogo.pontos
+
+def fitness_sementes(individuo, sementes, **opcoes):
+    """Fitness médio de um indivíduo jogando uma partida com cada semente"""
+    return float(np.mean([fitness(individuo, semente=semente, **opcoes) for semente in sementes]))
+
+
+def gerar_sementes(n_jogos=JOGOS_POR_INDIVIDUO):
+    """Sorteia as sementes das partidas usadas para avaliar todos os indivíduos"""
+    return [random.randrange(2**32) for _ in range(n_jogos)]
+
+
+def jogos_por_segundo(individuo, motor=None, n_jogos=5, semente=0, busca=None, modo=None):
+    """Mede quantas partidas por segundo o motor, a busca e o modo escolhidos conseguem jogar"""
+    # Sem o cache de transposição: a segunda medida acertaria o que a primeira guardou
+    transposicao.ativar(0)
+    try:
+        inicio = time.perf_counter()
+        for i in range(n_jogos):
+            fitness(individuo, motor=motor, busca=busca, modo=modo, semente=semente + i)
+        return n_jogos / (time.perf_counter() - inicio)
+    finally:
+        transposicao.ativar()
 
 
-def fitness_wrapper(individuo):
+def fitness_wrapper(individuo, sementes=None):
     """Wrapper para a função fitness que funciona com multiprocessing"""
     if isinstance(individuo, list):
         individuo = np.array(individuo)
+    if sementes:
+        return fitness_sementes(individuo, sementes)
     return fitness(individuo, pbar=None)
 
 
+def fitness_instrumentado(individuo, sementes=None):
+    """Como fitness_wrapper, mas retorna também os contadores do processo (ver instrumentacao.py)"""
+    instrumentacao.ativar()
+    instrumentacao.zerar()
+    score = fitness_wrapper(individuo, sementes)
+    return score, instrumentacao.coletar()
+
+
+def fitness_par(par):
+    """Fitness de uma partida a partir de um par (individuo, semente); usado com multiprocessing"""
+    individuo, semente = par
+    return fitness(np.array(individuo), semente=semente)
+
+
+def jogar_pares_lote(pares):
+    """Joga os pares (individuo, semente) em lote, agrupando as partidas por semente"""
+    por_semente = {}
+    for i, (individuo, semente) in enumerate(pares):
+        por_semente.setdefault(semente, []).append(i)
+    
+    pontuacoes = [0] * len(pares)
+    for semente, indices in por_semente.items():
+        pontos, _, _ = jogar_em_lote([pares[i][0] for i in indices], semente)
+        for i, p in zip(indices, pontos):
+            pontuacoes[i] = int(p)
+    return pontuacoes
+
+
 def crossover(pai, mae):
     """Realiza crossover entre dois indivíduos"""
     ponto = random.randint(1, len(pai) - 1)
@@ -73,28 +176,67 @@ def mutacao(individuo):
     return novo
 
 
-def avaliar_populacao_paralela(populacao, geracao):
-    """Avalia toda a população em paralelo com barra de progresso e estatísticas"""
-    print(f"\n🔄 Avaliando Geração {geracao} em paralelo ({N_PROCESSES} processos)...")
+def proxima_geracao(populacao, pontuacoes):
+    """Cria a próxima geração: elite mais filhos (crossover + mutação) da metade melhor"""
+    ordem = np.argsort(pontuacoes)
+    melhores = [populacao[i] for i in ordem[-POP_SIZE//2:]]
     
+    # A elite passa sem alterações (e sua pontuação vem do cache)
+    nova_pop = [populacao[i] for i in ordem[::-1][:ELITE]]
+    while len(nova_pop) < POP_SIZE:
+        pai, mae = random.sample(melhores, 2)
+        filho = crossover(pai, mae)
+        filho = mutacao(filho)
+        nova_pop.append(filho)
+    return nova_pop
+
+
+def avaliar_populacao_paralela(populacao, geracao, sementes=None, avaliador=None, perfilar=None):
+    """Avalia toda a população em paralelo com barra de progresso e estatísticas.
+
+    Com `sementes`, todos os indivíduos jogam as mesmas partidas (números aleatórios comuns).
+    Sem `avaliador` (ver avaliador.py), um pool temporário é criado só para esta geração.
+    Com `perfilar` (padrão: geração igual a PERFIL_GERACAO), cada avaliação roda sob o
+    cProfile no worker e o perfil somado é gravado ao fim (ver perfil.py).
+    """
     # Converte para lista de listas para serialização
-    populacao_serializavel = [individuo.tolist() for individuo in populacao]
+    populacao_serializavel = [np.asarray(individuo).tolist() for individuo in populacao]
     
+    # Com instrumentação, cada worker devolve também seus contadores (somados aqui)
+    avaliar = fitness_instrumentado if instrumentacao.ATIVA else fitness_wrapper
+    contadores = {}
+
+    if perfilar is None:
+        perfilar = geracao == PERFIL_GERACAO
+    tarefa = partial(perfil.perfilar, avaliar, sementes=sementes) if perfilar else partial(avaliar, sementes=sementes)
+    agregado = perfil.PerfilAgregado()
+
     # Processa em paralelo
-    with Pool(processes=N_PROCESSES) as pool:
+    with nullcontext(avaliador) if avaliador else AvaliadorParalelo() as avaliador:
+        print(f"\n🔄 Avaliando Geração {geracao} em paralelo ({avaliador.processos} processos)...")
+        
         # Barra de progresso para acompanhar o processamento
-        with tqdm(total=POP_SIZE, desc=f"Geração {geracao}", unit="indivíduo", 
+        with tqdm(total=len(populacao), desc=f"Geração {geracao}", unit="indivíduo", 
                   bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]') as pbar:
             
             # Executa fitness em paralelo
             pontuacoes = []
-            for score in pool.imap(fitness_wrapper, populacao_serializavel):
+            for resultado in avaliador.imap(tarefa, populacao_serializavel):
+                if perfilar:
+                    resultado, estatisticas = resultado
+                    agregado.adicionar(estatisticas)
+                if instrumentacao.ATIVA:
+                    score, parcial = resultado
+                    instrumentacao.somar(contadores, parcial)
+                else:
+                    score = resultado
                 pontuacoes.append(score)
                 pbar.update(1)
                 pbar.set_postfix({
                     'Melhor': max(pontuacoes),
                     'Média': f"{np.mean(pontuacoes):.1f}",
-                    'Atual': score
+                    'Atual': score,
+                    **(instrumentacao.postfix(contadores) if contadores else {})
                 })
     
     # Estatísticas finais
@@ -108,30 +250,44 @@ def avaliar_populacao_paralela(populacao, geracao):
     print(f"   📉 Pior: {pior_score}")
     print(f"   📈 Média: {media_score:.2f}")
     print(f"   📊 Desvio: {desvio_score:.2f}")
-    print(f"   ⚡ Velocidade: {POP_SIZE/pbar.format_dict['elapsed']:.1f} indivíduos/seg")
+    print(f"   ⚡ Velocidade: {len(populacao)/pbar.format_dict['elapsed']:.1f} indivíduos/seg")
+    if contadores:
+        imprimir_instrumentacao(geracao, contadores)
+    if perfilar:
+        perfil.relatar(agregado, geracao)
     
     return pontuacoes, melhor_score, pior_score, media_score
 
 
-def avaliar_populacao_sequencial(populacao, geracao):
+def avaliar_populacao_sequencial(populacao, geracao, sementes=None, perfilar=None):
     """Versão sequencial para comparação ou quando paralelo não é possível"""
     print(f"\n🔄 Avaliando Geração {geracao} (sequencial)...")
     
     pontuacoes = []
+    if perfilar is None:
+        perfilar = geracao == PERFIL_GERACAO
+    agregado = perfil.PerfilAgregado()
+    if instrumentacao.ATIVA:
+        instrumentacao.zerar()
     
     # Barra de progresso para a população
-    with tqdm(total=POP_SIZE, desc=f"Geração {geracao}", unit="indivíduo", 
+    with tqdm(total=len(populacao), desc=f"Geração {geracao}", unit="indivíduo", 
               bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]') as pbar:
         
         for i, individuo in enumerate(populacao):
-            score = fitness(individuo, pbar=None)
+            if perfilar:
+                score, estatisticas = perfil.perfilar(fitness_wrapper, individuo, sementes)
+                agregado.adicionar(estatisticas)
+            else:
+                score = fitness_sementes(individuo, sementes) if sementes else fitness(individuo, pbar=None)
             pontuacoes.append(score)
             
             # Atualiza estatísticas na barra principal
             pbar.set_postfix({
                 'Melhor': max(pontuacoes),
                 'Média': f"{np.mean(pontuacoes):.1f}",
-                'Atual': score
+                'Atual': score,
+                **(instrumentacao.postfix(instrumentacao.coletar()) if instrumentacao.ATIVA else {})
             })
             pbar.update(1)
     
@@ -146,65 +302,201 @@ def avaliar_populacao_sequencial(populacao, geracao):
     print(f"   📉 Pior: {pior_score}")
     print(f"   📈 Média: {media_score:.2f}")
     print(f"   📊 Desvio: {desvio_score:.2f}")
+    if instrumentacao.ATIVA:
+        imprimir_instrumentacao(geracao, instrumentacao.coletar())
+    if perfilar:
+        perfil.relatar(agregado, geracao)
     
     return pontuacoes, melhor_score, pior_score, media_score
 
 
-def salvar_melhor_geracao(melhor_pesos, melhor_score, geracao):
-    """Salva o melhor indivíduo de uma geração"""
-    # Carrega dados existentes ou cria lista vazia
-    if os.path.exists(SAVE_FILE):
-        try:
-            with open(SAVE_FILE, "r") as f:
-                data = json.load(f)
-        except:
-            data = []
+def imprimir_instrumentacao(geracao, contadores):
+    """Grava o registro da geração (INSTRUMENTACAO_ARQUIVO) e mostra o resumo dos contadores"""
+    derivados = instrumentacao.registrar(geracao, contadores)["resumo"]
+    print(f"   🔬 {contadores.get('pecas', 0)} peças, {contadores.get('linhas', 0)} linhas, "
+          f"{derivados['jogadas_por_peca']:.1f} jogadas e {derivados['colisoes_por_peca']:.0f} colisões por peça")
+    print(f"   🔬 Tempo: {derivados['fracao_busca']:.0%} na busca, "
+          f"{derivados['fracao_caracteristicas']:.0%} extraindo características, "
+          f"{derivados['taxa_transposicao']:.0%} de acertos no cache de transposição")
+
+
+def _jogar_fatia(fatia, sementes):
+    """Joga uma fatia da população em lote com cada semente; retorna (pontos médios, peças)"""
+    resultados = [jogar_em_lote(fatia, semente) for semente in sementes]
+    pontos = np.mean([pontos for pontos, _, _ in resultados], axis=0)
+    return pontos, sum(int(pecas.sum()) for _, _, pecas in resultados)
+
+
+def avaliar_populacao_lote(populacao, geracao, sementes=None, processos=1, avaliador=None):
+    """Joga toda a população em passo único (ver jogos_em_lote.py), dividida em uma fatia por processo.
+
+    Com `avaliador`, as fatias sempre vão para ele (mesmo uma só: com a fila
+    distribuída, a geração não deve rodar no processo do treinamento), uma
+    por processo dele no momento da chamada.
+    """
+    processos = avaliador.processos if avaliador else processos
+    print(f"\n🔄 Avaliando Geração {geracao} em lote ({processos} processo(s))...")
+    
+    # Todas as partidas com a mesma semente recebem a mesma sequência de peças
+    sementes = sementes or gerar_sementes(1)
+    fatias = [fatia for fatia in np.array_split(np.array(populacao), processos) if len(fatia)]
+    
+    inicio = time.perf_counter()
+    if avaliador or len(fatias) > 1:
+        with nullcontext(avaliador) if avaliador else AvaliadorParalelo(len(fatias)) as avaliador:
+            resultados = avaliador.starmap(_jogar_fatia, [(fatia, sementes) for fatia in fatias])
     else:
-        data = []
-    
-    # Adiciona o melhor da geração atual
-    novo_registro = {
-        "geracao": geracao,
-        "pesos": list(melhor_pesos),
-        "score": int(melhor_score)
-    }
-    data.append(novo_registro)
-    
-    # Salva de volta
-    with open(SAVE_FILE, "w") as f:
-        json.dump(data, f)
-
-
-def carregar_pesos():
-    """Carrega pesos salvos de gerações anteriores"""
-    if os.path.exists(SAVE_FILE):
-        with open(SAVE_FILE, "r") as f:
-            data = json.load(f)
-            # Suporte retrocompatível: se for lista de listas, converte
-            if data and isinstance(data[0], list) and not isinstance(data[0], dict):
-                return [np.array(m) for m in data]
-            # Caso novo: lista de dicts com geração
-            if data and isinstance(data[0], dict):
-                # Retorna apenas os pesos do melhor de cada geração
-                return [np.array(item["pesos"]) for item in data]
-    return None
+        resultados = [_jogar_fatia(fatias[0], sementes)]
+    duracao = time.perf_counter() - inicio
+    
+    pontuacoes = [float(p) for pontos, _ in resultados for p in pontos]
+    pecas = sum(pecas for _, pecas in resultados)
+    
+    # Estatísticas finais
+    melhor_score = max(pontuacoes)
+    pior_score = min(pontuacoes)
+    media_score = np.mean(pontuacoes)
+    desvio_score = np.std(pontuacoes)
+    
+    print(f"📊 Estatísticas da Geração {geracao}:")
+    print(f"   🏆 Melhor: {melhor_score}")
+    print(f"   📉 Pior: {pior_score}")
+    print(f"   📈 Média: {media_score:.2f}")
+    print(f"   📊 Desvio: {desvio_score:.2f}")
+    print(f"   ⚡ Velocidade: {len(pontuacoes)/duracao:.1f} indivíduos/seg ({pecas/duracao:.0f} peças/seg)")
+    
+    return pontuacoes, melhor_score, pior_score, media_score
+
+
+def partidas_com_cache(jogar, cache):
+    """Envolve uma função `jogar` da corrida: partidas já jogadas (mesmos pesos e semente) vêm do cache"""
+    def jogar_com_cache(pares):
+        itens = [(individuo, (semente,)) for individuo, semente in pares]
+        return cache.avaliar(itens, lambda faltando: list(jogar([(ind, s[0]) for ind, s in faltando])))
+    return jogar_com_cache
+
+
+def avaliar_populacao_corrida(populacao, geracao, sementes=None, processos=1, em_lote=False,
+                              avaliador=None, cache=None):
+    """Avalia a população por corrida (ver corrida.py): mais partidas só para os melhores.
+
+    Com `cache` (ver cache_fitness.py), cada partida é guardada por (pesos, semente).
+    Com `avaliador`, as partidas sempre vão para ele, mesmo com um processo só.
+    """
+    processos = avaliador.processos if avaliador else processos
+    print(f"\n🔄 Avaliando Geração {geracao} por corrida ({processos} processo(s))...")
+    
+    sementes = sementes or gerar_sementes(JOGOS_MAX_CORRIDA)
+    populacao_serializavel = [np.asarray(individuo).tolist() for individuo in populacao]
+    usar_pool = (avaliador is not None or processos > 1) and not em_lote
+    
+    inicio = time.perf_counter()
+    with nullcontext(avaliador) if avaliador or not usar_pool else AvaliadorParalelo(processos) as avaliador:
+        if em_lote:
+            jogar = jogar_pares_lote
+        elif usar_pool:
+            jogar = partial(avaliador.map, fitness_par)
+        else:
+            jogar = partial(map, fitness_par)
+        if cache is not None:
+            jogar = partidas_com_cache(jogar, cache)
+        resultados = avaliar_corrida(populacao_serializavel, sementes, jogar,
+                                     jogos_iniciais=JOGOS_POR_INDIVIDUO)
+    duracao = time.perf_counter() - inicio
+    
+    pontuacoes = pontuacoes_corrida(resultados)
+    episodios = sum(r.episodios for r in resultados)
+    
+    # Estatísticas finais
+    melhor_score = max(pontuacoes)
+    pior_score = min(pontuacoes)
+    media_score = np.mean(pontuacoes)
+    desvio_score = np.std(pontuacoes)
+    
+    print(f"📊 Estatísticas da Geração {geracao}:")
+    print(f"   🏆 Melhor: {melhor_score}")
+    print(f"   📉 Pior: {pior_score}")
+    print(f"   📈 Média: {media_score:.2f}")
+    print(f"   📊 Desvio: {desvio_score:.2f}")
+    print(f"   🎲 Partidas: {episodios} (todos com todas as sementes seriam {len(populacao) * len(sementes)})")
+    print(f"   ⚡ Velocidade: {episodios/duracao:.1f} partidas/seg")
+    for i in np.argsort(pontuacoes)[::-1][:5]:
+        r = resultados[i]
+        print(f"   #{i:3d}: {r.media:.1f} ± {r.intervalo:.1f} ({r.episodios} partidas)")
+    
+    return pontuacoes, melhor_score, pior_score, media_score
+
+
+def avaliar_com_cache(avaliar_func, cache):
+    """Envolve uma função avaliar_populacao_*: só os indivíduos que ainda não jogaram
+    com estas sementes são avaliados, e cada duplicado uma única vez"""
+    def avaliar(populacao, geracao, sementes=None):
+        if not sementes:
+            # Sem sementes fixas as partidas são aleatórias: nada a reaproveitar
+            return avaliar_func(populacao, geracao, sementes)
+        
+        def calcular(faltando):
+            return avaliar_func([individuo for individuo, _ in faltando], geracao, sementes)[0]
+        
+        antes = (cache.acertos, cache.duplicados, cache.avaliados)
+        pontuacoes = cache.avaliar([(individuo, sementes) for individuo in populacao], calcular)
+        acertos, duplicados, avaliados = (
+            agora - anterior for agora, anterior in zip((cache.acertos, cache.duplicados, cache.avaliados), antes))
+        
+        melhor_score = max(pontuacoes)
+        pior_score = min(pontuacoes)
+        media_score = np.mean(pontuacoes)
+        
+        print(f"♻️  Cache da Geração {geracao}: {acertos} reaproveitados, {duplicados} duplicados, "
+              f"{avaliados} avaliados")
+        print(f"   🏆 Melhor: {melhor_score}  📈 Média: {media_score:.2f}  📉 Pior: {pior_score}")
+        
+        return pontuacoes, melhor_score, pior_score, media_score
+    return avaliar
+
+
+def carregar_pesos(tamanho=POP_SIZE, historico=None):
+    """Monta uma população de `tamanho` indivíduos a partir do histórico de treinamento.
+
+    Usa os melhores das gerações mais recentes; se houver menos que
+    `tamanho`, completa com indivíduos aleatórios. Sem histórico, retorna None.
+    """
+    historico = historico or abrir_historico()
+    pesos = [np.array(entrada["pesos"]) for entrada in historico.ultimas(tamanho)]
+    if not pesos:
+        return None
+    populacao = pesos + [np.random.uniform(-5, 5, 4) for _ in range(tamanho - len(pesos))]
+    return populacao
 
 
 def carregar_historico_completo():
-    """Carrega histórico completo de gerações"""
-    if os.path.exists(SAVE_FILE):
-        with open(SAVE_FILE, "r") as f:
-            data = json.load(f)
-            if data and isinstance(data[0], dict):
-                return data
-    return None
+    """Carrega o melhor de cada geração (só o índice do histórico é lido)"""
+    return abrir_historico().melhores() or None
 
 
 def treinar_ia():
     """Função principal para treinar a IA"""
-    populacao = carregar_pesos()
-    if not populacao:
-        populacao = [np.random.uniform(-5, 5, 4) for _ in range(POP_SIZE)]
+    historico = abrir_historico()
+    
+    # Um checkpoint de uma execução interrompida tem prioridade sobre os pesos salvos
+    estado = carregar_checkpoint(CHECKPOINT_FILE) if CHECKPOINT_FILE else None
+    if estado:
+        populacao = estado["populacao"]
+        inicio = estado["geracao"]
+        print(f"\n♻️  Retomando do checkpoint {CHECKPOINT_FILE} na geração {inicio}")
+        for chave, (antes, agora) in diferencas_configuracao(estado["configuracao"]).items():
+            print(f"⚠️  {chave} mudou desde o checkpoint ({antes} -> {agora}): a execução não será idêntica")
+        # Resultado até aqui, caso não reste geração a treinar (checkpoint já na última
+        # geração ou N_GENERATIONS reduzido): o melhor da geração anterior, pelo histórico
+        melhor_score = estado["melhor_score"]
+        anterior = historico.intervalo(inicio - 1, inicio)
+        melhores = [np.array(anterior[-1]["pesos"])] if anterior else populacao[:1]
+    else:
+        populacao = carregar_pesos(historico=historico)
+        inicio = 0
+        if not populacao:
+            populacao = [np.random.uniform(-5, 5, 4) for _ in range(POP_SIZE)]
+        melhores, melhor_score = populacao[:1], None
 
     print(f"\n🚀 Iniciando treinamento por {N_GENERATIONS} gerações...")
     print(f"📋 População: {POP_SIZE} indivíduos")
@@ -212,6 +504,13 @@ def treinar_ia():
     print(f"⚡ Processos paralelos: {N_PROCESSES} cores")
     print(f"💻 CPUs detectadas: {cpu_count()}")
     
+    # Todos os indivíduos, de todas as gerações, jogam as mesmas partidas
+    if estado:
+        sementes = estado["sementes"]
+    else:
+        sementes = gerar_sementes(JOGOS_MAX_CORRIDA if AVALIACAO_CORRIDA else JOGOS_POR_INDIVIDUO)
+    print(f"🎲 Partidas por indivíduo: {len(sementes)} (sementes: {sementes})")
+    
     # Pergunta se quer usar paralelo ou sequencial
     try:
         usar_paralelo = input("\nUsar processamento paralelo? (s/N): ").strip().lower()
@@ -219,29 +518,59 @@ def treinar_ia():
     except:
         usar_paralelo = True  # Default para paralelo
     
-    if usar_paralelo and N_PROCESSES > 1:
-        print(f"✅ Usando processamento paralelo com {N_PROCESSES} processos")
-        avaliar_func = avaliar_populacao_paralela
+    # O pool de processos é criado uma vez e reaproveitado em todas as gerações
+    processos = processos_disponiveis() if usar_paralelo else 1
+    descricao = f"{processos} processo(s)"
+    em_lote_sem_pool = AVALIACAO_CORRIDA and AVALIACAO_EM_LOTE
+    if SERVIDOR_AVALIACAO and not em_lote_sem_pool:
+        # Avaliação distribuída: os trabalhadores de outras máquinas fazem o papel do pool
+        avaliador = ServidorAvaliacao(SERVIDOR_AVALIACAO)
+        host, porta = avaliador.endereco
+        print(f"🌐 Fila de avaliação em {host}:{porta}; em cada máquina, rode:")
+        if avaliador.chave_gerada:
+            print(f"   python fila_distribuida.py {host}:{porta} --chave {avaliador.chave.decode()}")
+        else:
+            print(f"   python fila_distribuida.py {host}:{porta}  (com a mesma CHAVE_SERVIDOR ou TETRIS_IA_CHAVE)")
+        # Os trabalhadores podem entrar e sair: cada geração usa os conectados no momento
+        descricao = "trabalhadores conectados à fila"
+    elif processos > 1 and not em_lote_sem_pool:
+        avaliador = AvaliadorParalelo(processos)
+    else:
+        avaliador = None
+    
+    # Pontuações já calculadas (cópias de pais, duplicados, elite) não são jogadas de novo
+    cache = CacheFitness()
+    
+    if AVALIACAO_CORRIDA:
+        print(f"🏁 Avaliando a população por corrida ({descricao})")
+        avaliar_func = partial(avaliar_populacao_corrida, processos=processos,
+                               em_lote=AVALIACAO_EM_LOTE, avaliador=avaliador, cache=cache)
+    elif AVALIACAO_EM_LOTE:
+        print(f"📦 Avaliando a população em lote ({descricao})")
+        avaliar_func = partial(avaliar_populacao_lote, processos=processos, avaliador=avaliador)
+    elif avaliador:
+        print(f"✅ Usando processamento paralelo ({descricao})")
+        avaliar_func = partial(avaliar_populacao_paralela, avaliador=avaliador)
     else:
         print("🐌 Usando processamento sequencial")
         avaliar_func = avaliar_populacao_sequencial
+    if not AVALIACAO_CORRIDA:
+        avaliar_func = avaliar_com_cache(avaliar_func, cache)
     
     # Barra de progresso para as gerações
-    with tqdm(total=N_GENERATIONS, desc="Evolução", unit="geração", 
+    with avaliador or nullcontext(), tqdm(total=N_GENERATIONS, initial=inicio, desc="Evolução", unit="geração", 
               bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]') as ger_pbar:
         
-        for ger in range(N_GENERATIONS):
+        for ger in range(inicio, N_GENERATIONS):
             # Avalia a população com estatísticas detalhadas
-            pontuacoes, melhor_score, pior_score, media_score = avaliar_func(populacao, ger)
-            
-            melhor_idx = np.argmax(pontuacoes)
-            melhor_individuo = populacao[melhor_idx]
+            pontuacoes, melhor_score, pior_score, media_score = avaliar_func(populacao, ger, sementes)
             
             melhores_idx = np.argsort(pontuacoes)[-POP_SIZE//2:]
             melhores = [populacao[i] for i in melhores_idx]
 
-            print(f"💾 Salvando melhor da Geração {ger} (Score: {melhor_score})")
-            salvar_melhor_geracao(melhor_individuo, melhor_score, ger)
+            print(f"💾 Salvando Geração {ger} no histórico (Melhor: {melhor_score})")
+            historico.registrar_geracao(ger, populacao, pontuacoes)
+            cache.salvar()
 
             # Atualiza barra de progresso das gerações
             ger_pbar.set_postfix({
@@ -253,13 +582,11 @@ def treinar_ia():
 
             # Cria nova geração
             print(f"🧬 Criando próxima geração...")
-            nova_pop = []
-            while len(nova_pop) < POP_SIZE:
-                pai, mae = random.sample(melhores, 2)
-                filho = crossover(pai, mae)
-                filho = mutacao(filho)
-                nova_pop.append(filho)
-            populacao = nova_pop
+            populacao = proxima_geracao(populacao, pontuacoes)
+            
+            # Checkpoint: nova população e geradores aleatórios, para retomar exatamente daqui
+            if CHECKPOINT_FILE and (ger + 1) % CHECKPOINT_INTERVALO == 0:
+                salvar_checkpoint(CHECKPOINT_FILE, ger + 1, populacao, pontuacoes, sementes, melhor_score)
 
     melhor = melhores[-1]
     
@@ -268,6 +595,12 @@ def treinar_ia():
     print(f"🏆 Melhor score final: {melhor_score}")
     print(f"🧬 Gerações treinadas: {N_GENERATIONS}")
     print(f"📊 Total de indivíduos avaliados: {N_GENERATIONS * POP_SIZE}")
+    print(f"♻️  Cache de fitness: {cache.resumo()}")
+
+    # Execução completa (resumo já mostrado): o próximo treinamento começa do zero
+    if CHECKPOINT_FILE and os.path.exists(CHECKPOINT_FILE):
+        os.remove(CHECKPOINT_FILE)
+
     print(f"🎮 Iniciando replay do melhor indivíduo...")
     
     return melhor
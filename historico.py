@@ -0,0 +1,237 @@
+import json
+import os
+import sys
+
+from config import HISTORICO_FILE, SAVE_FILE
+
+
+class HistoricoTreino:
+    """Histórico de treinamento só de acréscimo (append-only), em JSON Lines.
+
+    Cada geração grava uma linha por indivíduo avaliado no arquivo de dados
+    e, depois, uma linha no índice (`<arquivo>.idx`) com a posição dessas
+    linhas no arquivo e o resumo da geração (melhor, pior, soma, pesos do
+    melhor). Consultas por geração e estatísticas leem só o índice; os
+    indivíduos são lidos direto da posição indicada, sem carregar o resto.
+
+    Uma geração interrompida no meio da gravação (sem linha no índice) é
+    descartada ao abrir o histórico. Com `somente_leitura` nenhum arquivo é
+    criado ou alterado: o que ficou pela metade é só ignorado.
+    """
+
+    def __init__(self, caminho=HISTORICO_FILE, somente_leitura=False):
+        self.caminho = caminho
+        self.caminho_indice = caminho + ".idx"
+        self.somente_leitura = somente_leitura
+        self.indice = []
+        self._abrir()
+
+    # ---------- Gravação ----------
+    def registrar_geracao(self, geracao, populacao, pontuacoes):
+        """Acrescenta todos os indivíduos de uma geração e retorna a entrada do índice"""
+        if self.somente_leitura:
+            raise ValueError(f"Histórico {self.caminho} aberto só para leitura")
+        registros = _registros(geracao, populacao, pontuacoes)
+        linhas = "".join(json.dumps(registro) + "\n" for registro in registros).encode()
+
+        with open(self.caminho, "ab") as f:
+            inicio = f.tell()
+            f.write(linhas)
+            f.flush()
+            os.fsync(f.fileno())
+            fim = f.tell()
+
+        entrada = _resumo(registros, inicio, fim)
+        self._gravar_indice(entrada)
+        return entrada
+
+    def _gravar_indice(self, entrada):
+        with open(self.caminho_indice, "a") as f:
+            f.write(json.dumps(entrada) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.indice.append(entrada)
+
+    # ---------- Abertura e recuperação ----------
+    def _abrir(self):
+        """Carrega o índice e descarta o que ficou pela metade numa interrupção"""
+        tamanho_dados = os.path.getsize(self.caminho) if os.path.exists(self.caminho) else 0
+        if not os.path.exists(self.caminho_indice):
+            if tamanho_dados and self.somente_leitura:
+                self.indice = self._entradas_dos_dados()[0]
+            elif tamanho_dados:
+                self.reconstruir_indice()
+            return
+
+        validos = 0
+        with open(self.caminho_indice, "rb") as f:
+            for linha in f:
+                try:
+                    entrada = json.loads(linha)
+                except ValueError:
+                    break  # última linha gravada pela metade
+                if not linha.endswith(b"\n") or entrada["fim"] > tamanho_dados:
+                    break
+                self.indice.append(entrada)
+                validos += len(linha)
+        if self.somente_leitura:
+            return
+        if validos < os.path.getsize(self.caminho_indice):
+            os.truncate(self.caminho_indice, validos)
+
+        # Geração gravada nos dados mas não no índice: incompleta
+        fim = self.indice[-1]["fim"] if self.indice else 0
+        if tamanho_dados > fim:
+            os.truncate(self.caminho, fim)
+
+    def reconstruir_indice(self):
+        """Refaz o índice lendo o arquivo de dados (linhas consecutivas da mesma geração)"""
+        entradas, fim = self._entradas_dos_dados()
+        self.indice = []
+        if os.path.exists(self.caminho_indice):
+            os.remove(self.caminho_indice)
+        for entrada in entradas:
+            self._gravar_indice(entrada)
+        os.truncate(self.caminho, fim)
+
+    def _entradas_dos_dados(self):
+        """Entradas do índice montadas a partir do arquivo de dados e a posição onde os dados válidos terminam"""
+        entradas = []
+        grupo = []
+        inicio = posicao = 0
+        with open(self.caminho, "rb") as f:
+            for linha in f:
+                try:
+                    registro = json.loads(linha)
+                except ValueError:
+                    break
+                if not linha.endswith(b"\n"):
+                    break
+                if grupo and (registro["geracao"] != grupo[0]["geracao"] or registro["indice"] == 0):
+                    entradas.append(_resumo(grupo, inicio, posicao))
+                    grupo, inicio = [], posicao
+                grupo.append(registro)
+                posicao += len(linha)
+        if grupo:
+            entradas.append(_resumo(grupo, inicio, posicao))
+        return entradas, posicao
+
+    def migrar_json(self, caminho_json):
+        """Importa um arquivo no formato antigo (melhores_pesos.json): o melhor de cada geração.
+
+        No formato mais antigo (lista de pesos, sem geração nem score), a
+        geração é a posição na lista e o score fica 0. Retorna quantas gerações foram importadas.
+        """
+        geracoes = _geracoes_json(caminho_json)
+        for geracao, populacao, pontuacoes in geracoes:
+            self.registrar_geracao(geracao, populacao, pontuacoes)
+        return len(geracoes)
+
+    def ler_json(self, caminho_json):
+        """Como migrar_json, mas só em memória (nada é gravado): servem as consultas pelo índice"""
+        geracoes = _geracoes_json(caminho_json)
+        self.indice = [_resumo(_registros(*geracao), 0, 0) for geracao in geracoes]
+        return len(geracoes)
+
+    # ---------- Consultas ----------
+    def __len__(self):
+        return len(self.indice)
+
+    def ultimas(self, n=10):
+        """Entradas do índice das últimas `n` gerações gravadas"""
+        return self.indice[-n:] if n > 0 else []
+
+    def intervalo(self, inicio, fim=None):
+        """Entradas do índice das gerações com inicio <= geracao < fim, na ordem gravada"""
+        return [e for e in self.indice if e["geracao"] >= inicio and (fim is None or e["geracao"] < fim)]
+
+    def individuos(self, entrada):
+        """Lê os indivíduos de uma geração (entrada do índice) direto da posição no arquivo"""
+        with open(self.caminho, "rb") as f:
+            f.seek(entrada["inicio"])
+            dados = f.read(entrada["fim"] - entrada["inicio"])
+        return [json.loads(linha) for linha in dados.splitlines()]
+
+    def percorrer(self, inicio=0, fim=None):
+        """Percorre, um a um, os indivíduos das gerações do intervalo, sem carregar o arquivo inteiro"""
+        for entrada in self.intervalo(inicio, fim):
+            yield from self.individuos(entrada)
+
+    def estatisticas(self, entradas=None):
+        """Estatísticas agregadas, acumuladas entrada a entrada do índice"""
+        entradas = self.indice if entradas is None else entradas
+        geracoes = individuos = 0
+        soma = 0
+        melhor = pior = None
+        for entrada in entradas:
+            geracoes += 1
+            individuos += entrada["n"]
+            soma += entrada["soma"]
+            melhor = entrada["melhor"] if melhor is None else max(melhor, entrada["melhor"])
+            pior = entrada["pior"] if pior is None else min(pior, entrada["pior"])
+        return {
+            "geracoes": geracoes,
+            "individuos": individuos,
+            "melhor": melhor,
+            "pior": pior,
+            "media": soma / individuos if individuos else None,
+        }
+
+    def melhores(self, entradas=None):
+        """Melhor de cada geração no formato antigo: {"geracao", "pesos", "score"} (score int ou float, como gravado)"""
+        entradas = self.indice if entradas is None else entradas
+        return [{"geracao": e["geracao"], "pesos": e["pesos"], "score": e["melhor"]} for e in entradas]
+
+
+def abrir_historico(caminho=HISTORICO_FILE, caminho_antigo=SAVE_FILE, somente_leitura=False):
+    """Abre o histórico; se estiver vazio, importa o arquivo antigo (melhores_pesos.json).
+
+    Com `somente_leitura` (só consultas) nenhum arquivo é criado: o arquivo
+    antigo é lido em memória, sem migrar.
+    """
+    historico = HistoricoTreino(caminho, somente_leitura)
+    if not len(historico) and caminho_antigo and os.path.exists(caminho_antigo):
+        if somente_leitura:
+            historico.ler_json(caminho_antigo)
+        else:
+            n = historico.migrar_json(caminho_antigo)
+            print(f"📦 {n} gerações importadas de {caminho_antigo} para {caminho}", file=sys.stderr)
+    return historico
+
+
+def _geracoes_json(caminho_json):
+    """(geração, população, pontuações) de cada item do formato antigo"""
+    with open(caminho_json, "r") as f:
+        data = json.load(f)
+    return [(item["geracao"], [item["pesos"]], [item["score"]]) if isinstance(item, dict) else (i, [item], [0])
+            for i, item in enumerate(data)]
+
+
+def _registros(geracao, populacao, pontuacoes):
+    """Linhas do arquivo de dados de uma geração (uma por indivíduo)"""
+    return [
+        {"geracao": geracao, "indice": i, "pesos": [float(w) for w in individuo], "score": _numero(score)}
+        for i, (individuo, score) in enumerate(zip(populacao, pontuacoes))
+    ]
+
+
+def _numero(valor):
+    """Converte para int ou float do Python (aceita tipos do NumPy)"""
+    valor = getattr(valor, "item", lambda: valor)()
+    return int(valor) if float(valor).is_integer() else float(valor)
+
+
+def _resumo(registros, inicio, fim):
+    """Entrada do índice de uma geração a partir dos seus registros"""
+    pontuacoes = [r["score"] for r in registros]
+    melhor = max(range(len(registros)), key=lambda i: pontuacoes[i])
+    return {
+        "geracao": registros[0]["geracao"],
+        "inicio": inicio,
+        "fim": fim,
+        "n": len(registros),
+        "soma": _numero(sum(pontuacoes)),
+        "melhor": pontuacoes[melhor],
+        "pior": min(pontuacoes),
+        "pesos": registros[melhor]["pesos"],
+    }
@@ -0,0 +1,140 @@
+import json
+import time
+from collections import Counter
+
+from config import INSTRUMENTACAO, INSTRUMENTACAO_ARQUIVO
+import transposicao
+
+# Contadores e tempos (segundos) acumulados neste processo:
+#   partidas, pecas, linhas        - partidas jogadas, peças colocadas, linhas removidas
+#   jogadas_avaliadas              - jogadas pontuadas pela busca
+#   colisoes                       - chamadas de colide / colide_orientacao
+#   tempo_partida                  - tempo total das partidas
+#   tempo_busca                    - tempo dentro da busca (escolher_jogada)
+#   tempo_simulacao                - parte da busca simulando jogadas (simula_jogada / avaliar_jogadas)
+#   tempo_caracteristicas          - parte da busca gasta extraindo características
+#   transposicao_acertos, _faltas  - consultas ao cache de transposição (transposicao.py)
+_contadores = Counter()
+_transposicao_inicial = (0, 0)
+
+# Desativada, a instrumentação custa uma verificação por partida: os
+# contadores ficam em wrappers instalados só nos jogos instrumentados.
+ATIVA = INSTRUMENTACAO
+
+
+def ativar(ativa=True):
+    global ATIVA
+    ATIVA = ativa
+
+
+def zerar():
+    global _transposicao_inicial
+    _contadores.clear()
+    _transposicao_inicial = (transposicao.CACHE.acertos, transposicao.CACHE.faltas)
+
+
+def coletar():
+    """Contadores acumulados neste processo desde o último zerar()"""
+    contadores = dict(_contadores)
+    acertos = transposicao.CACHE.acertos - _transposicao_inicial[0]
+    faltas = transposicao.CACHE.faltas - _transposicao_inicial[1]
+    if acertos > 0 or faltas > 0:
+        contadores["transposicao_acertos"] = acertos
+        contadores["transposicao_faltas"] = faltas
+    return contadores
+
+
+def somar(total, contadores):
+    """Acumula `contadores` em `total` (dicts)"""
+    for nome, valor in contadores.items():
+        total[nome] = total.get(nome, 0) + valor
+    return total
+
+
+def _cronometrado(funcao, nome_tempo, nome_contador=None, contar=None):
+    """Envolve `funcao` somando seu tempo em `nome_tempo` e, com `contar`, o que ele retorna do resultado"""
+    def medida(*args, **kwargs):
+        inicio = time.perf_counter()
+        resultado = funcao(*args, **kwargs)
+        _contadores[nome_tempo] += time.perf_counter() - inicio
+        if nome_contador:
+            _contadores[nome_contador] += contar(resultado)
+        return resultado
+    return medida
+
+
+def _contado(funcao, nome, profundidade):
+    """Envolve `funcao` contando as chamadas; chamadas internas (um colide que chama
+    outro) compartilham `profundidade` e contam uma vez só"""
+    def contada(*args, **kwargs):
+        if not profundidade[0]:
+            _contadores[nome] += 1
+        profundidade[0] += 1
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            profundidade[0] -= 1
+    return contada
+
+
+def instrumentar(jogo):
+    """Instala os contadores nos métodos de um jogo (só nesta instância)"""
+    profundidade = [0]
+    jogo.colide = _contado(jogo.colide, "colisoes", profundidade)
+    jogo.colide_orientacao = _contado(jogo.colide_orientacao, "colisoes", profundidade)
+    # Busca simples: uma chamada por jogada; busca em lote: uma por peça
+    jogo.simula_jogada = _cronometrado(jogo.simula_jogada, "tempo_simulacao", "jogadas_avaliadas", lambda _: 1)
+    jogo.heuristica = _cronometrado(jogo.heuristica, "tempo_caracteristicas")
+    jogo.avaliar_jogadas = _cronometrado(jogo.avaliar_jogadas, "tempo_simulacao", "jogadas_avaliadas",
+                                         lambda resultado: len(resultado[1]))
+    jogo.heuristica_lote = _cronometrado(jogo.heuristica_lote, "tempo_caracteristicas")
+    return jogo
+
+
+def cronometrar_busca(escolher_jogada):
+    """Busca que soma seu tempo em tempo_busca"""
+    return _cronometrado(escolher_jogada, "tempo_busca")
+
+
+def fim_de_partida(jogo, duracao):
+    """Soma os totais de uma partida terminada"""
+    _contadores["partidas"] += 1
+    _contadores["pecas"] += jogo.pecas_colocadas
+    _contadores["linhas"] += jogo.linhas_removidas
+    _contadores["tempo_partida"] += duracao
+
+
+def resumo(contadores):
+    """Valores derivados para exibição: médias por partida e divisão do tempo"""
+    partidas = contadores.get("partidas", 0) or 1
+    tempo_partida = contadores.get("tempo_partida", 0) or 1e-9
+    tempo_busca = contadores.get("tempo_busca", 0)
+    return {
+        "pecas_por_partida": contadores.get("pecas", 0) / partidas,
+        "jogadas_por_peca": contadores.get("jogadas_avaliadas", 0) / (contadores.get("pecas", 0) or 1),
+        "colisoes_por_peca": contadores.get("colisoes", 0) / (contadores.get("pecas", 0) or 1),
+        "fracao_busca": tempo_busca / tempo_partida,
+        "fracao_caracteristicas": contadores.get("tempo_caracteristicas", 0) / tempo_partida,
+        "taxa_transposicao": contadores.get("transposicao_acertos", 0) / (
+            contadores.get("transposicao_acertos", 0) + contadores.get("transposicao_faltas", 0) or 1),
+    }
+
+
+def postfix(contadores):
+    """Resumo curto para a barra de progresso (tqdm)"""
+    derivados = resumo(contadores)
+    return {
+        "Peças/partida": f"{derivados['pecas_por_partida']:.0f}",
+        "Busca": f"{derivados['fracao_busca']:.0%}",
+        "Caract.": f"{derivados['fracao_caracteristicas']:.0%}",
+        "Transp.": f"{derivados['taxa_transposicao']:.0%}",
+    }
+
+
+def registrar(geracao, contadores, caminho=INSTRUMENTACAO_ARQUIVO):
+    """Acrescenta o registro da geração (contadores e derivados) ao arquivo JSON Lines"""
+    registro = {"geracao": geracao, "contadores": contadores, "resumo": resumo(contadores)}
+    if caminho:
+        with open(caminho, "a") as f:
+            f.write(json.dumps(registro) + "\n")
+    return registro
@@ -0,0 +1,95 @@
+import numpy as np
+
+from config import LARGURA, ALTURA, MAX_PECAS
+from pecas import chave_peca, criar_gerador, DISTINTAS
+from tetris import PONTOS_LINHA, arrays_orientacao
+from caracteristicas import extrair_caracteristicas_lote
+from agente import vetor_pesos
+
+
+def jogar_em_lote(populacao, semente=None, max_pecas=MAX_PECAS):
+    """Joga uma partida para cada indivíduo, todas em passo único.
+
+    Os tabuleiros ficam em um único array (P x ALTURA x LARGURA) e todas as
+    partidas recebem a mesma sequência de peças, a mesma que Tetris(semente) recebe. A cada peça, as
+    características de todas as jogadas de todas as partidas são extraídas
+    em um só lote e pontuadas com a matriz de pesos (P x 4). Cada peça cai
+    direto na posição escolhida; partidas encerradas ficam mascaradas.
+
+    Retorna (pontos, linhas_removidas, pecas_colocadas), arrays de tamanho P.
+    """
+    vetores = np.array([vetor_pesos(individuo) for individuo in populacao])
+    n_jogos = len(vetores)
+    gerador = criar_gerador(semente)
+
+    tabs = np.zeros((n_jogos, ALTURA, LARGURA), dtype=bool)
+    alturas = np.zeros((n_jogos, LARGURA), dtype=int)
+    pontos = np.zeros(n_jogos, dtype=int)
+    linhas_removidas = np.zeros(n_jogos, dtype=int)
+    pecas = np.zeros(n_jogos, dtype=int)
+    ativo = np.ones(n_jogos, dtype=bool)
+
+    for _ in range(max_pecas):
+        peca = gerador.proxima()
+        orientacoes = DISTINTAS[chave_peca(peca)]
+
+        # Game over: a peça não cabe na posição inicial
+        x_inicial = LARGURA // 2 - orientacoes[0].largura // 2
+        dy_inicial, dx_inicial = np.array(orientacoes[0].celulas).T
+        ativo &= ~tabs[:, dy_inicial, x_inicial + dx_inicial].any(axis=1)
+        ativos = np.flatnonzero(ativo)
+        if len(ativos) == 0:
+            break
+
+        tab_ativos = tabs[ativos]
+        alt_ativos = alturas[ativos]
+
+        # Linha de queda e cabimento de todas as jogadas em todas as partidas
+        quedas, cabem, linhas_celulas, colunas_celulas = [], [], [], []
+        for orientacao in orientacoes:
+            _, base, janelas, dy, colunas = arrays_orientacao(orientacao)
+            quedas.append((ALTURA - 1 - base - alt_ativos[:, janelas]).min(axis=2))
+            cabem.append(~tab_ativos[:, dy, colunas].any(axis=2))
+            linhas_celulas.append(np.broadcast_to(dy, colunas.shape))
+            colunas_celulas.append(colunas)
+
+        queda = np.maximum(np.concatenate(quedas, axis=1), 0)        # (Pa x C)
+        cabe = np.concatenate(cabem, axis=1)                         # (Pa x C)
+        dy = np.concatenate(linhas_celulas)                          # (C x 4)
+        colunas = np.concatenate(colunas_celulas)                    # (C x 4)
+        n_ativos, n_jogadas = queda.shape
+
+        # Tabuleiro resultante de cada jogada de cada partida
+        candidatos = np.repeat(tab_ativos[:, None], n_jogadas, axis=1)
+        candidatos[np.arange(n_ativos)[:, None, None], np.arange(n_jogadas)[None, :, None],
+                   queda[:, :, None] + dy, colunas] = True
+
+        caracteristicas = extrair_caracteristicas_lote(
+            candidatos.reshape(-1, ALTURA, LARGURA)).reshape(n_ativos, n_jogadas, -1)
+        scores = np.einsum("pjc,pc->pj", caracteristicas, vetores[ativos])
+        scores[~cabe] = -np.inf
+
+        # Mesmo critério da busca individual: sem jogada boa, a peça cai como está
+        # (a orientação sem rotação vem primeiro, então o índice é o próprio x inicial)
+        escolha = np.argmax(scores, axis=1)
+        sem_jogada = scores[np.arange(n_ativos), escolha] <= -99999
+        escolha[sem_jogada] = x_inicial
+        novos = candidatos[np.arange(n_ativos), escolha]
+
+        # Remove linhas completas: ordena as cheias para o topo e as esvazia
+        cheias = novos.all(axis=2)
+        n_cheias = cheias.sum(axis=1)
+        if n_cheias.any():
+            ordem = np.argsort(~cheias, axis=1, kind="stable")
+            novos = np.take_along_axis(novos, ordem[:, :, None], axis=1)
+            novos[np.arange(ALTURA)[None, :] < n_cheias[:, None]] = False
+
+        nivel = linhas_removidas[ativos] // 10 + 1
+        pontos[ativos] += np.array(PONTOS_LINHA)[np.minimum(n_cheias, 4)] * nivel
+        linhas_removidas[ativos] += n_cheias
+        pecas[ativos] += 1
+
+        tabs[ativos] = novos
+        alturas[ativos] = np.where(novos.any(axis=1), ALTURA - np.argmax(novos, axis=1), 0)
+
+    return pontos, linhas_removidas, pecas
@@ -14,6 +14,7 @@ Este programa permite:
 import sys
 import os
 from genetic_algorithm import treinar_ia, carregar_historico_completo
+from historico import abrir_historico
 from visual import VisualizadorTetris
 
 
@@ -71,6 +72,7 @@ def ver_ia_jogar():
         if pesos:
             print(f"\nIniciando replay da IA...")
             print("Pressione ESC para voltar ao menu durante o jogo.")
+            print("F: avanço rápido | T: turbo | P: pausar")
             visualizador.replay_ia(pesos)
         else:
             print("Nenhum peso válido selecionado!")
@@ -101,34 +103,32 @@ def mostrar_estatisticas():
     """Mostra estatísticas do treinamento"""
     print("\nCarregando estatísticas...")
     
-    historico = carregar_historico_completo()
-    if not historico:
+    historico = abrir_historico()
+    if not len(historico):
         print("Nenhuma estatística encontrada!")
         print("Treine uma IA primeiro usando a opção 1.")
         return
     
+    # Só o índice é lido: resumo de cada geração, sem carregar os indivíduos
+    estatisticas = historico.estatisticas()
+    
     print(f"\nESTATÍSTICAS DE TREINAMENTO")
     print("="*50)
-    print(f"Total de gerações: {len(historico)}")
+    print(f"Total de gerações: {estatisticas['geracoes']}")
+    print(f"Indivíduos avaliados: {estatisticas['individuos']}")
+    print(f"Melhor score: {estatisticas['melhor']}")
+    print(f"Pior score: {estatisticas['pior']}")
+    print(f"Score médio: {estatisticas['media']:.2f}")
     
-    if historico:
-        melhor_score = max(item['score'] for item in historico)
-        pior_score = min(item['score'] for item in historico)
-        media_score = sum(item['score'] for item in historico) / len(historico)
-        
-        print(f"Melhor score: {melhor_score}")
-        print(f"Pior score: {pior_score}")
-        print(f"Score médio: {media_score:.2f}")
-        
-        print(f"\nHISTÓRICO DAS GERAÇÕES:")
-        print("-" * 50)
-        for item in historico[-10:]:  # Mostra últimas 10 gerações
-            print(f"Geração {item['geracao']:3d}: Score {item['score']:4d} | "
-                  f"Pesos: [{item['pesos'][0]:6.2f}, {item['pesos'][1]:6.2f}, "
-                  f"{item['pesos'][2]:6.2f}, {item['pesos'][3]:6.2f}]")
-        
-        if len(historico) > 10:
-            print(f"... e mais {len(historico) - 10} gerações anteriores")
+    print(f"\nHISTÓRICO DAS GERAÇÕES:")
+    print("-" * 50)
+    for item in historico.melhores(historico.ultimas(10)):  # Mostra últimas 10 gerações
+        print(f"Geração {item['geracao']:3d}: Score {item['score']:6} | "
+              f"Pesos: [{item['pesos'][0]:6.2f}, {item['pesos'][1]:6.2f}, "
+              f"{item['pesos'][2]:6.2f}, {item['pesos'][3]:6.2f}]")
+    
+    if len(historico) > 10:
+        print(f"... e mais {len(historico) - 10} gerações anteriores")
 
 
 def main():
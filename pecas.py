@@ -0,0 +1,120 @@
+import random
+from collections import namedtuple
+from config import PECAS, GERADOR_PECAS
+
+# Uma orientação (rotação) de uma peça, com os dados usados na busca de jogadas:
+#   peca      - formato como lista de listas (pode ser usado como peca_atual)
+#   chave     - formato como tupla de tuplas (usado como chave das tabelas)
+#   rotacoes  - quantas rotações horárias a partir da peça de origem
+#   largura, altura - tamanho da caixa da peça
+#   base      - por coluna, linha da célula mais baixa da peça
+#   topo      - por coluna, linha da célula mais alta da peça
+#   mascaras  - por linha, máscara de bits das colunas ocupadas (coluna 0 = bit 0)
+#   celulas   - (linha, coluna) de cada célula ocupada
+Orientacao = namedtuple(
+    "Orientacao",
+    ["peca", "chave", "rotacoes", "largura", "altura", "base", "topo", "mascaras", "celulas"]
+)
+
+
+def chave_peca(peca):
+    """Converte uma peça (lista de listas) em uma chave imutável"""
+    return tuple(tuple(linha) for linha in peca)
+
+
+def rotaciona(chave):
+    """Rotaciona a chave de uma peça no sentido horário"""
+    return tuple(zip(*chave[::-1]))
+
+
+def _cria_orientacao(chave, rotacoes):
+    """Calcula os dados de uma orientação a partir do formato"""
+    largura, altura = len(chave[0]), len(chave)
+    colunas = [[i for i in range(altura) if chave[i][j]] for j in range(largura)]
+    return Orientacao(
+        peca=[list(linha) for linha in chave],
+        chave=chave,
+        rotacoes=rotacoes,
+        largura=largura,
+        altura=altura,
+        base=tuple(max(c) for c in colunas),
+        topo=tuple(min(c) for c in colunas),
+        mascaras=tuple(sum(1 << j for j, val in enumerate(linha) if val) for linha in chave),
+        celulas=tuple((i, j) for i in range(altura) for j in range(largura) if chave[i][j]),
+    )
+
+
+def _orientacoes_da_chave(chave):
+    """Retorna as 4 orientações a partir de `chave` e a lista das distintas"""
+    por_rotacao = []
+    vistas = {}
+    atual = chave
+    for r in range(4):
+        if atual not in vistas:
+            vistas[atual] = _cria_orientacao(atual, r)
+        por_rotacao.append(vistas[atual])
+        atual = rotaciona(atual)
+    return tuple(por_rotacao), tuple(vistas.values())
+
+
+def _monta_tabelas():
+    """Monta as tabelas de orientações para todas as rotações de todas as peças"""
+    orientacoes = {}
+    distintas = {}
+    for peca in PECAS:
+        chave = chave_peca(peca)
+        for _ in range(4):
+            orientacoes[chave], distintas[chave] = _orientacoes_da_chave(chave)
+            chave = rotaciona(chave)
+    return orientacoes, distintas
+
+
+# ORIENTACOES[chave][r]: orientação obtida com r rotações a partir de `chave`
+# DISTINTAS[chave]: só as orientações diferentes (O tem 1; I, S e Z têm 2)
+ORIENTACOES, DISTINTAS = _monta_tabelas()
+
+
+def orientacoes_de(chave):
+    """Retorna (todas, distintas) para a chave; peças fora de config.PECAS são calculadas na hora"""
+    if chave in ORIENTACOES:
+        return ORIENTACOES[chave], DISTINTAS[chave]
+    return _orientacoes_da_chave(chave)
+
+
+# ---------- Geradores de peças ----------
+class GeradorUniforme:
+    """Sorteia cada peça de forma independente, com gerador aleatório próprio"""
+
+    def __init__(self, semente=None):
+        self.rng = random.Random(semente)
+
+    def proxima(self):
+        return self.rng.choice(PECAS)
+
+
+class GeradorSaco:
+    """Sistema "7-bag": embaralha as 7 peças e entrega todas antes de embaralhar de novo"""
+
+    def __init__(self, semente=None):
+        self.rng = random.Random(semente)
+        self.saco = []
+
+    def proxima(self):
+        if not self.saco:
+            self.saco = list(PECAS)
+            self.rng.shuffle(self.saco)
+        return self.saco.pop()
+
+
+GERADORES = {
+    "uniforme": GeradorUniforme,
+    "saco": GeradorSaco,
+}
+
+
+def criar_gerador(semente=None, tipo=None):
+    """Cria um gerador de peças (padrão: config.GERADOR_PECAS); sem semente, a sequência é aleatória"""
+    tipo = tipo or GERADOR_PECAS
+    if tipo not in GERADORES:
+        raise ValueError(f"Gerador de peças desconhecido: {tipo}")
+    return GERADORES[tipo](semente)
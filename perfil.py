@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Perfil (cProfile) de uma geração de treinamento somado entre os processos.
+
+Cada worker roda suas avaliações dentro de um cProfile e devolve as
+estatísticas junto com o resultado; o processo principal soma tudo em um
+único pstats. Com PERFIL_GERACAO definido em config.py, o treinamento
+grava o perfil dessa geração em PERFIL_ARQUIVO e mostra as funções mais caras.
+
+Para reler um perfil gravado:
+    python perfil.py perfil_geracao_3.prof --top 40 --ordem cumulative
+"""
+
+import argparse
+import cProfile
+import io
+import pstats
+import sys
+
+from config import PERFIL_ARQUIVO, PERFIL_TOP
+
+
+def perfilar(funcao, *args, **kwargs):
+    """Executa `funcao` sob o cProfile; retorna (resultado, estatísticas).
+
+    As estatísticas são o dict bruto do cProfile, que pode voltar do worker
+    por pickle (pstats.Stats não pode).
+    """
+    perfil = cProfile.Profile()
+    resultado = perfil.runcall(funcao, *args, **kwargs)
+    perfil.create_stats()
+    return resultado, perfil.stats
+
+
+class _EstatisticasRecebidas:
+    """Estatísticas de outro processo no formato que pstats.Stats aceita"""
+
+    def __init__(self, estatisticas):
+        self.stats = estatisticas
+
+    def create_stats(self):
+        pass
+
+
+class PerfilAgregado:
+    """Soma as estatísticas do cProfile devolvidas pelos workers"""
+
+    def __init__(self):
+        self.stats = None
+        self.avaliacoes = 0
+
+    def adicionar(self, estatisticas):
+        recebidas = _EstatisticasRecebidas(estatisticas)
+        if self.stats is None:
+            self.stats = pstats.Stats(recebidas)
+        else:
+            self.stats.add(recebidas)
+        self.avaliacoes += 1
+
+    def salvar(self, caminho):
+        self.stats.dump_stats(caminho)
+
+    def resumo(self, top=PERFIL_TOP, ordem="tottime"):
+        """Tabela das `top` funções mais caras (texto do pstats)"""
+        saida = io.StringIO()
+        self.stats.stream = saida
+        self.stats.sort_stats(ordem).print_stats(top)
+        self.stats.stream = sys.stdout
+        return saida.getvalue()
+
+
+def relatar(agregado, geracao, caminho=PERFIL_ARQUIVO, top=PERFIL_TOP):
+    """Grava o perfil da geração (pstats) e mostra o resumo"""
+    if agregado.stats is None:
+        return None
+    caminho = caminho.format(geracao=geracao)
+    agregado.salvar(caminho)
+    print(f"\n🔍 Perfil da Geração {geracao}: {agregado.avaliacoes} avaliações somadas, gravado em {caminho}")
+    print(agregado.resumo(top))
+    return caminho
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mostra as funções mais caras de um perfil gravado")
+    parser.add_argument("arquivo", help="arquivo pstats (.prof)")
+    parser.add_argument("--top", type=int, default=PERFIL_TOP, help=f"funções mostradas (padrão: {PERFIL_TOP})")
+    parser.add_argument("--ordem", default="tottime", help="ordenação do pstats (tottime, cumulative, ncalls...)")
+    args = parser.parse_args(argv)
+
+    pstats.Stats(args.arquivo).sort_stats(args.ordem).print_stats(args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rastros de partidas: formato binário compacto para guardar e rever partidas
+sem refazer a busca.
+
+Cada arquivo de rastros tem dois arquivos:
+    <nome>.trace  - jogadas de todas as partidas, 2 bytes por peça fixada
+    <nome>.idx    - uma entrada de tamanho fixo por partida (posição no
+                    .trace, número de peças, semente, pontos, linhas, pesos)
+
+Cada jogada guarda (peça, rotação, x, y) da peça no momento em que foi
+fixada; com a semente da partida, refazer as jogadas reconstrói qualquer
+estado do jogo. A leitura usa mmap, então abrir um arquivo com milhões de
+partidas não carrega nada na memória.
+
+Com RASTROS_DIR definido em config.py, cada partida jogada pelo fitness é
+gravada (um arquivo por processo). Para ver as partidas gravadas:
+    python rastros.py rastros/partidas-1234 --melhores 10
+    python rastros.py rastros/partidas-1234 --ver 42 --peca 100
+"""
+
+import argparse
+import mmap
+import os
+import sys
+from array import array
+import numpy as np
+
+from config import LARGURA, ALTURA, PECAS, RASTROS_DIR
+from pecas import chave_peca, orientacoes_de
+
+MAGICO_JOGADAS = b"TTRJ\x01\x00\x00\x00"
+MAGICO_INDICE = b"TTRI\x01\x00\x00\x00"
+
+# Entrada do índice (little-endian, sem alinhamento: 64 bytes)
+DTYPE_INDICE = np.dtype([
+    ("inicio", "<u8"),   # posição da primeira jogada no .trace (bytes)
+    ("n", "<u4"),        # peças fixadas
+    ("semente", "<i8"),  # semente da partida (-1: sem semente)
+    ("pontos", "<i8"),
+    ("linhas", "<u4"),
+    ("pesos", "<f8", 4),
+])
+
+# Jogada empacotada em 16 bits: peça (3) | rotação (2) | y (5) | x (4)
+if LARGURA > 16 or ALTURA > 32 or len(PECAS) > 8:
+    raise ImportError("rastros.py empacota x em 4 bits, y em 5 e a peça em 3: tabuleiro ou peças grandes demais")
+
+# Orientação -> (peça em config.PECAS, rotações a partir do formato de origem)
+_TIPO_ROTACAO = {}
+for _tipo, _peca in enumerate(PECAS):
+    for _rotacoes, _orientacao in enumerate(orientacoes_de(chave_peca(_peca))[0]):
+        _TIPO_ROTACAO.setdefault(_orientacao.chave, (_tipo, _rotacoes))
+
+
+def empacotar(peca, x, y):
+    """Jogada (peça na orientação em que foi fixada, x, y) em 16 bits"""
+    tipo, rotacoes = _TIPO_ROTACAO[chave_peca(peca)]
+    if not (0 <= x < LARGURA and 0 <= y < ALTURA):
+        raise ValueError(f"Posição fora do tabuleiro: x={x}, y={y}")
+    return tipo << 11 | rotacoes << 9 | y << 4 | x
+
+
+def desempacotar(jogadas):
+    """Colunas (peça, rotação, x, y) de um array de jogadas empacotadas"""
+    jogadas = np.asarray(jogadas, dtype=np.uint16)
+    return jogadas >> 11, (jogadas >> 9) & 3, jogadas & 15, (jogadas >> 4) & 31
+
+
+def anotar_jogadas(jogo):
+    """Passa a anotar cada peça fixada em `jogo`; retorna o array das jogadas empacotadas"""
+    jogadas = array("H")
+    fixa_peca = jogo.fixa_peca
+
+    def fixa_e_anota():
+        jogadas.append(empacotar(jogo.peca_atual, jogo.x, jogo.y))
+        fixa_peca()
+
+    jogo.fixa_peca = fixa_e_anota
+    return jogadas
+
+
+def refazer_jogada(jogo, jogada):
+    """Fixa em `jogo` a peça de uma jogada empacotada, na posição gravada"""
+    jogada = int(jogada)
+    orientacao = orientacoes_de(chave_peca(PECAS[jogada >> 11]))[0][(jogada >> 9) & 3]
+    jogo.peca_atual = orientacao.peca
+    jogo.x, jogo.y = jogada & 15, (jogada >> 4) & 31
+    jogo.fixa_peca()
+
+
+# ---------- Gravação ----------
+class GravadorRastros:
+    """Acrescenta partidas a um par .trace/.idx (um gravador por processo).
+
+    As jogadas são gravadas antes da entrada do índice; uma partida
+    interrompida no meio fica sem entrada e é ignorada na leitura.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.pid = os.getpid()
+        self._jogadas = _abrir_para_acrescentar(caminho + ".trace", MAGICO_JOGADAS)
+        self._indice = _abrir_para_acrescentar(caminho + ".idx", MAGICO_INDICE, DTYPE_INDICE.itemsize)
+
+    def gravar(self, jogo, jogadas, pesos=(), semente=None):
+        """Acrescenta uma partida terminada e suas jogadas (array de 16 bits)"""
+        inicio = self._jogadas.seek(0, os.SEEK_END)
+        self._jogadas.write(np.asarray(jogadas, dtype="<u2").tobytes())
+        self._jogadas.flush()
+
+        entrada = np.zeros(1, dtype=DTYPE_INDICE)
+        entrada["inicio"] = inicio
+        entrada["n"] = len(jogadas)
+        entrada["semente"] = -1 if semente is None else semente
+        entrada["pontos"] = jogo.pontos
+        entrada["linhas"] = jogo.linhas_removidas
+        entrada["pesos"][0, :len(pesos)] = np.asarray(pesos, dtype=float)[:4]
+        self._indice.write(entrada.tobytes())
+        self._indice.flush()
+
+    def fechar(self):
+        self._jogadas.close()
+        self._indice.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+        return False
+
+
+def _abrir_para_acrescentar(caminho, magico, tamanho_entrada=None):
+    """Abre para acrescentar, criando o cabeçalho; no índice, descarta uma entrada gravada pela metade"""
+    existe = os.path.exists(caminho) and os.path.getsize(caminho) >= len(magico)
+    f = open(caminho, "r+b" if existe else "w+b")
+    if not existe:
+        f.write(magico)
+    elif f.read(len(magico)) != magico:
+        f.close()
+        raise ValueError(f"{caminho} não é um arquivo de rastros")
+    dados = f.seek(0, os.SEEK_END) - len(magico)
+    if tamanho_entrada and dados % tamanho_entrada:
+        f.truncate(len(magico) + dados - dados % tamanho_entrada)
+        f.seek(0, os.SEEK_END)
+    return f
+
+
+# Gravação a partir do fitness: um gravador por processo em RASTROS_DIR
+ATIVO = RASTROS_DIR is not None
+_diretorio = RASTROS_DIR
+_gravador = None
+
+
+def ativar(diretorio=RASTROS_DIR):
+    """Liga (com um diretório) ou desliga (None) a gravação das partidas do fitness"""
+    global ATIVO, _diretorio, _gravador
+    if _gravador is not None and _gravador.pid == os.getpid():
+        _gravador.fechar()
+    ATIVO, _diretorio, _gravador = diretorio is not None, diretorio, None
+
+
+def gravar_partida(jogo, jogadas, pesos, semente):
+    """Grava a partida no arquivo deste processo (<RASTROS_DIR>/partidas-<pid>)"""
+    global _gravador
+    if _gravador is None or _gravador.pid != os.getpid():
+        os.makedirs(_diretorio, exist_ok=True)
+        _gravador = GravadorRastros(os.path.join(_diretorio, f"partidas-{os.getpid()}"))
+    _gravador.gravar(jogo, jogadas, pesos, semente)
+
+
+# ---------- Leitura ----------
+class LeitorRastros:
+    """Leitura de um par .trace/.idx por mmap, sem carregar as partidas"""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._arquivos = []
+        self._mapas = []
+        jogadas = self._mapear(caminho + ".trace", MAGICO_JOGADAS)
+        indice = self._mapear(caminho + ".idx", MAGICO_INDICE)
+        n = (len(indice) - len(MAGICO_INDICE)) // DTYPE_INDICE.itemsize
+        self.indice = np.frombuffer(indice, dtype=DTYPE_INDICE, count=n, offset=len(MAGICO_INDICE))
+        self._jogadas = jogadas
+
+    def _mapear(self, caminho, magico):
+        f = open(caminho, "rb")
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._arquivos.append(f)
+        self._mapas.append(mapa)
+        if mapa[:len(magico)] != magico:
+            self.fechar()
+            raise ValueError(f"{caminho} não é um arquivo de rastros")
+        return mapa
+
+    def __len__(self):
+        return len(self.indice)
+
+    def partida(self, i):
+        """Resumo da partida `i`: semente, pontos, linhas, peças e pesos"""
+        entrada = self.indice[i]
+        semente = int(entrada["semente"])
+        return {
+            "semente": None if semente < 0 else semente,
+            "pontos": int(entrada["pontos"]),
+            "linhas": int(entrada["linhas"]),
+            "pecas": int(entrada["n"]),
+            "pesos": entrada["pesos"].tolist(),
+        }
+
+    def jogadas(self, i):
+        """Jogadas empacotadas da partida `i` (array de 16 bits lido do mmap)"""
+        entrada = self.indice[i]
+        inicio = int(entrada["inicio"])
+        return np.frombuffer(self._jogadas[inicio:inicio + 2 * int(entrada["n"])], dtype="<u2")
+
+    def estado(self, i, pecas=None, motor=None):
+        """Jogo da partida `i` logo após as primeiras `pecas` peças (padrão: todas), refeito sem busca"""
+        from tetris import criar_jogo
+
+        jogo = criar_jogo(motor, self.partida(i)["semente"])
+        for jogada in self.jogadas(i)[:pecas]:
+            refazer_jogada(jogo, jogada)
+        return jogo
+
+    def reproduzir(self, i, inicio=0, motor=None):
+        """Percorre a partida `i` a partir da peça `inicio`, gerando o jogo após cada peça"""
+        jogo = self.estado(i, inicio, motor)
+        yield jogo
+        for jogada in self.jogadas(i)[inicio:]:
+            refazer_jogada(jogo, jogada)
+            yield jogo
+
+    def melhores(self, n=10):
+        """Índices das `n` partidas com mais pontos"""
+        return np.argsort(-self.indice["pontos"], kind="stable")[:n].tolist()
+
+    def fechar(self):
+        self.indice = None
+        for mapa in self._mapas:
+            mapa.close()
+        for f in self._arquivos:
+            f.close()
+        self._mapas, self._arquivos = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lista e revê partidas gravadas em rastros")
+    parser.add_argument("caminho", help="arquivo de rastros, sem extensão (ex.: rastros/partidas-1234)")
+    parser.add_argument("--melhores", type=int, default=10, help="lista as N partidas com mais pontos")
+    parser.add_argument("--ver", type=int, metavar="PARTIDA", help="mostra a partida na interface gráfica")
+    parser.add_argument("--peca", type=int, default=0, help="começa a partida nesta peça (padrão: 0)")
+    args = parser.parse_args(argv)
+
+    leitor = LeitorRastros(args.caminho)
+    if args.ver is None:
+        print(f"📼 {len(leitor)} partidas, {int(leitor.indice['n'].sum())} peças em {args.caminho}")
+        for i in leitor.melhores(args.melhores):
+            p = leitor.partida(i)
+            print(f"   [{i}] {p['pontos']:7d} pontos, {p['linhas']:5d} linhas, {p['pecas']:5d} peças "
+                  f"(semente {p['semente']}) pesos {[round(w, 2) for w in p['pesos']]}")
+        leitor.fechar()
+        return 0
+
+    from visual import VisualizadorTetris
+
+    visualizador = VisualizadorTetris()
+    try:
+        visualizador.replay_rastro(leitor, args.ver, args.peca)
+    finally:
+        visualizador.fechar()
+        leitor.fechar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
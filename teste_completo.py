@@ -7,8 +7,62 @@ Script de teste completo para verificar:
 - Funcionamento geral do jogo
 """
 
-from tetris import Tetris
-from config import LARGURA, ALTURA
+import copy
+import io
+import json
+import os
+import pstats
+import random
+import sys
+import tempfile
+import time
+import numpy as np
+from tetris import Tetris, criar_jogo
+from config import (
+    LARGURA, ALTURA, PECAS, PERFIL_ARQUIVO, N_GENERATIONS, CHECKPOINT_FILE, HISTORICO_FILE,
+    CACHE_TRANSPOSICAO_PASSO, SAVE_FILE
+)
+from pecas import criar_gerador
+from genetic_algorithm import (
+    fitness, fitness_par, proxima_geracao, jogar_partida, fitness_sementes, fitness_instrumentado,
+    avaliar_populacao_paralela, avaliar_populacao_lote, avaliar_populacao_corrida, treinar_ia, jogos_por_segundo
+)
+from caracteristicas import extrair_caracteristicas, NOMES_CARACTERISTICAS
+from tetris_bitboard import extrair_caracteristicas_mascaras
+from agente import (
+    escolher_jogada, escolher_jogada_lote, escolher_jogada_antecipada, aplicar_jogada,
+    AgenteAssincrono, BuscaComPrazo, Prazo
+)
+from jogos_em_lote import jogar_em_lote
+from corrida import avaliar_corrida, pontuacoes_corrida
+from avaliador import AvaliadorParalelo
+from cache_fitness import CacheFitness
+from fila_distribuida import FilaTarefas, ServidorAvaliacao, iniciar_trabalhadores, CHAVE_PUBLICA
+from checkpoint import salvar_checkpoint, carregar_checkpoint
+from historico import HistoricoTreino
+import avaliar_pesos
+from benchmark import gerar_corpus, jogos_do_corpus, CORPORA
+import instrumentacao
+import rastros
+import transposicao
+from transposicao import hash_tabuleiro, hash_mascaras, hash_jogada
+
+# ---------- Referências usadas pelos testes (cópias, sem o caminho rápido do motor) ----------
+def tabuleiro_simulado(jogo, orientacao, px, y, mascaras=False):
+    """Cópia do tabuleiro com a orientação fixada em (px, y); com `mascaras`, uma máscara por linha"""
+    tab = jogo.clonar_tabuleiro()
+    for i, j in orientacao.celulas:
+        if y + i < ALTURA:
+            tab[y + i][px + j] = orientacao.peca[i][j]
+    if mascaras:
+        return [sum(1 << x for x, val in enumerate(linha) if val) for linha in tab]
+    return tab
+
+def jogo_apos(jogo, px, rotacoes):
+    """Cópia do jogo depois de jogar de verdade a peça atual em (px, rotações)"""
+    depois = copy.deepcopy(jogo)
+    depois.jogar_peca(px, rotacoes)
+    return depois
 
 def teste_uma_linha():
     """Testa remoção de 1 linha"""
@@ -222,6 +276,899 @@ def verificar_estrutura_tabuleiro():
         print("ERRO: Estrutura do tabuleiro corrompida!")
         return False
 
+def teste_motor_bitboard():
+    """Compara o motor bitboard com o motor de listas nas mesmas partidas"""
+    print("\n=== TESTE: MOTOR BITBOARD ===")
+    pesos = [3.2, 4.1, 1.7, -0.5]
+    
+    iguais = True
+    for semente in range(3):
+        pontos_lista = fitness(pesos, motor="lista", semente=semente)
+        pontos_bitboard = fitness(pesos, motor="bitboard", semente=semente)
+        print(f"Semente {semente}: lista={pontos_lista}, bitboard={pontos_bitboard}")
+        iguais = iguais and pontos_lista == pontos_bitboard
+    
+    if iguais:
+        print("SUCESSO: Motores jogam partidas idênticas!")
+    else:
+        print("ERRO: Motores divergiram!")
+    
+    return iguais
+
+def teste_perfil_alturas():
+    """Verifica se o perfil de alturas acompanha o tabuleiro durante a partida"""
+    print("\n=== TESTE: PERFIL DE ALTURAS ===")
+    
+    correto = True
+    for motor in ["lista", "bitboard"]:
+        random.seed(0)
+        jogo = criar_jogo(motor, semente=0)
+        pecas = 0
+        while not jogo.game_over and pecas < 200:
+            jogo.x = random.randint(0, LARGURA - len(jogo.peca_atual[0]))
+            jogo.drop_rapido()
+            pecas += 1
+            esperado = [next((ALTURA - y for y in range(ALTURA) if jogo.tabuleiro[y][x]), 0)
+                        for x in range(LARGURA)]
+            if jogo.alturas != esperado:
+                print(f"ERRO ({motor}): perfil {jogo.alturas}, esperado {esperado}")
+                correto = False
+                break
+        print(f"Motor {motor}: {pecas} peças conferidas")
+    
+    if correto:
+        print("SUCESSO: Perfil de alturas consistente!")
+    
+    return correto
+
+def teste_caracteristicas():
+    """Testa o extrator de características em um tabuleiro com um buraco"""
+    print("\n=== TESTE: CARACTERÍSTICAS ===")
+    jogo = Tetris()
+    
+    # Coluna 0 com células nas linhas 17 e 19 (buraco na 18)
+    jogo.tabuleiro[17][0] = 1
+    jogo.tabuleiro[19][0] = 1
+    mascaras = [sum(1 << x for x in range(LARGURA) if linha[x]) for linha in jogo.tabuleiro]
+    
+    esperado = (0, 19, 1, 2, 3, 0, 2 * ALTURA, 3 + (LARGURA - 1), 1)
+    lista = extrair_caracteristicas(jogo.tabuleiro, extras=True)
+    bitboard = extrair_caracteristicas_mascaras(mascaras, extras=True)
+    
+    print(f"Características: {dict(zip(NOMES_CARACTERISTICAS, lista))}")
+    print(f"Bitboard:        {bitboard}")
+    
+    correto = lista == bitboard == esperado and jogo.heuristica(jogo.tabuleiro) == esperado[:4]
+    if correto:
+        print("SUCESSO: Características corretas nos dois motores!")
+    else:
+        print(f"ERRO: Esperado {esperado}")
+    
+    return correto
+
+def teste_avaliacao_lote():
+    """Compara a avaliação vetorizada com simula_jogada ao longo de uma partida"""
+    print("\n=== TESTE: AVALIAÇÃO EM LOTE ===")
+    pesos = [3.2, 4.1, 1.7, -0.5]
+    
+    correto = True
+    for motor in ["lista", "bitboard"]:
+        jogo = criar_jogo(motor, semente=1)
+        decisoes = 0
+        while not jogo.game_over and decisoes < 300 and correto:
+            caracteristicas, jogadas = jogo.avaliar_jogadas(extras=True)
+            for linha, (x, rot) in zip(caracteristicas, jogadas):
+                if tuple(linha) != jogo.simula_jogada(x, rot, extras=True):
+                    print(f"ERRO ({motor}): jogada {(x, rot)} difere de simula_jogada")
+                    correto = False
+                    break
+            acao = escolher_jogada_lote(jogo, pesos)
+            if acao != escolher_jogada(jogo, pesos):
+                print(f"ERRO ({motor}): escolhas diferentes na decisão {decisoes}")
+                correto = False
+            if acao:
+                aplicar_jogada(jogo, acao)
+            jogo.passo()
+            decisoes += 1
+        print(f"Motor {motor}: {decisoes} decisões conferidas")
+    
+    if correto:
+        print("SUCESSO: Avaliação em lote igual à avaliação uma a uma!")
+    
+    return correto
+
+def teste_fitness_em_lote():
+    """Compara a avaliação da população em lote com fitness no modo queda"""
+    print("\n=== TESTE: FITNESS EM LOTE ===")
+    populacao = [[3.2, 4.1, 1.7, -0.5], [1.0, 5.0, 0.5, 0.2], [-2.0, 1.0, 3.0, 1.5]]
+    
+    pontos_lote, _, pecas_lote = jogar_em_lote(populacao, semente=5)
+    pontos_individuais = []
+    for individuo in populacao:
+        pontos_individuais.append(fitness(individuo, motor="bitboard", modo="queda", semente=5))
+    
+    print(f"Em lote:     {pontos_lote.tolist()} ({pecas_lote.tolist()} peças)")
+    print(f"Individual:  {pontos_individuais}")
+    
+    if pontos_lote.tolist() == pontos_individuais:
+        print("SUCESSO: Avaliação em lote igual à individual!")
+        return True
+    print("ERRO: Pontuações diferentes!")
+    return False
+
+def teste_geradores_pecas():
+    """Testa a reprodutibilidade das sementes e o sistema 7-bag"""
+    print("\n=== TESTE: GERADORES DE PEÇAS ===")
+    
+    jogo_a, jogo_b = Tetris(semente=42), Tetris(semente=42)
+    mesma_sequencia = all(jogo_a.nova_peca() == jogo_b.nova_peca() for _ in range(50))
+    print(f"Mesma semente, mesma sequência: {mesma_sequencia}")
+    
+    saco = criar_gerador(semente=7, tipo="saco")
+    sacos_completos = all(
+        sorted(PECAS) == sorted(saco.proxima() for _ in range(len(PECAS)))
+        for _ in range(10)
+    )
+    print(f"Cada saco tem as 7 peças: {sacos_completos}")
+    
+    if mesma_sequencia and sacos_completos:
+        print("SUCESSO: Geradores de peças funcionando!")
+        return True
+    print("ERRO: Geradores de peças com problema!")
+    return False
+
+def teste_corrida():
+    """Testa a avaliação por corrida com partidas simuladas"""
+    print("\n=== TESTE: CORRIDA ===")
+    
+    # "Partida" simulada: pontuação = qualidade do indivíduo + ruído da semente
+    def jogar(pares):
+        return [individuo + random.Random(semente).uniform(-1, 1) for individuo, semente in pares]
+    
+    populacao = list(range(16))
+    resultados = avaliar_corrida(populacao, sementes=list(range(8)), jogar=jogar, jogos_iniciais=2)
+    pontuacoes = pontuacoes_corrida(resultados)
+    
+    episodios = [r.episodios for r in resultados]
+    print(f"Partidas por indivíduo: {episodios}")
+    print(f"Total: {sum(episodios)} (sem corrida seriam {len(populacao) * 8})")
+    
+    melhores = sorted(range(len(populacao)), key=lambda i: pontuacoes[i])[-len(populacao) // 2:]
+    correto = (episodios[-1] == 8 and episodios[0] == 2
+               and sorted(melhores) == list(range(8, 16)))
+    if correto:
+        print("SUCESSO: Corrida concentrou as partidas nos melhores!")
+    else:
+        print("ERRO: Corrida não ordenou a população como esperado!")
+    
+    return correto
+
+def teste_avaliador_paralelo():
+    """Testa o pool persistente: várias gerações no mesmo pool dão o mesmo resultado que em série"""
+    print("\n=== TESTE: AVALIADOR PARALELO ===")
+    
+    pares = [([3.0, 4.0, 1.0, -0.5], semente) for semente in range(4)]
+    esperado = [fitness_par(par) for par in pares]
+    
+    with AvaliadorParalelo(2) as avaliador:
+        geracoes = [avaliador.map(fitness_par, pares) for _ in range(3)]
+        print(f"Processos: {avaliador.processos}, bloco para 100 tarefas: {avaliador.tamanho_bloco(100)}")
+    
+    print(f"Em série: {esperado}")
+    print(f"No pool:  {geracoes[-1]}")
+    
+    correto = all(pontos == esperado for pontos in geracoes)
+    if correto:
+        print("SUCESSO: Pool reaproveitado entre gerações!")
+    else:
+        print("ERRO: Pool deu resultado diferente da execução em série!")
+    
+    return correto
+
+def teste_cache_fitness():
+    """Testa o cache de fitness: duplicados avaliados uma vez, reaproveitamento e descarte LRU"""
+    print("\n=== TESTE: CACHE DE FITNESS ===")
+    
+    calculados = []
+    def calcular(itens):
+        calculados.extend(itens)
+        return [sum(individuo) for individuo, _ in itens]
+    
+    cache = CacheFitness(capacidade=3)
+    a, b, c = [1.0, 2.0], [3.0, 4.0], [5.0, 6.0]
+    primeira = cache.avaliar([(a, [7]), (b, [7]), (a, [7])], calcular)
+    segunda = cache.avaliar([(a, [7]), (b, [7]), (b, [8])], calcular)
+    print(f"Pontuações: {primeira} {segunda}")
+    print(f"Calculados: {len(calculados)} ({cache.resumo()})")
+    
+    # Capacidade 3: a entrada usada há mais tempo (a com semente 7) sai
+    cache.avaliar([(c, [7])], calcular)
+    descartou = cache.chave(a, [7]) not in cache and cache.chave(b, [8]) in cache
+    print(f"Descartou a menos usada: {descartou}")
+    
+    correto = (primeira == [3.0, 7.0, 3.0] and segunda == [3.0, 7.0, 7.0]
+               and len(calculados) == 4 and cache.duplicados == 1 and descartou)
+    if correto:
+        print("SUCESSO: Cache evitou partidas repetidas!")
+    else:
+        print("ERRO: Cache não se comportou como esperado!")
+    
+    return correto
+
+def teste_fila_distribuida():
+    """Testa a fila distribuída em localhost: trabalhadores como nós e devolução de tarefas"""
+    print("\n=== TESTE: FILA DISTRIBUÍDA ===")
+    
+    # Trabalhador que pega uma tarefa e some: a tarefa volta para a fila após o prazo
+    fila = FilaTarefas(prazo=0.2)
+    fila.publicar(["tarefa"])
+    emprestada = fila.pegar("sumiu", espera=0)
+    nada = fila.pegar("outro", espera=0)
+    time.sleep(0.3)
+    devolvida = fila.pegar("outro", espera=0)
+    print(f"Emprestada: {emprestada}, antes do prazo: {nada}, depois do prazo: {devolvida}")
+    
+    # Dois processos locais fazendo o papel de máquinas diferentes
+    pares = [([3.0, 4.0, 1.0, -0.5], semente) for semente in range(6)]
+    esperado = [fitness_par(par) for par in pares]
+    # Sem chave configurada, o servidor gera uma aleatória que os trabalhadores recebem
+    with ServidorAvaliacao(prazo=2) as servidor:
+        chave_gerada = servidor.chave_gerada and len(servidor.chave) == 32
+        trabalhadores = iniciar_trabalhadores(servidor.endereco, 2, servidor.chave)
+        pontos = servidor.map(fitness_par, pares)
+        conectados = servidor.processos
+    for trabalhador in trabalhadores:
+        trabalhador.join(timeout=10)
+    print(f"Trabalhadores: {conectados}, pontuações: {pontos}, chave gerada: {chave_gerada}")
+    
+    # A chave pública antiga não pode escutar fora do loopback
+    try:
+        ServidorAvaliacao(("0.0.0.0", 0), chave=CHAVE_PUBLICA)
+        recusou = False
+    except ValueError:
+        recusou = True
+    print(f"Chave pública recusada em 0.0.0.0: {recusou}")
+    
+    # Com um só trabalhador conectado, lote e corrida ainda passam pela fila
+    populacao = [np.array([3.0, 4.0, 1.0, -0.5]), np.array([1.0, 1.0, 1.0, 0.0]), np.array([0.5, 2.0, 2.0, 1.0])]
+    locais = (avaliar_populacao_lote(populacao, 0, [1])[0],
+              avaliar_populacao_corrida(populacao, 0, [1, 2, 3])[0])
+    with ServidorAvaliacao(prazo=2) as servidor:
+        # Como na geração 0: o trabalhador ainda nem se conectou
+        unico = iniciar_trabalhadores(servidor.endereco, 1, servidor.chave)
+        distribuidos = (avaliar_populacao_lote(populacao, 0, [1], avaliador=servidor)[0],
+                        avaliar_populacao_corrida(populacao, 0, [1, 2, 3], avaliador=servidor)[0])
+        publicadas = servidor.fila.proximo_id
+    for trabalhador in unico:
+        trabalhador.join(timeout=10)
+    print(f"Um trabalhador: {publicadas} tarefas publicadas, mesmas pontuações: {distribuidos == locais}")
+    
+    correto = (emprestada == (0, "tarefa") and nada is None and devolvida == (0, "tarefa")
+               and pontos == esperado and all(t.exitcode == 0 for t in trabalhadores)
+               and chave_gerada and recusou and publicadas >= 2 and distribuidos == locais)
+    if correto:
+        print("SUCESSO: Fila distribuiu e devolveu as tarefas!")
+    else:
+        print("ERRO: Fila distribuída não se comportou como esperado!")
+    
+    return correto
+
+def teste_checkpoint():
+    """Testa a retomada do checkpoint: a próxima geração sai idêntica à da execução original"""
+    print("\n=== TESTE: CHECKPOINT ===")
+    
+    random.seed(13)
+    np.random.seed(13)
+    populacao = [np.random.uniform(-5, 5, 4) for _ in range(30)]
+    pontuacoes = [random.randint(0, 1000) for _ in populacao]
+    caminho = os.path.join(tempfile.mkdtemp(), "checkpoint.npz")
+    salvar_checkpoint(caminho, 4, populacao, pontuacoes, [11, 22, 33], max(pontuacoes))
+    
+    # Execução original continua; depois "reinicia" a partir do checkpoint
+    original = proxima_geracao(populacao, pontuacoes)
+    aleatorio_original = np.random.uniform(size=3).tolist()
+    estado = carregar_checkpoint(caminho)
+    retomada = proxima_geracao(estado["populacao"], estado["pontuacoes"])
+    aleatorio_retomada = np.random.uniform(size=3).tolist()
+    os.remove(caminho)
+    
+    print(f"Geração: {estado['geracao']}, sementes: {estado['sementes']}, população: {len(retomada)}")
+    print(f"Primeiro filho: {original[0]} / {retomada[0]}")
+    
+    correto = (estado["geracao"] == 4 and estado["sementes"] == [11, 22, 33]
+               and all(np.array_equal(a, b) for a, b in zip(original, retomada))
+               and aleatorio_original == aleatorio_retomada)
+    if correto:
+        print("SUCESSO: Retomada idêntica à execução original!")
+    else:
+        print("ERRO: Retomada divergiu da execução original!")
+    
+    return correto
+
+def teste_checkpoint_concluido():
+    """Testa a retomada de um checkpoint já na última geração (nada a treinar)"""
+    print("\n=== TESTE: CHECKPOINT JÁ CONCLUÍDO ===")
+    
+    diretorio_original = os.getcwd()
+    diretorio = tempfile.mkdtemp()
+    entrada_original = sys.stdin
+    try:
+        os.chdir(diretorio)
+        # Processo morto entre o último checkpoint e a remoção dele
+        populacao = [np.full(4, float(i)) for i in range(6)]
+        pontuacoes = list(range(100, 106))
+        melhor_pesos = [1.0, 2.0, 3.0, 4.0]
+        HistoricoTreino(HISTORICO_FILE).registrar_geracao(
+            N_GENERATIONS - 1, [melhor_pesos, [0.0] * 4], [105, 1])
+        salvar_checkpoint(CHECKPOINT_FILE, N_GENERATIONS, populacao, pontuacoes, [1, 2], 105)
+        
+        sys.stdin = io.StringIO("n\n")
+        melhor = treinar_ia()
+        removido = not os.path.exists(CHECKPOINT_FILE)
+    finally:
+        sys.stdin = entrada_original
+        os.chdir(diretorio_original)
+    
+    print(f"Melhor: {list(melhor)}, checkpoint removido: {removido}")
+    correto = list(melhor) == melhor_pesos and removido
+    if correto:
+        print("SUCESSO: Retomada sem gerações restantes devolveu o melhor!")
+    else:
+        print("ERRO: Retomada sem gerações restantes falhou!")
+    
+    return correto
+
+def teste_historico():
+    """Testa o histórico append-only: consultas pelo índice, recuperação e migração"""
+    print("\n=== TESTE: HISTÓRICO ===")
+    
+    pasta = tempfile.mkdtemp()
+    caminho = os.path.join(pasta, "historico.jsonl")
+    historico = HistoricoTreino(caminho)
+    for geracao in range(5):
+        populacao = [[geracao, i, 0.0, 0.0] for i in range(4)]
+        historico.registrar_geracao(geracao, populacao, [10 * geracao + i for i in range(4)])
+    
+    ultimas = [e["geracao"] for e in historico.ultimas(2)]
+    intervalo = [e["geracao"] for e in historico.intervalo(1, 3)]
+    individuos = historico.individuos(historico.ultimas(1)[0])
+    estatisticas = historico.estatisticas()
+    print(f"Últimas: {ultimas}, intervalo [1, 3): {intervalo}")
+    print(f"Estatísticas: {estatisticas}")
+    
+    # Interrupção no meio da gravação: dados sem linha no índice são descartados
+    with open(caminho, "a") as f:
+        f.write('{"geracao": 5, "indice": 0, "pesos": [0, 0, 0, 0], "score": 1}\n{"geracao": 5, "ind')
+    recuperado = HistoricoTreino(caminho)
+    
+    # Sem o índice, ele é refeito a partir dos dados
+    os.remove(caminho + ".idx")
+    reconstruido = HistoricoTreino(caminho)
+    
+    # Migração do formato antigo (melhor de cada geração)
+    antigo = os.path.join(pasta, "melhores_pesos.json")
+    with open(antigo, "w") as f:
+        f.write('[{"geracao": 0, "pesos": [1, 2, 3, 4], "score": 100}, '
+                '{"geracao": 1, "pesos": [1, 2, 3, 4], "score": 250.75}]')
+    migrado = HistoricoTreino(os.path.join(pasta, "migrado.jsonl"))
+    migrado.migrar_json(antigo)
+    print(f"Recuperado: {len(recuperado)} gerações, reconstruído: {len(reconstruido)}, migrado: {migrado.melhores()}")
+    
+    correto = (ultimas == [3, 4] and intervalo == [1, 2]
+               and [r["score"] for r in individuos] == [40, 41, 42, 43]
+               and estatisticas == {"geracoes": 5, "individuos": 20, "melhor": 43, "pior": 0, "media": 21.5}
+               and recuperado.indice == historico.indice and reconstruido.indice == historico.indice
+               and migrado.melhores() == [{"geracao": 0, "pesos": [1.0, 2.0, 3.0, 4.0], "score": 100},
+                                          {"geracao": 1, "pesos": [1.0, 2.0, 3.0, 4.0], "score": 250.75}])
+    if correto:
+        print("SUCESSO: Histórico consultado, recuperado e migrado!")
+    else:
+        print("ERRO: Histórico não se comportou como esperado!")
+    
+    return correto
+
+def teste_avaliar_pesos():
+    """Testa a avaliação sem interface: relatório JSON igual ao fitness de cada partida"""
+    print("\n=== TESTE: AVALIAÇÃO SEM INTERFACE ===")
+    
+    pesos = [3.0, 4.0, 1.0, -0.5]
+    caminho = os.path.join(tempfile.mkdtemp(), "relatorio.json")
+    codigo = avaliar_pesos.main(["--pesos", *map(str, pesos), "--jogos", "4", "--semente", "5",
+                                 "--processos", "2", "--json", caminho])
+    with open(caminho) as f:
+        relatorio = json.load(f)
+    
+    esperado = [fitness(np.array(pesos), semente=s) for s in range(5, 9)]
+    pontos = [partida["pontos"] for partida in relatorio["partidas"]]
+    print(f"Pontos: {pontos} (fitness: {esperado})")
+    
+    # --melhor --json - num checkout só com o arquivo antigo: JSON puro na saída e nada gravado
+    diretorio_original, saida_original = os.getcwd(), sys.stdout
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        try:
+            with open(SAVE_FILE, "w") as f:
+                json.dump([{"geracao": 0, "pesos": pesos, "score": 100.5}], f)
+            sys.stdout = io.StringIO()
+            codigo_melhor = avaliar_pesos.main(["--melhor", "--jogos", "1", "--processos", "1", "--json", "-"])
+            saida = sys.stdout.getvalue()
+        finally:
+            sys.stdout = saida_original
+            os.chdir(diretorio_original)
+        arquivos = sorted(os.listdir(diretorio))
+    melhor = json.loads(saida)
+    print(f"--melhor --json -: pesos {melhor['pesos']}, arquivos no diretório: {arquivos}")
+    
+    correto = (codigo == 0 and pontos == esperado
+               and relatorio["pontos"]["max"] == max(esperado)
+               and all(0 < partida["pecas"] <= 500 for partida in relatorio["partidas"])
+               and codigo_melhor == 0 and melhor["pesos"] == pesos and arquivos == [SAVE_FILE])
+    if correto:
+        print("SUCESSO: Relatório confere com as partidas!")
+    else:
+        print("ERRO: Relatório diferente do fitness!")
+    
+    return correto
+
+def teste_corpus_benchmark():
+    """Testa o corpus do benchmark: tabuleiros reproduzíveis e iguais nos dois motores"""
+    print("\n=== TESTE: CORPUS DO BENCHMARK ===")
+    
+    correto = True
+    for nome, (minimo, maximo) in CORPORA.items():
+        corpus = gerar_corpus(nome, n=5)
+        alturas = [max(next((ALTURA - y for y in range(ALTURA) if tab[y][x]), 0) for x in range(LARGURA))
+                   for tab, _ in corpus]
+        reproduzivel = corpus == gerar_corpus(nome, n=5)
+        
+        # carregar_tabuleiro deixa os dois motores no mesmo estado
+        lista, bitboard = jogos_do_corpus(corpus, "lista"), jogos_do_corpus(corpus, "bitboard")
+        iguais = all(a.alturas == b.alturas and
+                     [a.simula_jogada(x, 0) for x in range(LARGURA)] ==
+                     [b.simula_jogada(x, 0) for x in range(LARGURA)]
+                     for a, b in zip(lista, bitboard))
+        print(f"Corpus {nome}: alturas {alturas}, reproduzível: {reproduzivel}, motores iguais: {iguais}")
+        correto = correto and reproduzivel and iguais and all(minimo <= h <= maximo for h in alturas)
+    
+    if correto:
+        print("SUCESSO: Corpus fixo e consistente entre motores!")
+    else:
+        print("ERRO: Corpus do benchmark inconsistente!")
+    
+    return correto
+
+def teste_instrumentacao():
+    """Testa os contadores da instrumentação contra a própria partida"""
+    print("\n=== TESTE: INSTRUMENTAÇÃO ===")
+    
+    pesos = np.array([3.0, 4.0, 1.0, -0.5])
+    referencia = [jogar_partida(pesos, busca=busca, semente=3) for busca in ("simples", "lote")]
+    
+    instrumentacao.ativar()
+    try:
+        correto = True
+        for busca, esperado in zip(("simples", "lote"), referencia):
+            instrumentacao.zerar()
+            jogo = jogar_partida(pesos, busca=busca, semente=3)
+            contadores = instrumentacao.coletar()
+            print(f"Busca {busca}: {contadores['pecas']} peças, {contadores['linhas']} linhas, "
+                  f"{contadores['jogadas_avaliadas']} jogadas, {contadores['colisoes']} colisões")
+            correto = (correto and jogo.pontos == esperado.pontos
+                       and contadores["partidas"] == 1
+                       and contadores["pecas"] == jogo.pecas_colocadas
+                       and contadores["linhas"] == jogo.linhas_removidas
+                       and contadores["jogadas_avaliadas"] >= jogo.pecas_colocadas
+                       and contadores["colisoes"] > 0
+                       and 0 < contadores["tempo_busca"] <= contadores["tempo_partida"])
+        
+        # Contadores devolvidos pela avaliação de um indivíduo
+        score, contadores = fitness_instrumentado(pesos.tolist(), sementes=[1, 2])
+        print(f"fitness_instrumentado: score {score}, partidas {contadores['partidas']}")
+        correto = correto and contadores["partidas"] == 2 and score == fitness_sementes(pesos, [1, 2])
+    finally:
+        instrumentacao.ativar(False)
+        instrumentacao.zerar()
+    
+    if correto:
+        print("SUCESSO: Contadores batem com as partidas e os scores não mudam!")
+    else:
+        print("ERRO: Contadores da instrumentação inconsistentes!")
+    
+    return correto
+
+def teste_perfil_agregado():
+    """Testa o perfil somado entre processos: cada avaliação aparece uma vez no pstats"""
+    print("\n=== TESTE: PERFIL AGREGADO ===")
+    
+    populacao = [np.array([3.0, 4.0, 1.0, -0.5]), np.array([1.0, 2.0, 0.5, 0.1]), np.array([2.0, 3.0, 1.0, 0.0])]
+    esperado = [fitness_sementes(individuo, [1]) for individuo in populacao]
+    
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        try:
+            with AvaliadorParalelo(2) as avaliador:
+                pontuacoes = avaliar_populacao_paralela(populacao, 7, sementes=[1], avaliador=avaliador,
+                                                        perfilar=True)[0]
+            caminho = PERFIL_ARQUIVO.format(geracao=7)
+            estatisticas = pstats.Stats(caminho).stats
+        finally:
+            os.chdir(diretorio_original)
+    
+    chamadas = {nome: dados[1] for (_, _, nome), dados in estatisticas.items()}
+    print(f"Pontuações: {pontuacoes} (esperado {esperado})")
+    print(f"Chamadas de fitness_sementes: {chamadas.get('fitness_sementes')}, "
+          f"de jogar_partida: {chamadas.get('jogar_partida')}")
+    correto = (pontuacoes == esperado and chamadas.get("fitness_sementes") == len(populacao)
+               and chamadas.get("jogar_partida") == len(populacao))
+    
+    if correto:
+        print("SUCESSO: Perfil dos workers somado em um único pstats!")
+    else:
+        print("ERRO: Perfil agregado incompleto!")
+    
+    return correto
+
+def teste_desenho_incremental():
+    """Testa o desenho incremental: a tela deve ficar igual a um redesenho completo a cada quadro"""
+    print("\n=== TESTE: DESENHO INCREMENTAL ===")
+    
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from visual import VisualizadorTetris
+    from config import TAMANHO_BLOCO, CORES_PECAS
+    
+    def desenho_completo(visualizador, jogo):
+        """Desenho de referência: limpa a tela e desenha cada célula (como antes do cache)"""
+        tela = pygame.Surface(visualizador.tela.get_size())
+        celulas = [(x, y, v) for y, linha in enumerate(jogo.tabuleiro) for x, v in enumerate(linha) if v]
+        celulas += [(jogo.x + j, jogo.y + i, v) for i, linha in enumerate(jogo.peca_atual)
+                    for j, v in enumerate(linha) if v]
+        for x, y, v in celulas:
+            rect = (x * TAMANHO_BLOCO, y * TAMANHO_BLOCO, TAMANHO_BLOCO, TAMANHO_BLOCO)
+            pygame.draw.rect(tela, CORES_PECAS.get(v, (255, 255, 255)), rect)
+            pygame.draw.rect(tela, (255, 255, 255), rect, 1)
+        textos = [f"Modo: IA", f"Pontos: {jogo.pontos}", f"Linhas: {jogo.linhas_removidas}", f"Nível: {jogo.nivel}"]
+        for i, texto in enumerate(textos):
+            tela.blit(visualizador.fonte.render(texto, True, (255, 255, 255)), (10, 10 + i * 25))
+        return pygame.image.tostring(tela, "RGB")
+    
+    visualizador = VisualizadorTetris()
+    try:
+        jogo = criar_jogo(semente=5)
+        escolher = escolher_jogada_lote
+        pesos = np.array([3.0, 4.0, 1.0, -0.5])
+        quadros = diferentes = 0
+        while not jogo.game_over and quadros < 400:
+            if quadros % 3 == 0:
+                acao = escolher(jogo, pesos)
+                if acao:
+                    aplicar_jogada(jogo, acao)
+            jogo.passo()
+            visualizador.desenhar_tabuleiro(jogo)
+            visualizador.desenhar_info(jogo, "IA")
+            visualizador.atualizar_tela()
+            quadros += 1
+            if pygame.image.tostring(visualizador.tela, "RGB") != desenho_completo(visualizador, jogo):
+                diferentes += 1
+        print(f"{quadros} quadros, {jogo.pecas_colocadas} peças, {jogo.linhas_removidas} linhas, "
+              f"{diferentes} quadros diferentes do redesenho completo")
+        correto = quadros > 0 and jogo.linhas_removidas > 0 and diferentes == 0
+    finally:
+        visualizador.fechar()
+    
+    if correto:
+        print("SUCESSO: Desenho incremental igual ao redesenho completo!")
+    else:
+        print("ERRO: Desenho incremental diverge do redesenho completo!")
+    
+    return correto
+
+def teste_agente_assincrono():
+    """Testa o agente em segundo plano: aplicando a fila, o jogo exibido segue a mesma partida"""
+    print("\n=== TESTE: AGENTE ASSÍNCRONO ===")
+    
+    pesos = np.array([3.0, 4.0, 1.0, -0.5])
+    
+    # Referência: busca e passo no mesmo laço (como o replay fazia)
+    referencia = criar_jogo(semente=11)
+    passos = 0
+    while not referencia.game_over and passos < 600:
+        acao = escolher_jogada_lote(referencia, pesos)
+        if acao:
+            aplicar_jogada(referencia, acao)
+        referencia.passo()
+        passos += 1
+    
+    jogo = criar_jogo(semente=11)
+    with AgenteAssincrono(pesos, 11, adiantamento=50) as agente:
+        aplicados = 0
+        while aplicados < passos and agente.avancar(jogo, espera=5):
+            aplicados += 1
+        adiantadas = agente.adiantadas()
+    
+    print(f"{aplicados} passos aplicados da fila (referência: {passos}), {adiantadas} jogadas prontas ao parar")
+    print(f"Pontos: {jogo.pontos} (referência: {referencia.pontos}), peças: {jogo.pecas_colocadas}")
+    
+    # Um erro na busca chega à tela em vez de deixá-la esperando para sempre
+    with AgenteAssincrono(None, 11) as agente:
+        try:
+            agente.avancar(criar_jogo(semente=11), espera=5)
+            erro = None
+        except RuntimeError as e:
+            erro = e
+    print(f"Erro da busca repassado: {erro}")
+    
+    correto = (aplicados == passos and jogo.tabuleiro == referencia.tabuleiro
+               and jogo.pontos == referencia.pontos and adiantadas <= 50
+               and erro is not None and isinstance(erro.__cause__, TypeError))
+    
+    if correto:
+        print("SUCESSO: Jogadas da fila reproduzem a partida!")
+    else:
+        print("ERRO: Partida do agente assíncrono diverge!")
+    
+    return correto
+
+def teste_rastros():
+    """Testa os rastros: partidas gravadas pelo fitness são reconstruídas sem a busca"""
+    print("\n=== TESTE: RASTROS DE PARTIDAS ===")
+    
+    pesos = np.array([3.0, 4.0, 1.0, -0.5])
+    with tempfile.TemporaryDirectory() as diretorio:
+        rastros.ativar(diretorio)
+        try:
+            jogos = [jogar_partida(pesos, semente=s) for s in (1, 2)]
+            jogos.append(jogar_partida(pesos, semente=3, modo="passo"))
+            jogos.append(jogar_partida(pesos, semente=4, motor="bitboard"))
+        finally:
+            rastros.ativar(None)
+        
+        caminho = os.path.join(diretorio, f"partidas-{os.getpid()}")
+        # Uma entrada do índice gravada pela metade é descartada ao reabrir
+        with open(caminho + ".idx", "ab") as f:
+            f.write(b"\x00" * 10)
+        rastros.GravadorRastros(caminho).fechar()
+        
+        with rastros.LeitorRastros(caminho) as leitor:
+            correto = len(leitor) == len(jogos)
+            for i, jogo in enumerate(jogos):
+                partida = leitor.partida(i)
+                final = leitor.estado(i)
+                estados = [(e.clonar_tabuleiro(), e.pontos) for e in leitor.reproduzir(i)]
+                meio = partida["pecas"] // 2
+                procurado = leitor.estado(i, meio)
+                print(f"Partida {i}: {partida['pecas']} peças, {partida['pontos']} pontos "
+                      f"(jogo: {jogo.pecas_colocadas}, {jogo.pontos}), semente {partida['semente']}")
+                correto = (correto and partida["pontos"] == jogo.pontos
+                           and partida["pecas"] == jogo.pecas_colocadas
+                           and final.tabuleiro == jogo.tabuleiro and final.pontos == jogo.pontos
+                           and final.game_over == jogo.game_over
+                           and len(estados) == partida["pecas"] + 1
+                           and estados[meio] == (procurado.clonar_tabuleiro(), procurado.pontos))
+            tamanho = os.path.getsize(caminho + ".trace") + os.path.getsize(caminho + ".idx")
+            print(f"{int(leitor.indice['n'].sum())} peças em {tamanho} bytes; melhores: {leitor.melhores(2)}")
+    
+    if correto:
+        print("SUCESSO: Partidas reconstruídas a partir dos rastros!")
+    else:
+        print("ERRO: Rastros não reproduzem as partidas!")
+    
+    return correto
+
+def teste_transposicao():
+    """Testa o hash incremental do tabuleiro e o cache de transposição"""
+    print("\n=== TESTE: CACHE DE TRANSPOSIÇÃO ===")
+    
+    pesos = np.array([3.0, 4.0, 1.0, -0.5])
+    correto = True
+    
+    # O hash mantido peça a peça é igual ao hash calculado do zero
+    for motor in ["lista", "bitboard"]:
+        jogo = criar_jogo(motor, semente=2)
+        pecas = divergencias = 0
+        while not jogo.game_over and pecas < 150:
+            # Hash de uma jogada simulada, sem montar o tabuleiro resultante
+            orientacao = jogo.orientacoes_distintas()[-1]
+            y = max(jogo.linha_de_queda(0, orientacao), 0)
+            simulado = tabuleiro_simulado(jogo, orientacao, 0, y, mascaras=motor == "bitboard")
+            esperado = hash_mascaras(simulado) if motor == "bitboard" else hash_tabuleiro(simulado)
+            divergencias += hash_jogada(jogo.hash, orientacao, 0, y) != esperado
+            
+            acao = escolher_jogada_lote(jogo, pesos) or (jogo.x, 0)
+            jogo.jogar_peca(*acao)
+            pecas += 1
+            divergencias += jogo.hash != hash_tabuleiro(jogo.tabuleiro)
+        print(f"Motor {motor}: {pecas} peças, {jogo.linhas_removidas} linhas, {divergencias} hashes divergentes")
+        correto = correto and divergencias == 0 and jogo.linhas_removidas > 0
+    
+    # Mesmas pontuações com e sem o cache; no modo "passo" quase tudo é acerto
+    try:
+        resultados = {}
+        for capacidade in (0, 5000):
+            transposicao.ativar(capacidade)
+            resultados[capacidade] = [fitness(pesos, busca=busca, modo="passo", semente=7)
+                                      for busca in ("simples", "lote")]
+        cache = transposicao.CACHE
+        print(f"Pontuações sem cache: {resultados[0]}, com cache: {resultados[5000]}")
+        print(f"Cache: {cache.resumo()}")
+        correto = (correto and resultados[0] == resultados[5000]
+                   and cache.acertos > cache.faltas > 0 and len(cache) <= 5000)
+    finally:
+        transposicao.ativar()
+
+    # Padrão: desligado no modo "queda"; a primeira partida no "passo" liga o cache,
+    # a não ser que a capacidade tenha sido fixada (como em jogos_por_segundo)
+    try:
+        fitness(pesos, semente=7)
+        na_queda = transposicao.ATIVO
+        jogos_por_segundo(pesos, n_jogos=1, modo="passo")
+        medindo = transposicao.ATIVO
+        fitness(pesos, modo="passo", semente=7)
+        no_passo = transposicao.ATIVO and transposicao.CACHE.capacidade == CACHE_TRANSPOSICAO_PASSO
+        print(f"Cache ligado: queda {na_queda}, jogos_por_segundo {medindo}, passo {no_passo}")
+        correto = correto and not na_queda and not medindo and no_passo
+    finally:
+        transposicao.ativar()
+    
+    if correto:
+        print("SUCESSO: Hash incremental correto e cache transparente!")
+    else:
+        print("ERRO: Hash ou cache de transposição inconsistente!")
+    
+    return correto
+
+def teste_busca_antecipada():
+    """Testa a próxima peça, os estados após uma jogada e a busca com a próxima peça"""
+    print("\n=== TESTE: BUSCA COM A PRÓXIMA PEÇA ===")
+    
+    pesos = np.array([3.0, 4.0, 1.0, -0.5])
+    correto = True
+    
+    # A próxima peça não muda a sequência sorteada
+    jogo = Tetris(semente=11)
+    gerador = criar_gerador(11)
+    sequencia = [gerador.proxima() for _ in range(30)]
+    vistas = [jogo.peca_atual, jogo.proxima_peca]
+    while len(vistas) < 30:
+        jogo.jogar_peca(*(escolher_jogada_lote(jogo, pesos) or (jogo.x, 0)))
+        vistas.append(jogo.proxima_peca)
+    print(f"Sequência de peças preservada: {vistas == sequencia}")
+    correto = correto and vistas == sequencia
+    
+    # A busca de dois níveis joga tão bem quanto a gulosa nas mesmas sementes
+    sementes = [1, 2, 3]
+    gulosa = [fitness(pesos, busca="lote", semente=s) for s in sementes]
+    antecipada = [fitness(pesos, busca="antecipada", semente=s) for s in sementes]
+    print(f"Pontos gulosa: {gulosa}, antecipada: {antecipada}")
+    correto = correto and sum(antecipada) >= sum(gulosa)
+    
+    # Sem próxima peça (ou feixe 0) volta a ser a busca gulosa
+    jogo = Tetris(semente=5)
+    esperado = escolher_jogada_lote(jogo, pesos)
+    correto = correto and escolher_jogada_antecipada(jogo, pesos, largura=0) == esperado
+    jogo.proxima_peca = None
+    correto = correto and escolher_jogada_antecipada(jogo, pesos) == esperado
+    
+    if correto:
+        print("SUCESSO: Próxima peça e busca antecipada corretas!")
+    else:
+        print("ERRO: Próxima peça ou busca antecipada incorretas!")
+    
+    return correto
+
+def teste_busca_com_prazo():
+    """Testa as buscas com prazo por decisão e a contagem de prazos atingidos"""
+    print("\n=== TESTE: BUSCA COM PRAZO ===")
+    
+    pesos = np.array([3.0, 4.0, 1.0, -0.5])
+    correto = True
+    
+    # Com prazo folgado, as jogadas são as mesmas (a ordem de teste muda, a escolha não)
+    jogo = Tetris(semente=8)
+    diferentes = pecas = 0
+    while not jogo.game_over and pecas < 100:
+        acao = escolher_jogada(jogo, pesos)
+        diferentes += escolher_jogada(jogo, pesos, prazo=Prazo(60)) != acao
+        diferentes += escolher_jogada_antecipada(jogo, pesos, prazo=Prazo(60)) != \
+            escolher_jogada_antecipada(jogo, pesos)
+        jogo.jogar_peca(*(acao or (jogo.x, 0)))
+        pecas += 1
+    print(f"{pecas} peças, {diferentes} escolhas diferentes com prazo folgado")
+    correto = correto and diferentes == 0
+    
+    # Com o prazo já vencido, ainda sai uma jogada válida (a antecipada fica com a de um nível)
+    jogo = Tetris(semente=9)
+    vencido = Prazo(-1)
+    acao = escolher_jogada(jogo, pesos, prazo=vencido)
+    validas = {(x, o.rotacoes) for o in jogo.orientacoes_distintas()
+               for x in range(LARGURA - o.largura + 1) if not jogo.colide_orientacao(x, 0, o)}
+    antecipada = escolher_jogada_antecipada(jogo, pesos, prazo=Prazo(-1))
+    print(f"Prazo vencido: simples {acao}, antecipada {antecipada}")
+    correto = correto and acao in validas and antecipada == escolher_jogada_lote(jogo, pesos) and vencido.atingido
+    
+    # Só contam as decisões em que a busca parou no prazo: a "lote" nunca para
+    apertada = BuscaComPrazo(escolher_jogada, prazo=0.0)
+    folgada = BuscaComPrazo(escolher_jogada, prazo=60.0)
+    lote = BuscaComPrazo(escolher_jogada_lote, prazo=0.0)
+    for _ in range(5):
+        apertada(jogo, pesos)
+        folgada(jogo, pesos)
+        lote(jogo, pesos)
+    print(f"Prazo 0: {apertada.resumo()}")
+    print(f"Prazo 60 s: {folgada.resumo()}")
+    print(f"Lote com prazo 0: {lote.resumo()}")
+    correto = (correto and apertada.estouros == apertada.decisoes == 5
+               and folgada.estouros == 0 and folgada.decisoes == 5
+               and lote.estouros == 0 and lote.decisoes == 5)
+    
+    # O agente da tela usa o prazo e chega aos mesmos estados que joga
+    with AgenteAssincrono(pesos, semente=3, busca="antecipada", prazo=0.001) as agente:
+        jogo = Tetris(semente=3)
+        for _ in range(300):
+            if jogo.game_over or not agente.avancar(jogo, espera=5):
+                break
+    print(f"Agente: {agente.escolher_jogada.resumo()}, {jogo.pecas_colocadas} peças")
+    correto = correto and agente.escolher_jogada.decisoes >= 300 and jogo.pecas_colocadas > 0
+    
+    if correto:
+        print("SUCESSO: Buscas com prazo corretas!")
+    else:
+        print("ERRO: Buscas com prazo incorretas!")
+    
+    return correto
+
+def teste_colocar_desfazer():
+    """Testa coloca()/desfaz() no próprio tabuleiro e a simulação sem cópia"""
+    print("\n=== TESTE: COLOCAR E DESFAZER ===")
+    
+    pesos = np.array([3.0, 4.0, 1.0, -0.5])
+    correto = True
+    
+    for motor in ["lista", "bitboard"]:
+        jogo = criar_jogo(motor, semente=6)
+        divergencias = testadas = 0
+        for _ in range(80):
+            if jogo.game_over:
+                break
+            _, jogadas = jogo.avaliar_jogadas()
+            antes = (jogo.clonar_tabuleiro(), jogo.matriz_ocupacao().tolist(), jogo.alturas[:], jogo.hash)
+            for x, rotacoes in jogadas[::3]:
+                # A simulação escreve no tabuleiro e apaga, com o mesmo resultado da cópia
+                orientacao = jogo.orientacao(rotacoes)
+                y = max(jogo.linha_de_queda(x, orientacao), 0)
+                esperado = jogo.heuristica(tabuleiro_simulado(jogo, orientacao, x, y, mascaras=motor == "bitboard"))
+                divergencias += jogo.simula_jogada(x, rotacoes) != esperado
+                
+                # Colocação reversível: mesmo tabuleiro que o jogo depois da jogada
+                depois = jogo_apos(jogo, x, rotacoes)
+                removidas = jogo.coloca(x, rotacoes)
+                divergencias += (jogo.matriz_ocupacao().tolist() != depois.matriz_ocupacao().tolist()
+                                 or jogo.alturas != depois.alturas or jogo.hash != depois.hash
+                                 or removidas != depois.linhas_removidas - jogo.linhas_removidas)
+                
+                # Duas jogadas empilhadas e desfeitas na ordem inversa
+                segunda = escolher_jogada_lote(jogo, pesos)
+                if segunda:
+                    jogo.coloca(*segunda)
+                    jogo.desfaz()
+                jogo.desfaz()
+                depois_desfazer = (jogo.clonar_tabuleiro(), jogo.matriz_ocupacao().tolist(),
+                                   jogo.alturas[:], jogo.hash)
+                divergencias += depois_desfazer != antes
+                testadas += 1
+            jogo.jogar_peca(*(escolher_jogada_lote(jogo, pesos) or (jogo.x, 0)))
+        print(f"Motor {motor}: {testadas} jogadas colocadas e desfeitas, "
+              f"{jogo.linhas_removidas} linhas no jogo, {divergencias} divergências")
+        correto = correto and divergencias == 0 and testadas > 0 and jogo.linhas_removidas > 0
+    
+    if correto:
+        print("SUCESSO: Colocar e desfazer restauram o jogo exatamente!")
+    else:
+        print("ERRO: Colocar ou desfazer alteram o jogo!")
+    
+    return correto
+
 def main():
     """Executa todos os testes"""
     print("="*60)
@@ -235,7 +1182,31 @@ def main():
         teste_tetris_completo,
         teste_cenario_complexo,
         teste_nivel_diferente,
-        verificar_estrutura_tabuleiro
+        verificar_estrutura_tabuleiro,
+        teste_motor_bitboard,
+        teste_perfil_alturas,
+        teste_caracteristicas,
+        teste_avaliacao_lote,
+        teste_fitness_em_lote,
+        teste_geradores_pecas,
+        teste_corrida,
+        teste_avaliador_paralelo,
+        teste_cache_fitness,
+        teste_fila_distribuida,
+        teste_checkpoint,
+        teste_checkpoint_concluido,
+        teste_historico,
+        teste_avaliar_pesos,
+        teste_corpus_benchmark,
+        teste_instrumentacao,
+        teste_perfil_agregado,
+        teste_desenho_incremental,
+        teste_agente_assincrono,
+        teste_rastros,
+        teste_transposicao,
+        teste_busca_antecipada,
+        teste_busca_com_prazo,
+        teste_colocar_desfazer
     ]
     
     resultados = []
@@ -259,7 +1230,31 @@ def main():
         "Tetris (4 linhas)",
         "Linhas não consecutivas",
         "Nível diferente",
-        "Estrutura do tabuleiro"
+        "Estrutura do tabuleiro",
+        "Motor bitboard",
+        "Perfil de alturas",
+        "Características",
+        "Avaliação em lote",
+        "Fitness em lote",
+        "Geradores de peças",
+        "Corrida",
+        "Avaliador paralelo",
+        "Cache de fitness",
+        "Fila distribuída",
+        "Checkpoint",
+        "Checkpoint concluído",
+        "Histórico",
+        "Avaliação sem interface",
+        "Corpus do benchmark",
+        "Instrumentação",
+        "Perfil agregado",
+        "Desenho incremental",
+        "Agente assíncrono",
+        "Rastros de partidas",
+        "Cache de transposição",
+        "Busca antecipada",
+        "Busca com prazo",
+        "Colocar e desfazer"
     ]
     
     for i, (nome, resultado) in enumerate(zip(nomes_testes, resultados)):
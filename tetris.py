@@ -1,22 +1,94 @@
-import random
 import numpy as np
-from config import LARGURA, ALTURA, PECAS
+from config import LARGURA, ALTURA, MOTOR
+from pecas import chave_peca, orientacoes_de, criar_gerador
+import transposicao
+from transposicao import ZOBRIST, hash_tabuleiro, hash_jogada
+from caracteristicas import (
+    extrair_caracteristicas, extrair_caracteristicas_lote, penalidade,
+    NOMES_BASICOS, NOMES_CARACTERISTICAS
+)
+
+
+# Sistema de pontuação do Tetris original
+# 1 linha = 40 * nível, 2 linhas = 100 * nível, 3 linhas = 300 * nível, 4 linhas (Tetris) = 1200 * nível
+PONTOS_LINHA = [0, 40, 100, 300, 1200]  # 0, 1, 2, 3, 4 linhas
+
+# Arrays NumPy de cada orientação, criados sob demanda: para cada x válido,
+# as colunas cobertas pela peça (janelas) e as colunas de cada célula
+_ARRAYS_ORIENTACAO = {}
+
+
+def arrays_orientacao(orientacao):
+    """Retorna (xs, base, janelas, linhas das células, colunas das células) da orientação"""
+    arrays = _ARRAYS_ORIENTACAO.get(orientacao.chave)
+    if arrays is None:
+        xs = np.arange(LARGURA - orientacao.largura + 1)
+        dy, dx = np.array(orientacao.celulas).T
+        arrays = _ARRAYS_ORIENTACAO[orientacao.chave] = (
+            xs, np.array(orientacao.base), xs[:, None] + np.arange(orientacao.largura),
+            dy, xs[:, None] + dx
+        )
+    return arrays
 
 
 class Tetris:
-    def __init__(self):
+    def __init__(self, semente=None, gerador=None):
+        # Cada jogo tem sua própria fonte de peças (ver pecas.criar_gerador)
+        self.semente = semente
+        self.gerador = gerador or criar_gerador(semente)
         self.tabuleiro = [[0 for _ in range(LARGURA)] for _ in range(ALTURA)]
+        # Perfil (skyline): altura de cada coluna contada a partir do fundo
+        self.alturas = [0] * LARGURA
+        # Hash de Zobrist do tabuleiro, atualizado a cada peça (ver transposicao.py)
+        self.hash = 0
+        # Colocações feitas pela busca que ainda serão desfeitas (ver coloca)
+        self._desfazer = []
         self.peca_atual = self.nova_peca()
+        # Próxima peça, já visível (usada pela busca "antecipada" do agente)
+        self.proxima_peca = self.nova_peca()
         self.x = LARGURA // 2 - len(self.peca_atual[0]) // 2
         self.y = 0
         self.pontos = 0
         self.game_over = False
         self.linhas_removidas = 0
+        self.pecas_colocadas = 0
         self.nivel = 1
 
+    @property
+    def hash(self):
+        """Hash de Zobrist do tabuleiro; depois de remover linhas, só é recalculado quando pedido"""
+        if self._hash is None:
+            self._hash = self._calcula_hash()
+        return self._hash
+
+    @hash.setter
+    def hash(self, valor):
+        self._hash = valor
+
+    def _calcula_hash(self):
+        return hash_tabuleiro(self.tabuleiro)
+
+    @property
+    def peca_atual(self):
+        return self._peca_atual
+
+    @peca_atual.setter
+    def peca_atual(self, peca):
+        # Guarda junto as orientações pré-calculadas da peça (ver pecas.py)
+        self._peca_atual = peca
+        self._orientacoes, self._distintas = orientacoes_de(chave_peca(peca))
+
+    def orientacao(self, rotacoes):
+        """Orientação da peça atual após `rotacoes` rotações horárias"""
+        return self._orientacoes[rotacoes % 4]
+
+    def orientacoes_distintas(self):
+        """Orientações diferentes da peça atual (sem repetir rotações equivalentes)"""
+        return self._distintas
+
     def nova_peca(self):
         """Gera uma nova peça aleatória"""
-        return random.choice(PECAS)
+        return self.gerador.proxima()
 
     def colide(self, px, py, peca):
         """Verifica se a peça colide com o tabuleiro ou bordas"""
@@ -30,23 +102,63 @@ class Tetris:
                         return True
         return False
 
+    def colide_orientacao(self, px, py, orientacao):
+        """Verifica colisão de uma orientação pré-calculada"""
+        return self.colide(px, py, orientacao.peca)
+
     def fixa_peca(self):
         """Fixa a peça atual no tabuleiro"""
+        self._assenta_peca()
+        self._entra_peca(self.proxima_peca)
+        self.proxima_peca = self.nova_peca()
+
+    def _assenta_peca(self):
+        """Grava a peça atual no tabuleiro e remove as linhas completadas"""
+        self._grava_peca()
+        self.pecas_colocadas += 1
+        self.remove_linhas()
+
+    def _entra_peca(self, peca):
+        """Põe `peca` no topo como peça atual; se ela já colide, o jogo acaba"""
+        self.peca_atual = peca
+        self.x = LARGURA // 2 - len(self.peca_atual[0]) // 2
+        self.y = 0
+        
+        if self.colide(self.x, self.y, self.peca_atual):
+            self.game_over = True
+
+    def colide_na_entrada(self, peca):
+        """Se `peca` já colide ao entrar no topo (o jogo acabaria)"""
+        return self.colide(LARGURA // 2 - len(peca[0]) // 2, 0, peca)
+
+    def _grava_peca(self):
+        """Escreve as células da peça atual no tabuleiro"""
         for i, linha in enumerate(self.peca_atual):
             for j, val in enumerate(linha):
                 if val:
                     y = self.y + i
                     x = self.x + j
                     if 0 <= y < ALTURA and 0 <= x < LARGURA:
+                        if not self.tabuleiro[y][x] and self._hash is not None:
+                            self._hash ^= ZOBRIST[y][x]
                         self.tabuleiro[y][x] = val
-        
-        self.remove_linhas()
-        self.peca_atual = self.nova_peca()
-        self.x = LARGURA // 2 - len(self.peca_atual[0]) // 2
-        self.y = 0
-        
-        if self.colide(self.x, self.y, self.peca_atual):
-            self.game_over = True
+
+        # Atualiza o perfil só nas colunas da peça
+        for j, topo in enumerate(self.orientacao(0).topo):
+            x = self.x + j
+            if 0 <= x < LARGURA:
+                self.alturas[x] = max(self.alturas[x], ALTURA - max(self.y + topo, 0))
+
+    def carregar_tabuleiro(self, tabuleiro):
+        """Substitui o tabuleiro (lista de linhas) e recalcula o estado derivado dele"""
+        self.tabuleiro = [list(linha) for linha in tabuleiro]
+        self.recalcula_alturas()
+
+    def recalcula_alturas(self):
+        """Recalcula o perfil de alturas e invalida o hash (após edições diretas)"""
+        for x in range(LARGURA):
+            self.alturas[x] = next((ALTURA - y for y in range(ALTURA) if self.tabuleiro[y][x]), 0)
+        self.hash = None
 
     def remove_linhas(self):
         """Remove linhas completas e atualiza pontuação"""
@@ -61,15 +173,22 @@ class Tetris:
         # Remove as linhas completas (de baixo para cima para não afetar os índices)
         for i in reversed(linhas_completas):
             del self.tabuleiro[i]
-            self.tabuleiro.insert(0, [0 for _ in range(LARGURA)])
             linhas_removidas += 1
+
+        # Só depois repõe linhas vazias no topo
+        for _ in range(linhas_removidas):
+            self.tabuleiro.insert(0, [0 for _ in range(LARGURA)])
+
+        if linhas_removidas > 0:
+            self.recalcula_alturas()
         
+        self._pontua(linhas_removidas)
+
+    def _pontua(self, linhas_removidas):
+        """Atualiza pontuação, linhas e nível após remover linhas"""
         if linhas_removidas > 0:
             self.linhas_removidas += linhas_removidas
-            # Sistema de pontuação do Tetris original
-            # 1 linha = 40 * nível, 2 linhas = 100 * nível, 3 linhas = 300 * nível, 4 linhas (Tetris) = 1200 * nível
-            pontos_linha = [0, 40, 100, 300, 1200]  # 0, 1, 2, 3, 4 linhas
-            self.pontos += pontos_linha[min(linhas_removidas, 4)] * self.nivel
+            self.pontos += PONTOS_LINHA[min(linhas_removidas, 4)] * self.nivel
             self.nivel = (self.linhas_removidas // 10) + 1
 
     def passo(self):
@@ -91,7 +210,7 @@ class Tetris:
 
     def rotacionar(self):
         """Rotaciona a peça no sentido horário"""
-        peca_rotacionada = [list(row) for row in zip(*self.peca_atual[::-1])]
+        peca_rotacionada = self.orientacao(1).peca
         if not self.colide(self.x, self.y, peca_rotacionada):
             self.peca_atual = peca_rotacionada
 
@@ -101,59 +220,195 @@ class Tetris:
             self.y += 1
         self.fixa_peca()
 
+    def jogar_peca(self, x, rotacoes):
+        """Coloca a peça atual direto na linha de queda da coluna x (hard drop) e a fixa"""
+        orientacao = self.orientacao(rotacoes)
+        self.peca_atual = orientacao.peca
+        self.x = x
+        self.y = max(self.linha_de_queda(x, orientacao), 0)
+        self.fixa_peca()
+
     # ---------- Funções para IA ----------
     def clonar_tabuleiro(self):
         """Cria uma cópia do tabuleiro atual"""
         return [linha[:] for linha in self.tabuleiro]
 
-    def simula_jogada(self, px, rotacoes):
+    def coloca(self, px, rotacoes, limpar=True):
+        """Solta a peça atual em (px, rotações) no próprio tabuleiro, de forma reversível.
+
+        Atualiza só tabuleiro, perfil de alturas e hash (peça atual, pontos e
+        gerador não mudam); com `limpar`, remove as linhas completadas. As
+        células escritas e as linhas removidas ficam numa pilha e desfaz()
+        volta exatamente ao estado anterior, então a busca pode empilhar várias
+        jogadas sem copiar o tabuleiro. Retorna quantas linhas foram removidas.
+        """
+        orientacao = self.orientacao(rotacoes)
+        y = max(self.linha_de_queda(px, orientacao), 0)
+        alturas, h = self.alturas[:], self.hash
+        celulas = self._escreve_orientacao(orientacao, px, y)
+        self.hash = hash_jogada(h, orientacao, px, y)
+        for j, topo in enumerate(orientacao.topo):
+            if ALTURA - y - topo > self.alturas[px + j]:
+                self.alturas[px + j] = ALTURA - y - topo
+        removidas = self._tira_linhas_completas() if limpar else None
+        self._desfazer.append((celulas, removidas, alturas, h))
+        return len(removidas[0]) if removidas else 0
+
+    def desfaz(self):
+        """Desfaz a última colocação de coloca()"""
+        celulas, removidas, alturas, h = self._desfazer.pop()
+        if removidas:
+            self._repoe_linhas(removidas)
+        self._apaga_celulas(celulas)
+        self.alturas[:] = alturas
+        self.hash = h
+
+    def tabuleiro_avaliado(self):
+        """O tabuleiro atual, no formato que heuristica recebe (sem cópia)"""
+        return self.tabuleiro
+
+    def _escreve_orientacao(self, orientacao, px, y):
+        """Escreve a orientação em (px, y) e retorna as células com os valores antigos"""
+        celulas = []
+        for dy, dx in orientacao.celulas:
+            if y + dy < ALTURA:
+                linha = self.tabuleiro[y + dy]
+                celulas.append((y + dy, px + dx, linha[px + dx]))
+                linha[px + dx] = orientacao.peca[dy][dx]
+        return celulas
+
+    def _apaga_celulas(self, celulas):
+        for y, x, valor in celulas:
+            self.tabuleiro[y][x] = valor
+
+    def _tira_linhas_completas(self):
+        """Remove as linhas completas sem pontuar; retorna (índices, linhas) para _repoe_linhas"""
+        completas = [i for i, linha in enumerate(self.tabuleiro) if all(linha)]
+        if not completas:
+            return None
+        linhas = [self.tabuleiro[i] for i in completas]
+        for i in reversed(completas):
+            del self.tabuleiro[i]
+        self.tabuleiro[:0] = [[0] * LARGURA for _ in completas]
+        self.recalcula_alturas()
+        return completas, linhas
+
+    def _repoe_linhas(self, removidas):
+        completas, linhas = removidas
+        del self.tabuleiro[:len(completas)]
+        for i, linha in zip(completas, linhas):
+            self.tabuleiro.insert(i, linha)
+
+    def linha_de_queda(self, px, orientacao):
+        """Linha onde a orientação para ao cair na coluna px, calculada pelo perfil.
+
+        Usa só a altura de cada coluna e a célula mais baixa da peça nela,
+        então custa O(largura da peça). Um valor negativo indica que a peça
+        não cabe nem na linha 0.
+        """
+        alturas = self.alturas
+        return min(ALTURA - 1 - alturas[px + j] - base for j, base in enumerate(orientacao.base))
+
+    def simula_jogada(self, px, rotacoes, extras=False):
         """Simula uma jogada e retorna métricas de avaliação"""
-        peca = self.peca_atual
-        for _ in range(rotacoes):
-            peca = [list(row) for row in zip(*peca[::-1])]
+        orientacao = self.orientacao(rotacoes)
 
         # Checa se a peça rotacionada cabe na posição
-        largura_peca = len(peca[0])
-        if px < 0 or px + largura_peca > LARGURA:
-            return -999, 99, 99, 99  # penalidade alta
+        if px < 0 or px + orientacao.largura > LARGURA:
+            return penalidade(extras)
 
         # Simula queda
-        y = 0
-        while not self.colide(px, y + 1, peca):
-            y += 1
+        y = max(self.linha_de_queda(px, orientacao), 0)
+        if not transposicao.ATIVO:
+            return self._avalia_colocada(orientacao, px, y, extras)
 
-        # Cria cópia e fixa
-        tab = self.clonar_tabuleiro()
-        for i, linha in enumerate(peca):
-            for j, val in enumerate(linha):
-                if val and y + i < ALTURA and px + j < LARGURA:
-                    tab[y + i][px + j] = val
+        # Tabuleiro resultante já avaliado (neste jogo ou em outro do processo)?
+        chave = (hash_jogada(self.hash, orientacao, px, y), extras)
+        resultado = transposicao.CACHE.obter(chave)
+        if resultado is None:
+            resultado = self._avalia_colocada(orientacao, px, y, extras)
+            transposicao.CACHE.guardar(chave, resultado)
+        return resultado
 
-        # Avalia tabuleiro
-        return self.heuristica(tab)
+    def _avalia_colocada(self, orientacao, px, y, extras):
+        """Características com a orientação escrita em (px, y) no próprio tabuleiro, depois
+        apagada. A heurística só lê as células, então perfil e hash nem são atualizados."""
+        celulas = self._escreve_orientacao(orientacao, px, y)
+        try:
+            return self.heuristica(self.tabuleiro_avaliado(), extras)
+        finally:
+            self._apaga_celulas(celulas)
 
-    def heuristica(self, tab):
-        """Calcula métricas heurísticas para avaliação do tabuleiro"""
-        # Linhas completas
-        linhas = sum(1 for linha in tab if all(linha))
-        
-        # Altura máxima
-        altura = max((y for y, linha in enumerate(tab) if any(linha)), default=0)
-        
-        # Número de buracos
-        buracos = sum(
-            1 for x in range(LARGURA)
-            for y in range(ALTURA)
-            if tab[y][x] == 0 and any(tab[k][x] for k in range(y))
-        )
-        
-        # Uniformidade (variação de altura entre colunas)
-        uniformidade = sum(abs(sum(tab[y][x] != 0 for y in range(ALTURA)) -
-                               sum(tab[y][x + 1] != 0 for y in range(ALTURA)))
-                           for x in range(LARGURA - 1))
-        
-        return linhas, altura, buracos, uniformidade
+    def heuristica(self, tab, extras=False):
+        """Calcula métricas heurísticas para avaliação do tabuleiro (ver caracteristicas.py)"""
+        return extrair_caracteristicas(tab, extras)
+
+    def heuristica_lote(self, tabs, extras=False):
+        """Métricas de um lote de tabuleiros booleanos (n x ALTURA x LARGURA), uma linha por tabuleiro"""
+        return extrair_caracteristicas_lote(tabs, extras)
+
+    def matriz_ocupacao(self):
+        """Tabuleiro como matriz booleana do NumPy (ALTURA x LARGURA)"""
+        return np.array(self.tabuleiro, dtype=bool)
+
+    def avaliar_jogadas(self, extras=False):
+        """Avalia de uma vez todas as jogadas da peça atual usando NumPy.
+
+        Monta um lote com o tabuleiro resultante de cada jogada e extrai as
+        características de todos juntos. Retorna (caracteristicas, jogadas):
+        uma matriz (n_jogadas x n_características) e a lista de (x, rotações)
+        correspondente, na mesma ordem da busca de agente.escolher_jogada.
+        Só entram jogadas em que a peça cabe na linha 0.
+
+        O resultado depende só do tabuleiro e da peça, e fica no cache de
+        transposição (compartilhado, não deve ser alterado por quem recebe).
+        """
+        if not transposicao.ATIVO:
+            return self._avaliar_jogadas(extras)
+        chave = ("lote", self.hash, self._orientacoes[0].chave, extras)
+        resultado = transposicao.CACHE.obter(chave)
+        if resultado is None:
+            resultado = self._avaliar_jogadas(extras)
+            transposicao.CACHE.guardar(chave, resultado)
+        return resultado
+
+    def _avaliar_jogadas(self, extras):
+        ocupacao = self.matriz_ocupacao()
+        alturas = np.array(self.alturas)
+        linhas_celulas, colunas_celulas, jogadas = [], [], []
+
+        for orientacao in self.orientacoes_distintas():
+            xs, base, janelas, dy, colunas = arrays_orientacao(orientacao)
+
+            # Linha de queda de cada coluna pelo perfil (como em linha_de_queda)
+            queda = (ALTURA - 1 - base - alturas[janelas]).min(axis=1)
+            cabe = ~ocupacao[dy, colunas].any(axis=1)
+
+            xs, queda = xs[cabe], np.maximum(queda[cabe], 0)
+            linhas_celulas.append(queda[:, None] + dy)
+            colunas_celulas.append(colunas[cabe])
+            jogadas.extend((x, orientacao.rotacoes) for x in xs.tolist())
+
+        n_caracteristicas = len(NOMES_CARACTERISTICAS if extras else NOMES_BASICOS)
+        if not jogadas:
+            return np.zeros((0, n_caracteristicas), dtype=int), jogadas
+
+        tabs = np.repeat(ocupacao[None], len(jogadas), axis=0)
+        tabs[np.arange(len(jogadas))[:, None],
+             np.concatenate(linhas_celulas), np.concatenate(colunas_celulas)] = True
+        return self.heuristica_lote(tabs, extras), jogadas
 
     def reset(self):
-        """Reinicia o jogo"""
-        self.__init__()
+        """Reinicia o jogo (com a mesma semente, se houver)"""
+        self.__init__(self.semente)
+
+
+def criar_jogo(motor=None, semente=None, gerador=None):
+    """Cria um jogo com o motor escolhido ("lista" ou "bitboard"; padrão: config.MOTOR)"""
+    motor = motor or MOTOR
+    if motor == "lista":
+        return Tetris(semente, gerador)
+    if motor == "bitboard":
+        from tetris_bitboard import TetrisBitboard
+        return TetrisBitboard(semente, gerador)
+    raise ValueError(f"Motor desconhecido: {motor}")
@@ -0,0 +1,249 @@
+from itertools import compress
+from operator import add
+import numpy as np
+from config import LARGURA, ALTURA
+from tetris import Tetris
+from pecas import chave_peca, orientacoes_de
+from caracteristicas import profundidade_pocos
+from transposicao import ZOBRIST, hash_mascaras
+
+# Cada linha do tabuleiro é um inteiro: o bit x ligado indica a coluna x ocupada
+LINHA_CHEIA = (1 << LARGURA) - 1
+
+# Tabelas indexadas pela máscara de uma linha (2^LARGURA entradas)
+BITS_LIGADOS = [bin(m).count("1") for m in range(1 << LARGURA)]
+COLUNAS_OCUPADAS = [tuple((m >> x) & 1 for x in range(LARGURA)) for m in range(1 << LARGURA)]
+# Bit de cada coluna, para montar a máscara de uma linha com compress
+BIT_COLUNA = [1 << x for x in range(LARGURA)]
+
+# Linha com as duas paredes: bit 0 é a parede esquerda e bit LARGURA + 1 a direita
+_PAREDES = 1 | (1 << (LARGURA + 1))
+
+
+def extrair_caracteristicas_mascaras(tab, extras=False):
+    """Mesmas características de caracteristicas.extrair_caracteristicas, em uma passada pelas máscaras"""
+    linhas = 0
+    altura = 0
+    buracos = 0
+    profundidade = 0
+    transicoes_linha = 0
+    transicoes_coluna = 0
+    acima = 0
+    anterior = 0
+    alturas = [0] * LARGURA
+    contagem = [0] * LARGURA
+
+    for y, mascara in enumerate(tab):
+        # Buracos: células vazias com alguma célula ocupada acima na coluna
+        vazias_cobertas = acima & ~mascara & LINHA_CHEIA
+        if vazias_cobertas:
+            buracos += BITS_LIGADOS[vazias_cobertas]
+            if extras:
+                profundidade += sum(c for c, b in zip(contagem, COLUNAS_OCUPADAS[vazias_cobertas]) if b)
+        if mascara:
+            altura = y
+            if mascara == LINHA_CHEIA:
+                linhas += 1
+            contagem = list(map(add, contagem, COLUNAS_OCUPADAS[mascara]))
+            if extras:
+                novas = mascara & ~acima
+                for x in range(LARGURA):
+                    if novas >> x & 1:
+                        alturas[x] = ALTURA - y
+        if extras:
+            com_paredes = (mascara << 1) | _PAREDES
+            trocas = com_paredes ^ (com_paredes >> 1)  # bit k: posição k difere da k + 1
+            transicoes_linha += BITS_LIGADOS[trocas & LINHA_CHEIA] + (trocas >> LARGURA & 1)
+            transicoes_coluna += BITS_LIGADOS[anterior ^ mascara]
+            anterior = mascara
+        acima |= mascara
+
+    uniformidade = sum(abs(a - b) for a, b in zip(contagem, contagem[1:]))
+
+    if not extras:
+        return linhas, altura, buracos, uniformidade
+
+    # Chão conta como ocupado
+    transicoes_coluna += BITS_LIGADOS[anterior ^ LINHA_CHEIA]
+    return (linhas, altura, buracos, uniformidade,
+            sum(alturas), profundidade_pocos(alturas),
+            transicoes_linha, transicoes_coluna, profundidade)
+
+
+class TetrisBitboard(Tetris):
+    """Motor do Tetris com cada linha do tabuleiro guardada como máscara de bits.
+
+    Tem a mesma interface pública de `Tetris`. O `tabuleiro` com as cores
+    continua sendo mantido para a visualização, mas colisão, fixação e
+    remoção de linhas usam apenas `self.linhas`; alterações feitas direto
+    em `tabuleiro` não são vistas pelo motor.
+
+    Colisão, remoção de linhas e simula_jogada ficam mais rápidas (ver
+    benchmark.py); com a busca "lote" a avaliação em NumPy é a mesma dos
+    dois motores, então o tempo de uma partida quase não muda.
+    """
+
+    def __init__(self, semente=None, gerador=None):
+        self.linhas = [0] * ALTURA
+        super().__init__(semente, gerador)
+
+    def colide(self, px, py, peca):
+        """Verifica se a peça colide com o tabuleiro ou bordas"""
+        return self.colide_orientacao(px, py, self._orientacao_da_peca(peca))
+
+    def _orientacao_da_peca(self, peca):
+        """Orientação de `peca`; a peça atual e suas rotações são achadas sem montar a chave"""
+        if peca is self._peca_atual:
+            return self._orientacoes[0]
+        for orientacao in self._distintas:
+            if peca is orientacao.peca:
+                return orientacao
+        return orientacoes_de(chave_peca(peca))[0][0]
+
+    def colide_orientacao(self, px, py, orientacao):
+        """Verifica colisão usando as máscaras pré-calculadas da orientação"""
+        # As peças não têm linhas nem colunas vazias, então basta checar a caixa
+        if px < 0 or px + orientacao.largura > LARGURA or py + orientacao.altura > ALTURA:
+            return True
+        linhas = self.linhas
+        for i, mascara in enumerate(orientacao.mascaras):
+            y = py + i
+            if y >= 0 and linhas[y] & (mascara << px):
+                return True
+        return False
+
+    def _grava_peca(self):
+        """Escreve a peça atual nas máscaras, nas cores e no perfil, célula a célula"""
+        orientacao = self._orientacoes[0]
+        peca, px, py = self._peca_atual, self.x, self.y
+        linhas, tabuleiro = self.linhas, self.tabuleiro
+        for i, j in orientacao.celulas:
+            y, x = py + i, px + j
+            if 0 <= y < ALTURA and 0 <= x < LARGURA:
+                bit = 1 << x
+                if not linhas[y] & bit:
+                    linhas[y] |= bit
+                    if self._hash is not None:
+                        self._hash ^= ZOBRIST[y][x]
+                tabuleiro[y][x] = peca[i][j]
+
+        alturas = self.alturas
+        for j, topo in enumerate(orientacao.topo):
+            x = px + j
+            if 0 <= x < LARGURA and ALTURA - max(py + topo, 0) > alturas[x]:
+                alturas[x] = ALTURA - max(py + topo, 0)
+
+    def remove_linhas(self):
+        """Remove linhas completas e atualiza pontuação"""
+        completas = self._linhas_completas()
+        if completas:
+            for i in reversed(completas):
+                del self.tabuleiro[i]
+            self.tabuleiro[:0] = [[0] * LARGURA for _ in completas]
+            self._tira_mascaras(completas)
+
+        self._pontua(len(completas))
+
+    def _linhas_completas(self):
+        """Índices das linhas completas (em geral nenhuma: `in` descarta o caso sem varrer em Python)"""
+        if LINHA_CHEIA not in self.linhas:
+            return []
+        return [i for i, mascara in enumerate(self.linhas) if mascara == LINHA_CHEIA]
+
+    def _tira_mascaras(self, completas):
+        """Remove as linhas `completas` das máscaras e ajusta o perfil só onde é preciso.
+
+        Toda linha completa fica abaixo do topo de cada coluna, então a coluna
+        baixa len(completas), a não ser que o topo dela estivesse numa linha
+        completa: só essas colunas são procuradas de novo.
+        """
+        linhas, alturas = self.linhas, self.alturas
+        n = len(completas)
+        cheias = set(completas)
+        reprocurar = 0
+        inicio = ALTURA
+        for x in range(LARGURA):
+            topo = ALTURA - alturas[x]
+            if topo in cheias:
+                reprocurar |= 1 << x
+                inicio = min(inicio, topo)
+            else:
+                alturas[x] -= n
+        for i in reversed(completas):
+            del linhas[i]
+        linhas[:0] = [0] * n
+        # Acima do topo antigo essas colunas estavam vazias, e nada desce para cima dele
+        if reprocurar:
+            self._procura_topos(reprocurar, inicio)
+        self.hash = None
+
+    def _procura_topos(self, colunas, inicio=0):
+        """Altura de cada coluna marcada na máscara `colunas`, descendo a partir da linha `inicio`"""
+        alturas = self.alturas
+        for y in range(inicio, ALTURA):
+            novas = self.linhas[y] & colunas
+            if novas:
+                colunas ^= novas
+                while novas:
+                    bit = novas & -novas
+                    alturas[bit.bit_length() - 1] = ALTURA - y
+                    novas ^= bit
+                if not colunas:
+                    return
+        while colunas:
+            bit = colunas & -colunas
+            alturas[bit.bit_length() - 1] = 0
+            colunas ^= bit
+
+    def carregar_tabuleiro(self, tabuleiro):
+        """Substitui o tabuleiro e monta as máscaras das linhas a partir dele"""
+        self.linhas = [sum(compress(BIT_COLUNA, linha)) for linha in tabuleiro]
+        super().carregar_tabuleiro(tabuleiro)
+
+    def recalcula_alturas(self):
+        """Recalcula o perfil de alturas a partir das máscaras das linhas e invalida o hash"""
+        self._procura_topos(LINHA_CHEIA)
+        self.hash = None
+
+    def _calcula_hash(self):
+        return hash_mascaras(self.linhas)
+
+    # ---------- Funções para IA ----------
+    def matriz_ocupacao(self):
+        """Tabuleiro como matriz booleana do NumPy (ALTURA x LARGURA)"""
+        return np.array([COLUNAS_OCUPADAS[mascara] for mascara in self.linhas], dtype=bool)
+
+    # Durante coloca()/desfaz() só as máscaras mudam; as cores em `tabuleiro`
+    # ficam como estavam (a busca não as lê)
+    def tabuleiro_avaliado(self):
+        return self.linhas
+
+    def _escreve_orientacao(self, orientacao, px, y):
+        celulas = []
+        linhas = self.linhas
+        for i, mascara in enumerate(orientacao.mascaras):
+            if y + i < ALTURA:
+                celulas.append((y + i, linhas[y + i]))
+                linhas[y + i] |= mascara << px
+        return celulas
+
+    def _apaga_celulas(self, celulas):
+        for y, mascara in celulas:
+            self.linhas[y] = mascara
+
+    def _tira_linhas_completas(self):
+        completas = self._linhas_completas()
+        if not completas:
+            return None
+        self._tira_mascaras(completas)
+        return completas, None
+
+    def _repoe_linhas(self, removidas):
+        completas, _ = removidas
+        del self.linhas[:len(completas)]
+        for i in completas:
+            self.linhas.insert(i, LINHA_CHEIA)
+
+    def heuristica(self, tab, extras=False):
+        """Calcula as métricas heurísticas a partir das máscaras das linhas"""
+        return extrair_caracteristicas_mascaras(tab, extras)
@@ -0,0 +1,114 @@
+import random
+from collections import OrderedDict
+
+from config import LARGURA, ALTURA, CACHE_TRANSPOSICAO, CACHE_TRANSPOSICAO_PASSO
+
+# Hash de Zobrist do tabuleiro: XOR dos números das células ocupadas. Só a
+# ocupação entra (as características não dependem da cor), e o tabuleiro
+# vazio tem hash 0. A semente é fixa para o hash ser o mesmo em todo processo.
+_rng = random.Random(0x7E7215)
+ZOBRIST = [[_rng.getrandbits(64) for _ in range(LARGURA)] for _ in range(ALTURA)]
+
+
+def hash_tabuleiro(tabuleiro):
+    """Hash de Zobrist de um tabuleiro (lista de linhas)"""
+    h = 0
+    for numeros, linha in zip(ZOBRIST, tabuleiro):
+        if any(linha):  # a maioria das linhas costuma estar vazia
+            for numero, valor in zip(numeros, linha):
+                if valor:
+                    h ^= numero
+    return h
+
+
+def hash_mascaras(mascaras):
+    """Hash de Zobrist de um tabuleiro dado pelas máscaras das linhas (bit x = coluna x)"""
+    h = 0
+    for numeros, mascara in zip(ZOBRIST, mascaras):
+        x = 0
+        while mascara:
+            if mascara & 1:
+                h ^= numeros[x]
+            mascara >>= 1
+            x += 1
+    return h
+
+
+def hash_jogada(h, orientacao, px, py):
+    """Hash do tabuleiro `h` com a orientação fixada em (px, py), antes de remover linhas"""
+    for dy, dx in orientacao.celulas:
+        if py + dy < ALTURA:
+            h ^= ZOBRIST[py + dy][px + dx]
+    return h
+
+
+class CacheTransposicao:
+    """Características já extraídas, por hash do tabuleiro (LRU, com contadores).
+
+    Guarda características e não pontuações, então serve para qualquer vetor
+    de pesos: indivíduos diferentes e o modo "passo" (a mesma peça buscada de
+    novo a cada linha) reaproveitam o que já foi calculado no processo.
+    """
+
+    def __init__(self, capacidade=CACHE_TRANSPOSICAO):
+        self.capacidade = capacidade
+        self.entradas = OrderedDict()
+        self.acertos = 0
+        self.faltas = 0
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def obter(self, chave):
+        """Valor guardado (ou None), marcando a entrada como usada recentemente"""
+        valor = self.entradas.get(chave)
+        if valor is None:
+            self.faltas += 1
+            return None
+        self.acertos += 1
+        self.entradas.move_to_end(chave)
+        return valor
+
+    def guardar(self, chave, valor):
+        self.entradas[chave] = valor
+        if len(self.entradas) > self.capacidade:
+            self.entradas.popitem(last=False)
+
+    def limpar(self):
+        self.entradas.clear()
+        self.acertos = self.faltas = 0
+
+    def resumo(self):
+        consultas = self.acertos + self.faltas
+        taxa = self.acertos / consultas if consultas else 0.0
+        return f"{len(self)} tabuleiros, {self.acertos} acertos, {self.faltas} faltas ({taxa:.0%})"
+
+
+# Um cache por processo, compartilhado por todos os jogos dele
+CACHE = CacheTransposicao()
+ATIVO = CACHE_TRANSPOSICAO > 0
+# Se ativar() fixou a capacidade (aí o modo "passo" não liga o cache sozinho)
+_FIXADO = False
+
+
+def ativar(capacidade=None):
+    """Recria o cache do processo com outra capacidade (0 desativa; None volta ao padrão da config)"""
+    global CACHE, ATIVO, _FIXADO
+    _FIXADO = capacidade is not None
+    if capacidade is None:
+        capacidade = CACHE_TRANSPOSICAO
+    CACHE = CacheTransposicao(capacidade)
+    ATIVO = capacidade > 0
+
+
+def preparar_modo_passo():
+    """Liga o cache com CACHE_TRANSPOSICAO_PASSO antes de uma partida no modo "passo".
+
+    No modo "queda" cada tabuleiro aparece uma vez e os acertos ficam perto
+    de 0%, então o cache só ocupa memória; no "passo" a mesma peça é buscada
+    de novo a cada linha. Não faz nada se ativar() fixou a capacidade.
+    """
+    global CACHE, ATIVO
+    if not ATIVO and not _FIXADO and CACHE_TRANSPOSICAO_PASSO > 0:
+        CACHE = CacheTransposicao(CACHE_TRANSPOSICAO_PASSO)
+        ATIVO = True
@@ -1,13 +1,26 @@
 import pygame
+import random
 import time
 from config import (
-    LARGURA, ALTURA, TAMANHO_BLOCO, CORES_PECAS, 
-    LARGURA_TELA, ALTURA_TELA, TAMANHO_FONTE, VELOCIDADE_IA
+    ALTURA, TAMANHO_BLOCO, CORES_PECAS, 
+    LARGURA_TELA, ALTURA_TELA, TAMANHO_FONTE, VELOCIDADE_IA,
+    PASSOS_AVANCO_RAPIDO, FPS_TURBO, PRAZO_JOGADA, BUSCA_REPLAY
 )
-from tetris import Tetris
+from tetris import criar_jogo
+from agente import AgenteAssincrono
+from rastros import refazer_jogada
 
 
 class VisualizadorTetris:
+    """Janela do jogo com desenho incremental.
+
+    As peças fixadas ficam em uma superfície de fundo, refeita só nas linhas
+    que mudaram quando uma peça é fixada (jogo.pecas_colocadas muda). A cada
+    quadro, as áreas cobertas no quadro anterior (peça em queda e textos) são
+    restauradas a partir do fundo e só os retângulos alterados vão para a
+    tela em atualizar_tela().
+    """
+
     def __init__(self):
         pygame.init()
         self.tela = pygame.display.set_mode((LARGURA_TELA, ALTURA_TELA))
@@ -16,35 +29,88 @@ class VisualizadorTetris:
         self.fonte = pygame.font.SysFont("Arial", TAMANHO_FONTE)
         self.fonte_grande = pygame.font.SysFont("Arial", TAMANHO_FONTE * 2)
 
+        # Um bloco pré-desenhado por cor (preenchimento + borda branca)
+        self.blocos = {valor: self._criar_bloco(cor) for valor, cor in CORES_PECAS.items()}
+        self.fundo = pygame.Surface((LARGURA_TELA, ALTURA_TELA))
+        self.textos = {}  # posição do texto -> (texto, cor, superfície)
+
+        self._jogo_desenhado = None  # (id do jogo, peças colocadas) do fundo atual
+        self._linhas_desenhadas = [None] * ALTURA
+        self._cobertos = []  # retângulos desenhados sobre o fundo no quadro atual
+        self._sujos = []  # retângulos a enviar para a tela em atualizar_tela()
+        self._redesenhar_tudo = True
+
+    @staticmethod
+    def _criar_bloco(cor):
+        bloco = pygame.Surface((TAMANHO_BLOCO, TAMANHO_BLOCO))
+        bloco.fill(cor)
+        pygame.draw.rect(bloco, (255, 255, 255), bloco.get_rect(), 1)
+        return bloco
+
+    def _bloco(self, valor):
+        if valor not in self.blocos:
+            self.blocos[valor] = self._criar_bloco((255, 255, 255))
+        return self.blocos[valor]
+
+    def _atualizar_fundo(self, jogo):
+        """Redesenha no fundo as linhas do tabuleiro que mudaram; retorna os retângulos delas"""
+        versao = (id(jogo), jogo.pecas_colocadas)
+        if versao == self._jogo_desenhado and not self._redesenhar_tudo:
+            return []
+        self._jogo_desenhado = versao
+
+        alteradas = []
+        for y, linha in enumerate(jogo.tabuleiro):
+            if linha == self._linhas_desenhadas[y] and not self._redesenhar_tudo:
+                continue
+            self._linhas_desenhadas[y] = linha[:]
+            rect = pygame.Rect(0, y * TAMANHO_BLOCO, LARGURA_TELA, TAMANHO_BLOCO)
+            self.fundo.fill((0, 0, 0), rect)  # Fundo preto
+            for x, valor in enumerate(linha):
+                if valor:
+                    self.fundo.blit(self._bloco(valor), (x * TAMANHO_BLOCO, y * TAMANHO_BLOCO))
+            alteradas.append(rect)
+        return alteradas
+
+    def _cobrir(self, superficie, posicao):
+        """Desenha sobre o fundo, guardando a área para restaurar no próximo quadro"""
+        rect = self.tela.blit(superficie, posicao)
+        self._cobertos.append(rect)
+        self._sujos.append(rect)
+        return rect
+
+    def _texto(self, posicao, texto, cor=(255, 255, 255), fonte=None):
+        """Superfície do texto, renderizada de novo só quando o texto da posição muda"""
+        anterior = self.textos.get(posicao)
+        if anterior is None or anterior[0] != texto or anterior[1] != cor:
+            anterior = (texto, cor, (fonte or self.fonte).render(texto, True, cor))
+            self.textos[posicao] = anterior
+        return anterior[2]
+
     def desenhar_tabuleiro(self, jogo):
         """Desenha o tabuleiro do jogo"""
-        self.tela.fill((0, 0, 0))  # Fundo preto
-        
-        # Desenha peças fixadas no tabuleiro
-        for y in range(ALTURA):
-            for x in range(LARGURA):
-                if jogo.tabuleiro[y][x]:
-                    cor = CORES_PECAS.get(jogo.tabuleiro[y][x], (255, 255, 255))
-                    pygame.draw.rect(self.tela, cor, 
-                                   (x * TAMANHO_BLOCO, y * TAMANHO_BLOCO, 
-                                    TAMANHO_BLOCO, TAMANHO_BLOCO))
-                    pygame.draw.rect(self.tela, (255, 255, 255), 
-                                   (x * TAMANHO_BLOCO, y * TAMANHO_BLOCO, 
-                                    TAMANHO_BLOCO, TAMANHO_BLOCO), 1)
+        alteradas = self._atualizar_fundo(jogo)
+        if self._redesenhar_tudo:
+            self.tela.blit(self.fundo, (0, 0))
+            self._sujos = [self.tela.get_rect()]
+            self._redesenhar_tudo = False
+        else:
+            # Apaga o que foi desenhado no quadro anterior e aplica as linhas novas
+            for rect in self._cobertos + alteradas:
+                self.tela.blit(self.fundo, rect, rect)
+            self._sujos = self._cobertos + alteradas
+        self._cobertos = []
 
         # Desenha a peça atual
         for i, linha in enumerate(jogo.peca_atual):
             for j, val in enumerate(linha):
                 if val:
-                    cor = CORES_PECAS.get(val, (255, 255, 255))
-                    pygame.draw.rect(self.tela, cor, 
-                                   ((jogo.x + j) * TAMANHO_BLOCO, 
-                                    (jogo.y + i) * TAMANHO_BLOCO, 
-                                    TAMANHO_BLOCO, TAMANHO_BLOCO))
-                    pygame.draw.rect(self.tela, (255, 255, 255), 
-                                   ((jogo.x + j) * TAMANHO_BLOCO, 
-                                    (jogo.y + i) * TAMANHO_BLOCO, 
-                                    TAMANHO_BLOCO, TAMANHO_BLOCO), 1)
+                    self._cobrir(self._bloco(val), ((jogo.x + j) * TAMANHO_BLOCO, (jogo.y + i) * TAMANHO_BLOCO))
+
+    def atualizar_tela(self):
+        """Envia para a tela só os retângulos alterados desde o último quadro"""
+        pygame.display.update(self._sujos)
+        self._sujos = []
 
     def desenhar_info(self, jogo, modo="IA"):
         """Desenha informações do jogo na tela"""
@@ -66,8 +132,7 @@ class VisualizadorTetris:
             info_textos.extend(controles)
         
         for i, texto in enumerate(info_textos):
-            superficie = self.fonte.render(texto, True, (255, 255, 255))
-            self.tela.blit(superficie, (10, 10 + i * 25))
+            self._cobrir(self._texto(("info", i), texto), (10, 10 + i * 25))
 
     def mostrar_pause(self, jogo, modo="Humano"):
         """Mostra tela de pause"""
@@ -76,6 +141,7 @@ class VisualizadorTetris:
         overlay.set_alpha(128)
         overlay.fill((0, 0, 0))
         self.tela.blit(overlay, (0, 0))
+        self._redesenhar_tudo = True
         
         # Texto principal
         texto_principal = self.fonte_grande.render("PAUSE", True, (255, 255, 0))
@@ -111,6 +177,7 @@ class VisualizadorTetris:
     def mostrar_game_over(self, jogo):
         """Mostra tela de game over"""
         self.tela.fill((0, 0, 0))
+        self._redesenhar_tudo = True
         
         # Texto principal
         texto_principal = self.fonte_grande.render("GAME OVER", True, (255, 0, 0))
@@ -139,6 +206,7 @@ class VisualizadorTetris:
     def mostrar_menu_principal(self):
         """Mostra o menu principal do jogo"""
         self.tela.fill((0, 0, 50))
+        self._redesenhar_tudo = True
         
         # Título
         titulo = self.fonte_grande.render("TETRIS IA", True, (255, 255, 255))
@@ -162,12 +230,92 @@ class VisualizadorTetris:
         pygame.display.update()
 
     def replay_ia(self, pesos):
-        """Mostra a IA jogando com os pesos fornecidos"""
-        jogo = Tetris()
+        """Mostra a IA jogando com os pesos fornecidos.
+
+        A busca roda numa thread (agente.AgenteAssincrono), à frente da tela;
+        aqui só se aplicam as jogadas já prontas. F alterna o avanço rápido
+        (vários passos por quadro) e T o modo turbo (simulação sem limite de
+        velocidade, desenhando só FPS_TURBO quadros por segundo). Cada
+        decisão da busca (BUSCA_REPLAY) tem PRAZO_JOGADA segundos; ao sair, mostra quantas
+        vezes o prazo foi atingido.
+        """
+        semente = random.randrange(2 ** 32)
+        jogo = criar_jogo(semente=semente)
         rodando = True
         pausado = False
+        velocidade = "normal"  # "normal", "rápido" ou "turbo"
         
-        while rodando and not jogo.game_over:
+        with AgenteAssincrono(pesos, semente, busca=BUSCA_REPLAY, prazo=PRAZO_JOGADA) as agente:
+            while rodando and not jogo.game_over:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        rodando = False
+                    elif event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_ESCAPE:
+                            rodando = False
+                        elif event.key == pygame.K_p or event.key == pygame.K_PAUSE:
+                            # Alterna pause
+                            pausado = not pausado
+                        elif event.key == pygame.K_f:
+                            velocidade = "normal" if velocidade == "rápido" else "rápido"
+                        elif event.key == pygame.K_t:
+                            velocidade = "normal" if velocidade == "turbo" else "turbo"
+
+                if pausado:
+                    # Mostra tela de pause
+                    self.desenhar_tabuleiro(jogo)
+                    self.mostrar_pause(jogo, "IA")
+                    self.clock.tick(VELOCIDADE_IA)
+                    continue
+
+                if velocidade == "turbo":
+                    # Aplica jogadas até a hora do próximo quadro desenhado
+                    limite = time.perf_counter() + 1 / FPS_TURBO
+                    while not jogo.game_over and agente.avancar(jogo, espera=limite - time.perf_counter()):
+                        if time.perf_counter() >= limite:
+                            break
+                else:
+                    # Sem jogada pronta (busca mais lenta que a tela), só redesenha
+                    passos = PASSOS_AVANCO_RAPIDO if velocidade == "rápido" else 1
+                    for _ in range(passos):
+                        if jogo.game_over or not agente.avancar(jogo):
+                            break
+
+                # Desenha o jogo normal
+                self.desenhar_tabuleiro(jogo)
+                self.desenhar_info(jogo, "IA" if velocidade == "normal" else f"IA ({velocidade})")
+                self.atualizar_tela()
+                if velocidade != "turbo":
+                    self.clock.tick(VELOCIDADE_IA)
+
+        if PRAZO_JOGADA is not None:
+            print(f"⏱️  Busca da IA: {agente.escolher_jogada.resumo()}")
+
+        # Mostra game over
+        if jogo.game_over:
+            self.mostrar_game_over(jogo)
+            esperando = True
+            while esperando:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        esperando = False
+                    elif event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_ESCAPE:
+                            esperando = False
+
+    def replay_rastro(self, leitor, partida, inicio=0):
+        """Revê uma partida gravada (rastros.py) sem refazer a busca, uma peça por quadro.
+
+        ← e → voltam e avançam 10 peças, reconstruindo o estado a partir das jogadas.
+        """
+        total = leitor.partida(partida)["pecas"]
+        jogadas = leitor.jogadas(partida)
+        peca = max(0, min(inicio, total))
+        jogo = leitor.estado(partida, peca)
+        rodando = True
+        pausado = False
+        
+        while rodando and not (jogo.game_over and peca >= total):
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     rodando = False
@@ -177,39 +325,25 @@ class VisualizadorTetris:
                     elif event.key == pygame.K_p or event.key == pygame.K_PAUSE:
                         # Alterna pause
                         pausado = not pausado
+                    elif event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                        peca = max(0, min(peca + (10 if event.key == pygame.K_RIGHT else -10), total))
+                        jogo = leitor.estado(partida, peca)
 
             if pausado:
                 # Mostra tela de pause
                 self.desenhar_tabuleiro(jogo)
-                self.mostrar_pause(jogo, "IA")
-            else:
-                # IA escolhe jogada (só se não estiver pausado)
-                melhor_score = -99999
-                melhor_acao = None
-                
-                for rot in range(4):
-                    for x in range(LARGURA):
-                        if not jogo.colide(x, 0, jogo.peca_atual):
-                            linhas, altura, buracos, uniforme = jogo.simula_jogada(x, rot)
-                            w1, w2, w3, w4 = pesos
-                            score = w1 * linhas - w2 * buracos - w3 * altura + w4 * uniforme
-                            if score > melhor_score:
-                                melhor_score = score
-                                melhor_acao = (x, rot)
-
-                if melhor_acao:
-                    x, rot = melhor_acao
-                    for _ in range(rot):
-                        jogo.peca_atual = [list(row) for row in zip(*jogo.peca_atual[::-1])]
-                    jogo.x = x
-
-                jogo.passo()
-
-                # Desenha o jogo normal
-                self.desenhar_tabuleiro(jogo)
-                self.desenhar_info(jogo, "IA")
-                pygame.display.update()
+                self.mostrar_pause(jogo, "Rastro")
                 self.clock.tick(VELOCIDADE_IA)
+                continue
+
+            if peca < total:
+                refazer_jogada(jogo, jogadas[peca])
+                peca += 1
+
+            self.desenhar_tabuleiro(jogo)
+            self.desenhar_info(jogo, f"Rastro {peca}/{total}")
+            self.atualizar_tela()
+            self.clock.tick(VELOCIDADE_IA)
 
         # Mostra game over
         if jogo.game_over:
@@ -225,7 +359,7 @@ class VisualizadorTetris:
 
     def jogar_humano(self):
         """Permite ao jogador jogar manualmente"""
-        jogo = Tetris()
+        jogo = criar_jogo()
         rodando = True
         pausado = False
         tempo_queda = time.time()
@@ -276,10 +410,9 @@ class VisualizadorTetris:
                 
                 # Adiciona indicação de pause na info
                 if pausado:
-                    pause_texto = self.fonte.render("PAUSADO", True, (255, 255, 0))
-                    self.tela.blit(pause_texto, (10, ALTURA_TELA - 30))
+                    self._cobrir(self._texto("pausado", "PAUSADO", (255, 255, 0)), (10, ALTURA_TELA - 30))
                 
-                pygame.display.update()
+                self.atualizar_tela()
                 self.clock.tick(60)  # 60 FPS para jogo humano
 
         # Mostra game over